@@ -1,13 +1,22 @@
 """
 Backend package for myaalkc application.
+
+The database helpers are resolved on first attribute access, so importing
+the package does not load SQLAlchemy or the database configuration.
 """
 
-from .database import db_manager, get_db, init_db, create_tables, Base
+from importlib import import_module
 
 __all__ = [
     'db_manager',
-    'get_db', 
+    'get_db',
     'init_db',
     'create_tables',
     'Base'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(import_module('.database', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,6 @@
+"""
+Benchmarks package for the Amanat Al-Kalima Company ERP API.
+
+Benchmarks are run from the backend directory, e.g.
+``python -m benchmarks.async_db_benchmark``.
+"""
@@ -0,0 +1,87 @@
+"""
+Benchmark comparing the sync and async inventory read paths under concurrency.
+
+Each concurrency level launches N coroutines on one event loop that repeatedly
+fetch an inventory item by ID:
+
+- sync path: calls ``get_inventory_item_by_id`` with a blocking Session from
+  inside the coroutine, which is what the old ``async def`` handlers did.
+- async path: awaits ``get_inventory_item_by_id_async`` with an AsyncSession.
+
+On the sync path throughput stays flat as concurrency grows because every
+round trip blocks the loop; on the async path it scales until the pool or the
+database saturates.
+
+Usage (from the backend directory, with the DB_* environment configured):
+    python -m benchmarks.async_db_benchmark --item-id 1 --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from database import db_manager, init_db, init_async_db
+from crud.inventory_crud import get_inventory_item_by_id, get_inventory_item_by_id_async
+
+
+async def _run_sync_path(item_id: int) -> None:
+    """Fetch one item through the blocking Session."""
+    db = db_manager.get_session()
+    try:
+        get_inventory_item_by_id(db, item_id)
+    finally:
+        db.close()
+
+
+async def _run_async_path(item_id: int) -> None:
+    """Fetch one item through the AsyncSession."""
+    async with db_manager.get_async_session() as db:
+        await get_inventory_item_by_id_async(db, item_id)
+
+
+async def _measure(call: Callable[[int], Awaitable[None]], item_id: int, concurrency: int, total: int) -> float:
+    """
+    Run ``total`` calls spread over ``concurrency`` workers.
+    
+    Returns:
+        float: Throughput in requests per second
+    """
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call(item_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(item_id: int, total: int, levels: List[int]) -> None:
+    init_db()
+    init_async_db()
+
+    # Warm both pools so connection setup is not measured
+    await _measure(_run_sync_path, item_id, 1, 10)
+    await _measure(_run_async_path, item_id, max(levels), max(levels) * 2)
+
+    print(f"{'concurrency':>12} {'sync req/s':>12} {'async req/s':>12} {'speedup':>8}")
+    for level in levels:
+        sync_rps = await _measure(_run_sync_path, item_id, level, total)
+        async_rps = await _measure(_run_async_path, item_id, level, total)
+        print(f"{level:>12} {sync_rps:>12.1f} {async_rps:>12.1f} {async_rps / sync_rps:>7.2f}x")
+
+    db_manager.close_connection()
+    await db_manager.close_async_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--item-id", type=int, default=1, help="Inventory item ID to fetch")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64], help="Concurrency levels")
+    args = parser.parse_args()
+    asyncio.run(main(args.item_id, args.requests, args.levels))
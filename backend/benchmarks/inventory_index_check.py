@@ -0,0 +1,89 @@
+"""
+EXPLAIN check for the common filtered inventory listings.
+
+Builds the same queries as ``GET /inventory/`` for the common warehouse
+filters, runs EXPLAIN on them and checks that each one is served by the
+expected composite index rather than a full table scan. Exits with status 1
+if any query does not use its index.
+
+Usage (from the backend directory):
+    # Against the configured MySQL database (run on realistic data; the
+    # optimizer may prefer a scan on near-empty tables)
+    python -m benchmarks.inventory_index_check
+
+    # Against a throwaway in-memory SQLite schema
+    python -m benchmarks.inventory_index_check --sqlite
+"""
+
+import argparse
+import sys
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from database import Base, db_manager, init_db
+from crud.inventory_crud import inventory_listing_query
+from schemas.inventory_schema import InventoryFilter
+
+# (description, filters, order_by, expected index)
+CASES: List[Tuple[str, InventoryFilter, str, str]] = [
+    ("by type", InventoryFilter(item_type="steel"), "id", "ix_inventory_item_type_location"),
+    ("by type and location", InventoryFilter(item_type="steel", location="WH-1"), "id", "ix_inventory_item_type_location"),
+    ("by location", InventoryFilter(location="WH-1"), "id", "ix_inventory_location_quantity"),
+    ("low stock at location", InventoryFilter(location="WH-1", max_quantity=10), "quantity", "ix_inventory_location_quantity"),
+    ("stock range at location", InventoryFilter(location="WH-1", min_quantity=5, max_quantity=50), "-quantity", "ix_inventory_location_quantity"),
+]
+
+
+def _explain(db: Session, filters: InventoryFilter, order_by: str) -> Tuple[str, Optional[str]]:
+    """
+    EXPLAIN one listing query.
+
+    Returns:
+        Tuple[str, Optional[str]]: Raw plan text and the index chosen (None for a scan)
+    """
+    statement = inventory_listing_query(db, limit=100, order_by=order_by, filters=filters).statement
+    sql = str(statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+
+    if db.get_bind().dialect.name == "sqlite":
+        rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        plan = "; ".join(row[-1] for row in rows)
+        used = next(
+            (detail.split(" INDEX ")[1].split(" ")[0] for *_, detail in rows if " INDEX " in detail),
+            None
+        )
+        return plan, used
+
+    rows = db.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    plan = "; ".join(f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']}" for row in rows)
+    return plan, rows[0]["key"] if rows else None
+
+
+def main(use_sqlite: bool) -> int:
+    if use_sqlite:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[Base.metadata.tables["inventory"]])
+    else:
+        init_db()
+        engine = db_manager.engine
+
+    failures = 0
+    with Session(engine) as db:
+        for description, filters, order_by, expected in CASES:
+            plan, used = _explain(db, filters, order_by)
+            ok = used == expected
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {description:<24} expected={expected} used={used}")
+            if not ok:
+                print(f"     plan: {plan}")
+
+    engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sqlite", action="store_true", help="Check against an in-memory SQLite schema")
+    args = parser.parse_args()
+    sys.exit(main(args.sqlite))
@@ -0,0 +1,97 @@
+"""
+Microbenchmark of the GET /inventory/ serialization paths.
+
+Compares, per page of ``--page-size`` rows from an in-memory SQLite table:
+
+- orm: ``get_all_inventory_items`` returns ORM entities, which FastAPI
+  validates against ``List[Inventory]`` (``from_attributes``) and serializes
+  as it does for a ``response_model`` (the previous endpoint implementation).
+- rows: ``get_inventory_rows`` returns plain column tuples, which are
+  encoded with orjson directly (the current endpoint implementation).
+
+Query and serialization time are reported separately, along with a check
+that both paths produce the same JSON document.
+
+Usage (from the backend directory):
+    python -m benchmarks.inventory_serialization_benchmark --page-size 1000 --rounds 200
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from database import Base
+from benchmarks.seed_data import generate_inventory
+from crud.inventory_crud import get_all_inventory_items, get_inventory_rows
+from routers.inventory_router import _listing_json
+from schemas.inventory_schema import Inventory
+
+LIST_ADAPTER = TypeAdapter(List[Inventory])
+
+
+def _orm_body(items) -> bytes:
+    """Validate and serialize the way FastAPI handles ``response_model=List[Inventory]``."""
+    validated = LIST_ADAPTER.validate_python(items, from_attributes=True)
+    return LIST_ADAPTER.dump_json(validated)
+
+
+def _stdlib_body(items) -> bytes:
+    """Validation followed by jsonable_encoder and the stdlib encoder (older FastAPI releases)."""
+    validated = LIST_ADAPTER.validate_python(items, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _time(rounds: int, fetch: Callable, encode: Callable[..., bytes], db: Session, page_size: int) -> Tuple[float, float]:
+    """Mean query and serialization time in milliseconds over ``rounds`` pages."""
+    query_time = encode_time = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        page = fetch(db, limit=page_size)
+        fetched = time.perf_counter()
+        encode(page)
+        encode_time += time.perf_counter() - fetched
+        query_time += fetched - started
+        db.expunge_all()
+    return query_time / rounds * 1000, encode_time / rounds * 1000
+
+
+def main(page_size: int, rounds: int) -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Base.metadata.tables["inventory"]])
+    with engine.begin() as connection:
+        connection.execute(insert(Base.metadata.tables["inventory"]), list(generate_inventory(random.Random(1), page_size)))
+
+    with Session(engine) as db:
+        same = json.loads(_orm_body(get_all_inventory_items(db, limit=page_size))) == \
+            json.loads(_listing_json(get_inventory_rows(db, limit=page_size)))
+        db.expunge_all()
+
+        paths = [
+            ("orm + response_model", get_all_inventory_items, _orm_body),
+            ("orm + stdlib json", get_all_inventory_items, _stdlib_body),
+            ("rows + orjson", get_inventory_rows, _listing_json),
+        ]
+        print(f"{page_size} rows per page, {rounds} rounds; identical JSON: {same}")
+        print(f"{'path':<22} {'query ms':>9} {'encode ms':>10} {'total ms':>9}")
+        baseline = None
+        for name, fetch, encode in paths:
+            _time(5, fetch, encode, db, page_size)  # warm up
+            query_ms, encode_ms = _time(rounds, fetch, encode, db, page_size)
+            total = query_ms + encode_ms
+            baseline = baseline or total
+            print(f"{name:<22} {query_ms:>9.3f} {encode_ms:>10.3f} {total:>9.3f}  ({baseline / total:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=1000, help="Rows per page (default 1000)")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages per path (default 200)")
+    args = parser.parse_args()
+    main(args.page_size, args.rounds)
@@ -0,0 +1,408 @@
+"""
+Load test for the inventory, invoice and customer endpoints.
+
+Drives each endpoint at a set of concurrency levels and reports throughput,
+p50/p95/p99 latency and database statements per request (read from the
+``Server-Timing`` header added by the metrics middleware). Results are
+written to JSON; pass an earlier result file as ``--baseline`` to flag
+regressions, in which case the exit status is 1 when any scenario got slower
+than ``--tolerance`` allows or issues more statements per request.
+
+The app runs in-process by default (no network, same event loop as the load
+generator), against a SQLite file seeded with ``benchmarks.seed_data`` or the
+DB_* database. Pass ``--base-url`` to load a separately started server
+instead, e.g. ``uvicorn main:app --workers 4``.
+
+Write scenarios modify the data set; reseed before runs that are compared
+against each other.
+
+Usage (from the backend directory; needs httpx, and aiosqlite for SQLite):
+    python -m benchmarks.seed_data --sqlite bench.db --items 1000000 --invoices 200000
+    python -m benchmarks.load_test --sqlite bench.db --output baseline.json
+    python -m benchmarks.load_test --sqlite bench.db --baseline baseline.json --output current.json
+    python -m benchmarks.load_test --base-url http://localhost:8000 --scenarios inventory.get,inventory.list
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+# Statement count reported by MetricsMiddleware, e.g. 'db;dur=1.20;desc="3 queries"'
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+SEARCH_TERMS = ["steel", "pipe", "cop", "tile", "حديد", "اسمنت", "لوح", "باب"]
+
+
+class Dataset(NamedTuple):
+    """Highest IDs present when the run starts."""
+
+    items: int
+    customers: int
+    invoices: int
+
+
+class Request(NamedTuple):
+    """One HTTP request issued by a scenario."""
+
+    method: str
+    path: str
+    json: Optional[Any] = None
+    files: Optional[Dict[str, Any]] = None
+
+
+class Scenario(NamedTuple):
+    """
+    An endpoint under test.
+
+    Attributes:
+        name (str): Scenario name used in results and ``--scenarios``
+        route (str): Route template, for reports
+        build (Callable): Builds the next request from a random generator and the data set
+        max_requests (Optional[int]): Cap on requests per level for expensive endpoints
+    """
+
+    name: str
+    route: str
+    build: Callable[[random.Random, Dataset], Request]
+    max_requests: Optional[int] = None
+
+
+def _new_item(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "item_name": f"load test item {rng.randint(1, 10**9)}",
+        "item_type": rng.choice(["raw", "finished", "spare"]),
+        "quantity": float(rng.randint(1, 100)),
+        "weight": 1.0,
+        "unit": "pcs",
+        "purchase_price": 10.0,
+        "location": "warehouse-1",
+    }
+
+
+def _import_file(rng: random.Random) -> Dict[str, Any]:
+    rows = ["item_name,item_type,quantity,location"]
+    rows += [f"import item {rng.randint(1, 10**9)},raw,{rng.randint(1, 50)},warehouse-2" for _ in range(100)]
+    return {"file": ("inventory.csv", "\n".join(rows).encode(), "text/csv")}
+
+
+class _Deletions:
+    """Hands out item IDs from the top of the range so every delete hits an existing row."""
+
+    def __init__(self):
+        self.next_id: Optional[int] = None
+
+    def __call__(self, rng: random.Random, data: Dataset) -> Request:
+        if self.next_id is None:
+            self.next_id = data.items
+        item_id, self.next_id = self.next_id, self.next_id - 1
+        return Request("DELETE", f"/inventory/{item_id}")
+
+
+SCENARIOS: List[Scenario] = [
+    # Inventory reads
+    Scenario("inventory.list", "GET /inventory/",
+             lambda rng, data: Request("GET", "/inventory/?limit=50")),
+    Scenario("inventory.list_deep", "GET /inventory/?skip=",
+             lambda rng, data: Request("GET", f"/inventory/?limit=50&skip={rng.randint(0, max(data.items - 50, 0))}")),
+    Scenario("inventory.list_filtered", "GET /inventory/?item_type=&location=",
+             lambda rng, data: Request("GET", f"/inventory/?limit=50&item_type={rng.choice(['raw', 'tool', 'spare'])}&location=warehouse-{rng.randint(1, 12)}")),
+    Scenario("inventory.list_sorted", "GET /inventory/?order_by=-quantity",
+             lambda rng, data: Request("GET", "/inventory/?limit=50&order_by=-quantity")),
+    Scenario("inventory.get", "GET /inventory/{item_id}",
+             lambda rng, data: Request("GET", f"/inventory/{rng.randint(1, data.items)}")),
+    Scenario("inventory.batch", "GET /inventory/batch",
+             lambda rng, data: Request("GET", "/inventory/batch?ids=" + ",".join(str(rng.randint(1, data.items)) for _ in range(100)))),
+    Scenario("inventory.batch_post", "POST /inventory/batch",
+             lambda rng, data: Request("POST", "/inventory/batch", json={"ids": [rng.randint(1, data.items) for _ in range(200)]})),
+    Scenario("inventory.search", "GET /inventory/search",
+             lambda rng, data: Request("GET", f"/inventory/search?q={rng.choice(SEARCH_TERMS)}")),
+    Scenario("inventory.summary", "GET /inventory/summary",
+             lambda rng, data: Request("GET", "/inventory/summary")),
+    Scenario("inventory.export", "GET /inventory/export",
+             lambda rng, data: Request("GET", "/inventory/export"), max_requests=4),
+    # Inventory writes
+    Scenario("inventory.create", "POST /inventory/",
+             lambda rng, data: Request("POST", "/inventory/", json=_new_item(rng))),
+    Scenario("inventory.bulk", "POST /inventory/bulk",
+             lambda rng, data: Request("POST", "/inventory/bulk", json={"items": [_new_item(rng) for _ in range(100)]})),
+    Scenario("inventory.update", "PUT /inventory/{item_id}",
+             lambda rng, data: Request("PUT", f"/inventory/{rng.randint(1, data.items)}", json={"quantity": float(rng.randint(1, 5000))})),
+    Scenario("inventory.adjust", "POST /inventory/{item_id}/adjust",
+             lambda rng, data: Request("POST", f"/inventory/{rng.randint(1, data.items)}/adjust", json={"delta": 1.0})),
+    Scenario("inventory.adjust_batch", "POST /inventory/adjust",
+             lambda rng, data: Request("POST", "/inventory/adjust", json={"adjustments": [
+                 {"id": item_id, "delta": 1.0} for item_id in rng.sample(range(1, data.items + 1), min(10, data.items))
+             ]})),
+    Scenario("inventory.import", "POST /inventory/import",
+             lambda rng, data: Request("POST", "/inventory/import", files=_import_file(rng)), max_requests=20),
+    Scenario("inventory.delete", "DELETE /inventory/{item_id}", _Deletions()),
+    # Customers
+    Scenario("customers.list", "GET /customers/",
+             lambda rng, data: Request("GET", "/customers/?limit=50")),
+    Scenario("customers.batch", "GET /customers/?ids=",
+             lambda rng, data: Request("GET", "/customers/?ids=" + ",".join(str(rng.randint(1, data.customers)) for _ in range(20)))),
+    Scenario("customers.get", "GET /customers/{customer_id}",
+             lambda rng, data: Request("GET", f"/customers/{rng.randint(1, data.customers)}")),
+    Scenario("customers.create", "POST /customers/",
+             lambda rng, data: Request("POST", "/customers/", json={"name": f"Load test customer {rng.randint(1, 10**9)}"})),
+    Scenario("customers.update", "PUT /customers/{customer_id}",
+             lambda rng, data: Request("PUT", f"/customers/{rng.randint(1, data.customers)}", json={"phone": f"+9665{rng.randint(10000000, 99999999)}"})),
+    # Invoices
+    Scenario("invoices.list", "GET /invoices/",
+             lambda rng, data: Request("GET", "/invoices/?limit=50")),
+    Scenario("invoices.list_items", "GET /invoices/?include=items",
+             lambda rng, data: Request("GET", "/invoices/?limit=50&include=items")),
+    Scenario("invoices.get", "GET /invoices/{invoice_id}",
+             lambda rng, data: Request("GET", f"/invoices/{rng.randint(1, data.invoices)}")),
+    Scenario("invoices.create", "POST /invoices/",
+             lambda rng, data: Request("POST", "/invoices/", json={
+                 "customer_id": rng.randint(1, data.customers),
+                 "invoice_issue_date": "2025-01-01T00:00:00",
+                 "due_date": "2025-01-31T00:00:00",
+                 "items": [{"item_name": "load test line", "quantity": 2, "unit_price": 9.5} for _ in range(3)],
+             })),
+]
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+async def _highest_id(client: httpx.AsyncClient, path: str) -> int:
+    response = await client.get(path, params={"limit": 1, "order_by": "-id"})
+    response.raise_for_status()
+    rows = response.json()
+    return rows[0]["id"] if rows else 0
+
+
+async def discover_dataset(client: httpx.AsyncClient) -> Dataset:
+    """Find the ID ranges to draw random IDs from."""
+    return Dataset(
+        items=await _highest_id(client, "/inventory/"),
+        customers=await _highest_id(client, "/customers/"),
+        invoices=await _highest_id(client, "/invoices/"),
+    )
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    data: Dataset,
+    concurrency: int,
+    total: int,
+    rng: random.Random
+) -> Dict[str, Any]:
+    """
+    Issue ``total`` requests of one scenario over ``concurrency`` workers.
+
+    Returns:
+        Dict[str, Any]: Throughput, latency percentiles (ms), error count and DB statements per request
+    """
+    latencies: List[float] = []
+    queries: List[int] = []
+    db_times: List[float] = []
+    errors: Dict[str, int] = {}
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            request = scenario.build(rng, data)
+            started = time.perf_counter()
+            try:
+                response = await client.request(request.method, request.path, json=request.json, files=request.files)
+                await response.aread()
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            timing = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+            if timing:
+                db_times.append(float(timing.group(1)))
+                queries.append(int(timing.group(2)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result: Dict[str, Any] = {
+        "requests": total,
+        "errors": sum(errors.values()),
+        "error_kinds": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": None,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "db_ms_per_request": round(sum(db_times) / len(db_times), 3) if db_times else None,
+    }
+    if latencies:
+        result["latency_ms"] = {
+            "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(_percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3),
+        }
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare two result files.
+
+    A scenario level regresses when its throughput drops or its p95 latency
+    grows by more than ``tolerance`` (a fraction), when it issues at least
+    half a statement more per request on average, or when it has more errors.
+
+    Returns:
+        List[str]: One line per regression
+    """
+    regressions = []
+    for name, scenario in current["scenarios"].items():
+        base_levels = baseline.get("scenarios", {}).get(name, {}).get("levels", {})
+        for level, now in scenario["levels"].items():
+            before = base_levels.get(level)
+            if before is None:
+                continue
+            label = f"{name} @ {level}"
+            if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+                regressions.append(f"{label}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s")
+            if before["latency_ms"] and now["latency_ms"] and now["latency_ms"]["p95"] > before["latency_ms"]["p95"] * (1 + tolerance):
+                regressions.append(f"{label}: p95 {before['latency_ms']['p95']} -> {now['latency_ms']['p95']} ms")
+            # Cache hits make the average fractional; half a statement more is a new query
+            if before["queries_per_request"] is not None and now["queries_per_request"] is not None \
+                    and now["queries_per_request"] > before["queries_per_request"] + 0.5:
+                regressions.append(f"{label}: queries/request {before['queries_per_request']} -> {now['queries_per_request']}")
+            if now["errors"] > before["errors"]:
+                regressions.append(f"{label}: errors {before['errors']} -> {now['errors']} {now['error_kinds']}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    selected = set(args.scenarios.split(",")) if args.scenarios else None
+    scenarios = [scenario for scenario in SCENARIOS if selected is None or scenario.name in selected]
+    if selected and len(scenarios) != len(selected):
+        unknown = selected - {scenario.name for scenario in scenarios}
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            target = args.base_url
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=max(args.concurrency)))
+            base_url = args.base_url
+        else:
+            if args.sqlite:
+                from benchmarks.seed_data import configure_sqlite
+                configure_sqlite(args.sqlite)
+                target = f"in-process, sqlite:///{args.sqlite}"
+            else:
+                target = "in-process, DB_* database"
+            from main import app
+            # Run startup work (DB init, pool warm-up, search index build) as a server would
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://benchmark"
+
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout)
+        )
+        data = await discover_dataset(client)
+        print(f"Target: {target}; items={data.items} customers={data.customers} invoices={data.invoices}")
+        if not (data.items and data.customers and data.invoices):
+            raise SystemExit("The database is empty; seed it with benchmarks.seed_data first")
+
+        rng = random.Random(args.seed)
+        results: Dict[str, Any] = {
+            "meta": {
+                "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "git_revision": _git_revision(),
+                "python": platform.python_version(),
+                "target": target,
+                "dataset": data._asdict(),
+                "requests_per_level": args.requests,
+                "concurrency": args.concurrency,
+            },
+            "scenarios": {},
+        }
+
+        print(f"{'scenario':<26} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'q/req':>6} {'errors':>7}")
+        for scenario in scenarios:
+            total = min(args.requests, scenario.max_requests or args.requests)
+            await run_level(client, scenario, data, 1, min(args.warmup, total), rng)
+            levels: Dict[str, Any] = {}
+            for concurrency in args.concurrency:
+                result = await run_level(client, scenario, data, concurrency, total, rng)
+                levels[str(concurrency)] = result
+                latency = result["latency_ms"] or {"p50": 0, "p95": 0, "p99": 0}
+                queries = result["queries_per_request"]
+                print(
+                    f"{scenario.name:<26} {concurrency:>5} {result['throughput_rps']:>9.1f} {latency['p50']:>9.2f} "
+                    f"{latency['p95']:>9.2f} {latency['p99']:>9.2f} {queries if queries is not None else '-':>6} "
+                    f"{result['errors']:>7}"
+                )
+            results["scenarios"][scenario.name] = {"route": scenario.route, "levels": levels}
+        return results
+
+
+def main(args: argparse.Namespace) -> int:
+    results = asyncio.run(run(args))
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(results, output, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(baseline, results, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+def _levels(value: str) -> List[int]:
+    return [int(level) for level in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--sqlite", metavar="PATH", help="Run the app in-process against a seeded SQLite file")
+    target.add_argument("--base-url", help="Load a running server instead of the in-process app")
+    parser.add_argument("--scenarios", help="Comma-separated scenario names (default: all)")
+    parser.add_argument("--concurrency", type=_levels, default=[1, 8, 32], help="Concurrency levels (default 1,8,32)")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario and level (default 500)")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario (default 20)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds (default 60)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for request parameters (default 1)")
+    parser.add_argument("--output", default="load_test_results.json", help="Result file (default load_test_results.json)")
+    parser.add_argument("--baseline", help="Earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed throughput/p95 regression (default 0.15)")
+    sys.exit(main(parser.parse_args()))
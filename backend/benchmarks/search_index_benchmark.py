@@ -0,0 +1,122 @@
+"""
+Latency benchmark of the in-memory inventory search index.
+
+Builds an InventorySearchIndex over ``--items`` synthetic inventory items
+(English and Arabic names, with sizes and part codes) and times searches of
+several kinds: a part code and a specific name taken from an indexed item, a
+common word, a short prefix, Arabic text written with letter variants, a
+misspelling served by the fuzzy fallback and a query with no match. Reports
+the build time and memory, then the hit count and p50/p99 latency of each
+query kind both cold (result cache cleared before every search) and cached,
+and the time to re-index one item as the write paths do.
+
+Only the search index is exercised, so no database is needed.
+
+Usage (from the backend directory):
+    python -m benchmarks.search_index_benchmark --items 1000000 --repeat 200
+"""
+
+import argparse
+import gc
+import random
+import resource
+import statistics
+import time
+from typing import Iterator, List, Tuple
+
+from search_index import InventorySearchIndex, IndexedItem
+
+MATERIALS = ["steel", "copper", "brass", "aluminium", "pvc", "cast iron", "galvanised", "stainless"]
+PRODUCTS = ["pipe", "wire", "rod", "plate", "elbow", "valve", "flange", "bolt", "nut", "sheet", "angle", "beam"]
+ARABIC_NAMES = ["حديد تسليح", "أنبوب حديد", "سلك نحاس", "كيس إسمنت", "لوح ألمنيوم", "صمام نحاسي", "مسمار فولاذ"]
+ITEM_TYPES = ["raw material", "fitting", "fastener", "cement", "cable", "مواد بناء", "أدوات"]
+LOCATIONS = [f"warehouse {number}" for number in range(1, 21)] + [f"مستودع {number}" for number in range(1, 11)]
+
+QUERIES = {
+    "common word": "steel",
+    "short prefix": "st",
+    "arabic variant": "انبوب حديد",
+    "fuzzy typo": "stainles flang",
+    "no match": "zirconium",
+}
+
+
+def make_items(count: int, seed: int = 1) -> Iterator[Tuple[int, IndexedItem]]:
+    """Yield ``count`` reproducible (item_id, item) pairs."""
+    rng = random.Random(seed)
+    for item_id in range(1, count + 1):
+        size = f"{rng.choice([6, 8, 10, 12, 16, 20, 25, 32, 50])} mm"
+        code = f"{rng.choice('ABCDEFGHKMPX')}{rng.choice('ABCDEFGHKMPX')}-{rng.randint(10000, 99999)}"
+        if rng.random() < 0.3:
+            name = f"{rng.choice(ARABIC_NAMES)} {size} {code}"
+        else:
+            name = f"{rng.choice(MATERIALS)} {rng.choice(PRODUCTS)} {size} {code}"
+        yield item_id, IndexedItem(name, rng.choice(ITEM_TYPES), rng.choice(LOCATIONS), 1)
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _time(index: InventorySearchIndex, query: str, args: argparse.Namespace, cold: bool) -> Tuple[int, List[float]]:
+    """Run a search ``args.repeat`` times; returns the hit count and latencies in ms."""
+    samples = []
+    for _ in range(args.repeat):
+        if cold:
+            index.results.clear()
+        started = time.perf_counter()
+        hits = index.search(query, fields=args.fields, limit=args.limit)
+        samples.append((time.perf_counter() - started) * 1000)
+    return len(hits), samples
+
+
+def main(args: argparse.Namespace) -> None:
+    index = InventorySearchIndex()
+    rss_before = _max_rss_mb()
+    started = time.perf_counter()
+    batch: List[Tuple[int, IndexedItem]] = []
+    sample = None
+    for pair in make_items(args.items):
+        if pair[0] == args.items // 2:
+            sample = pair[1]
+        batch.append(pair)
+        if len(batch) == 10000:
+            index.index_items(batch)
+            batch = []
+    index.index_items(batch)
+    gc.freeze()  # as build_inventory_search_index does
+    build = time.perf_counter() - started
+    print(f"Indexed {len(index)} items in {build:.1f}s ({len(index) / build:.0f} items/s), "
+          f"peak RSS +{_max_rss_mb() - rss_before:.0f} MB")
+
+    code = sample.item_name.rsplit(" ", 1)[-1]
+    queries = {"part code": code.lower(), "specific name": sample.item_name[:-len(code) - 4].strip(), **QUERIES}
+    print(f"\n{'':<36} {'cold':>19} {'cached':>19}")
+    print(f"{'query':<16} {'text':<18} {'hits':>6} {'p50 ms':>9} {'p99 ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for label, query in queries.items():
+        hits, cold = _time(index, query, args, cold=True)
+        _, cached = _time(index, query, args, cold=False)
+        print(f"{label:<16} {query:<18} {hits:>6} {statistics.median(cold):>9.3f} {_percentile(cold, 0.99):>9.3f} "
+              f"{statistics.median(cached):>9.3f} {_percentile(cached, 0.99):>9.3f}")
+
+    samples = []
+    for item_id in range(1, args.repeat + 1):
+        started = time.perf_counter()
+        index.index_item(item_id, IndexedItem(f"renamed item {item_id}", "fitting", "warehouse 1", 2))
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"{'re-index item':<16} {'':<18} {'':>6} {statistics.median(samples):>9.3f} {_percentile(samples, 0.99):>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000000, help="Items indexed (default 1000000)")
+    parser.add_argument("--repeat", type=int, default=200, help="Searches per query kind (default 200)")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search (default 20)")
+    parser.add_argument("--fields", type=lambda value: value.split(","), default=["item_name"],
+                        help="Fields searched, comma-separated (default item_name)")
+    main(parser.parse_args())
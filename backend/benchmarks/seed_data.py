@@ -0,0 +1,269 @@
+"""
+Synthetic data generator for benchmarks.
+
+Seeds a database with reproducible inventory items, customers, and invoices
+with line items. The same ``--seed`` always produces the same rows, so runs
+against different code revisions compare like with like. Rows are written
+with multi-row INSERTs in batches and the inventory summary table is rebuilt
+at the end.
+
+Usage (from the backend directory):
+    # Local SQLite file (needs aiosqlite for the load test)
+    python -m benchmarks.seed_data --sqlite bench.db --items 1000000 --invoices 200000
+
+    # Database configured through the DB_* environment (e.g. a local MySQL)
+    python -m benchmarks.seed_data --items 1000000 --invoices 200000 --reset
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import models  # noqa: F401  (registers the tables on Base.metadata)
+from crud.invoice_crud import VAT_RATE
+from crud.inventory_summary_crud import rebuild_inventory_summary
+from database import Base, ReadReplicaSession, db_manager, init_db
+
+# Vocabulary for generated rows; Arabic names exercise the search normaliser
+ITEM_NAMES = [
+    "steel pipe", "copper wire", "cement bag", "paint bucket", "ceramic tile",
+    "wood plank", "glass sheet", "pvc fitting", "roof panel", "door hinge",
+    "أنبوب حديد", "سلك نحاس", "كيس إسمنت", "علبة دهان", "بلاط سيراميك",
+    "لوح خشب", "لوح زجاج", "وصلة بلاستيك", "لوح سقف", "مفصلة باب",
+]
+ITEM_TYPES = ["raw", "finished", "spare", "consumable", "packaging", "tool", "electrical", "plumbing"]
+LOCATIONS = [f"warehouse-{index}" for index in range(1, 13)] + ["الرياض", "جدة", "الدمام", "مكة"]
+UNITS = ["kg", "pcs", "m", "box", "l"]
+INVOICE_STATUSES = ["Draft", "Sent", "Paid", "Overdue"]
+
+# Rows per INSERT statement
+BATCH_SIZE = 5000
+
+
+def configure_sqlite(path: str) -> None:
+    """
+    Point the global database manager at a SQLite file.
+
+    Sets up the sync and async engines and session factories the way
+    ``init_db``/``init_async_db`` do for MySQL, so CRUD functions and the app
+    run unchanged against the file.
+
+    Args:
+        path (str): SQLite database file
+    """
+    # A generous busy timeout lets concurrent writers queue instead of failing
+    db_manager.engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 30})
+    db_manager.SessionLocal = sessionmaker(bind=db_manager.engine, autoflush=False)
+    db_manager.async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 30})
+    db_manager.AsyncSessionLocal = async_sessionmaker(
+        bind=db_manager.async_engine, autoflush=False, expire_on_commit=False
+    )
+    db_manager.AsyncReadSessionLocal = async_sessionmaker(
+        bind=db_manager.async_engine,
+        sync_session_class=ReadReplicaSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+    @event.listens_for(db_manager.engine, "connect")
+    def _fast_bulk_load(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=NORMAL")
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group rows into lists of at most ``size``."""
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_inventory(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` inventory rows with IDs 1..count."""
+    for item_id in range(1, count + 1):
+        yield {
+            "id": item_id,
+            "item_name": f"{rng.choice(ITEM_NAMES)} {item_id}",
+            "item_type": rng.choice(ITEM_TYPES),
+            "quantity": float(rng.randint(0, 5000)),
+            "weight": round(rng.uniform(0.1, 50.0), 2),
+            "unit": rng.choice(UNITS),
+            "purchase_price": round(rng.uniform(1.0, 2000.0), 2),
+            "location": rng.choice(LOCATIONS),
+            "version": 1,
+        }
+
+
+def generate_customers(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` customer rows with IDs 1..count and unique VAT numbers."""
+    for customer_id in range(1, count + 1):
+        yield {
+            "id": customer_id,
+            "name": f"Customer {customer_id}",
+            "vat_number": f"3{customer_id:013d}3",
+            "email": f"customer{customer_id}@example.com",
+            "phone": f"+9665{rng.randint(10000000, 99999999)}",
+            "address": f"{rng.choice(LOCATIONS)}, street {rng.randint(1, 500)}",
+        }
+
+
+def generate_invoices(
+    rng: random.Random,
+    count: int,
+    customers: int,
+    items_per_invoice: int,
+    invoice_items: List[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield ``count`` invoice rows with IDs 1..count.
+
+    The invoice's line items are appended to ``invoice_items`` as a side
+    effect so the caller can write them in the same pass.
+    """
+    start = datetime(2024, 1, 1)
+    for invoice_id in range(1, count + 1):
+        total = 0.0
+        for _ in range(rng.randint(1, items_per_invoice)):
+            quantity = float(rng.randint(1, 20))
+            unit_price = round(rng.uniform(5.0, 500.0), 2)
+            line_total = round(quantity * unit_price, 2)
+            total += line_total
+            invoice_items.append({
+                "invoice_id": invoice_id,
+                "item_name": rng.choice(ITEM_NAMES),
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "line_total": line_total,
+            })
+
+        issued = start + timedelta(minutes=invoice_id)
+        total = round(total, 2)
+        vat = round(total * VAT_RATE, 2)
+        yield {
+            "id": invoice_id,
+            "customer_id": rng.randint(1, customers),
+            "invoice_issue_date": issued,
+            "due_date": issued + timedelta(days=30),
+            "total_amount": total,
+            "vat_amount": vat,
+            "total_amount_with_vat": round(total + vat, 2),
+            "status": rng.choice(INVOICE_STATUSES),
+        }
+
+
+def _write(engine: Engine, table_name: str, rows: Iterator[Dict[str, Any]]) -> int:
+    """Insert rows in batches, one transaction per batch; return the row count."""
+    table = Base.metadata.tables[table_name]
+    written = 0
+    started = time.perf_counter()
+    for batch in _batches(rows, BATCH_SIZE):
+        with engine.begin() as connection:
+            connection.execute(insert(table), batch)
+        written += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"  {table_name:<14} {written:>10} rows in {elapsed:6.1f}s")
+    return written
+
+
+def seed(
+    engine: Engine,
+    items: int,
+    customers: int,
+    invoices: int,
+    items_per_invoice: int,
+    seed_value: int = 42
+) -> Dict[str, int]:
+    """
+    Write a reproducible data set into empty tables.
+
+    Args:
+        engine (Engine): Target engine
+        items (int): Inventory items to create
+        customers (int): Customers to create
+        invoices (int): Invoices to create
+        items_per_invoice (int): Maximum line items per invoice (at least one)
+        seed_value (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        Dict[str, int]: Rows written per table
+
+    Raises:
+        RuntimeError: If the tables already contain rows
+    """
+    with engine.connect() as connection:
+        for table_name in ("inventory", "customers", "invoices"):
+            table = Base.metadata.tables[table_name]
+            if connection.execute(select(func.count()).select_from(table)).scalar():
+                raise RuntimeError(f"Table '{table_name}' is not empty; pass --reset to recreate the tables")
+
+    rng = random.Random(seed_value)
+    counts = {
+        "inventory": _write(engine, "inventory", generate_inventory(rng, items)),
+        "customers": _write(engine, "customers", generate_customers(rng, customers)),
+    }
+
+    # Invoices and their items are written batch by batch so memory stays flat
+    pending_items: List[Dict[str, Any]] = []
+    invoice_rows = generate_invoices(rng, invoices, max(customers, 1), items_per_invoice, pending_items)
+    counts["invoices"] = counts["invoice_items"] = 0
+    started = time.perf_counter()
+    for batch in _batches(invoice_rows, BATCH_SIZE):
+        with engine.begin() as connection:
+            connection.execute(insert(Base.metadata.tables["invoices"]), batch)
+            connection.execute(insert(Base.metadata.tables["invoice_items"]), pending_items)
+        counts["invoices"] += len(batch)
+        counts["invoice_items"] += len(pending_items)
+        pending_items.clear()
+    print(f"  {'invoices':<14} {counts['invoices']:>10} rows in {time.perf_counter() - started:6.1f}s "
+          f"({counts['invoice_items']} items)")
+
+    with Session(engine) as db:
+        counts["inventory_summary"] = rebuild_inventory_summary(db)
+    return counts
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.sqlite:
+        configure_sqlite(args.sqlite)
+    else:
+        init_db()
+    engine = db_manager.engine
+
+    if args.reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    print(f"Seeding {engine.url.render_as_string(hide_password=True)} (seed {args.seed})")
+    try:
+        seed(engine, args.items, args.customers, args.invoices, args.items_per_invoice, args.seed)
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sqlite", metavar="PATH", help="Seed a SQLite file instead of the DB_* database")
+    parser.add_argument("--items", type=int, default=100_000, help="Inventory items (default 100000)")
+    parser.add_argument("--customers", type=int, default=10_000, help="Customers (default 10000)")
+    parser.add_argument("--invoices", type=int, default=50_000, help="Invoices (default 50000)")
+    parser.add_argument("--items-per-invoice", type=int, default=5, help="Maximum line items per invoice (default 5)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default 42)")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    sys.exit(main(parser.parse_args()))
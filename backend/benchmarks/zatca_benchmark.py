@@ -0,0 +1,135 @@
+"""
+Throughput benchmark of ZATCA document generation.
+
+Renders batches of synthetic invoices (``--invoices`` per batch, with each
+of the ``--lines`` line counts) inline and on process pools of each
+``--workers`` size, and reports invoices and lines per second. The time to
+link the hash chain, which always runs sequentially in the calling process,
+is reported separately. Every mode must produce the same chain, which is
+checked against the inline run.
+
+Only the ``zatca`` module is imported, so no database is needed.
+
+Usage (from the backend directory):
+    python -m benchmarks.zatca_benchmark --invoices 200 --lines 10,100,1000 --workers 1,2,4
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import multiprocessing
+
+from zatca import INITIAL_PREVIOUS_HASH, generate_documents, link_invoices, render_invoice
+
+SELLER = {
+    "name": "شركة أمانة الكلمة",
+    "vat_number": "300000000000003",
+    "crn": "1010010000",
+    "street": "King Fahd Road",
+    "building": "1234",
+    "district": "Al Olaya",
+    "city": "Riyadh",
+    "postal_code": "12211",
+}
+ITEM_NAMES = ["steel pipe", "copper wire", "cement bag", "أنبوب حديد", "سلك نحاس", "كيس إسمنت"]
+
+
+def make_payloads(count: int, lines: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Build ``count`` reproducible invoice payloads with ``lines`` lines each."""
+    rng = random.Random(seed)
+    payloads = []
+    for invoice_id in range(1, count + 1):
+        rows = []
+        total = 0.0
+        for _ in range(lines):
+            quantity = float(rng.randint(1, 20))
+            unit_price = round(rng.uniform(5.0, 500.0), 2)
+            line_total = round(quantity * unit_price, 2)
+            total += line_total
+            rows.append((rng.choice(ITEM_NAMES), quantity, unit_price, line_total))
+        total = round(total, 2)
+        vat = round(total * 0.15, 2)
+        payloads.append({
+            "invoice_id": invoice_id,
+            "number": f"INV-{invoice_id}",
+            "uuid": f"00000000-0000-4000-8000-{invoice_id:012d}",
+            "counter": invoice_id,
+            "issue_date": "2024-01-01",
+            "issue_time": "10:00:00",
+            "due_date": "2024-01-31",
+            "vat_rate": 0.15,
+            "total_amount": total,
+            "vat_amount": vat,
+            "total_amount_with_vat": round(total + vat, 2),
+            "seller": SELLER,
+            "buyer": {"name": f"Customer {invoice_id}", "vat_number": "311111111111113" if invoice_id % 2 else None,
+                      "address": "Jeddah"},
+            "lines": rows,
+        })
+    return payloads
+
+
+def _row(label: str, invoices: int, lines: int, seconds: float, baseline: float) -> str:
+    return (f"{label:<12} {invoices / seconds:>12.1f} {invoices * lines / seconds:>12.0f} "
+            f"{seconds * 1000:>10.1f} {baseline / seconds:>8.2f}x")
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{args.invoices} invoices per batch, {os.cpu_count()} CPUs, best of {args.rounds} rounds")
+    pools = {
+        workers: ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(args.start_method))
+        for workers in args.workers
+    }
+    try:
+        # Start every worker before timing
+        for workers, pool in pools.items():
+            list(pool.map(render_invoice, make_payloads(workers * 2, 1)))
+
+        for lines in args.lines:
+            payloads = make_payloads(args.invoices, lines)
+            print(f"\n{lines} lines per invoice")
+            print(f"{'mode':<12} {'invoices/s':>12} {'lines/s':>12} {'batch ms':>10} {'speedup':>9}")
+
+            render_time = link_time = float("inf")
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                rendered = [render_invoice(payload) for payload in payloads]
+                rendered_at = time.perf_counter()
+                expected = link_invoices(rendered, INITIAL_PREVIOUS_HASH)
+                render_time = min(render_time, rendered_at - started)
+                link_time = min(link_time, time.perf_counter() - rendered_at)
+            inline = render_time + link_time
+            print(_row("inline", args.invoices, lines, inline, inline))
+            print(f"{'  of which link':<12} {'':>12} {'':>12} {link_time * 1000:>10.1f}")
+
+            for workers, pool in pools.items():
+                best = float("inf")
+                for _ in range(args.rounds):
+                    started = time.perf_counter()
+                    documents = generate_documents(payloads, INITIAL_PREVIOUS_HASH, pool=pool, workers=workers)
+                    best = min(best, time.perf_counter() - started)
+                    if [document.invoice_hash for document in documents] != [document.invoice_hash for document in expected]:
+                        raise SystemExit(f"{workers} workers produced a different hash chain than the inline run")
+                print(_row(f"{workers} workers", args.invoices, lines, best, inline))
+    finally:
+        for pool in pools.values():
+            pool.shutdown()
+
+
+def _numbers(value: str) -> List[int]:
+    return [int(number) for number in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=200, help="Invoices per batch (default 200)")
+    parser.add_argument("--lines", type=_numbers, default=[10, 100, 1000], help="Lines per invoice (default 10,100,1000)")
+    parser.add_argument("--workers", type=_numbers, default=sorted({1, 2, os.cpu_count() or 1}),
+                        help="Pool sizes to compare (default 1,2,<cpus>)")
+    parser.add_argument("--rounds", type=int, default=3, help="Batches per mode; the best is reported (default 3)")
+    parser.add_argument("--start-method", default="spawn", help="multiprocessing start method (default spawn)")
+    main(parser.parse_args())
@@ -0,0 +1,261 @@
+"""
+In-process caching for hot database lookups.
+
+This module provides a small pluggable cache interface with an LRU backend
+bounded by size and TTL. Cached values are plain dictionaries of column
+values, never ORM objects, so they are safe to share across sessions.
+
+Invalidation is local to the process: writes through the CRUD layer evict the
+affected keys immediately, while the TTL bounds how long other workers can
+serve a value after a write they did not see.
+
+A reader filling the cache after a miss takes a ``token()`` before its
+SELECT and passes it to ``set``. If the key was deleted since, a writer
+committed in between and the row read may be stale, so the fill is skipped
+rather than caching it until the TTL.
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """
+    Interface for cache backends.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        """Store a value under key, unless key was deleted since ``token`` was taken."""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Evict key if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Evict every key."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return counters describing the cache."""
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        """Evict every key in keys."""
+        for key in keys:
+            self.delete(key)
+
+    def token(self) -> int:
+        """Return a token to pass to ``set`` for a value read from now on."""
+        return 0
+
+
+class NullCache(CacheBackend):
+    """
+    Cache backend that stores nothing, used to disable caching.
+    """
+
+    def __init__(self):
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        pass
+
+    def delete(self, key: Hashable) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "none", "hits": 0, "misses": self.misses, "size": 0}
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Every delete bumps a generation counter and records it for the key, so
+    ``set`` can tell whether a key was deleted after a token was taken. At
+    most ``maxsize`` deletes are remembered; fills with a token older than
+    the oldest forgotten delete, or older than the last ``clear``, are
+    skipped.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Seconds an entry stays valid
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups not found or expired
+        evictions (int): Number of entries dropped to respect maxsize
+        stale_fills (int): Number of sets skipped because the key was deleted since their token
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_fills = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        self._deleted: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        with self._lock:
+            if token is not None and (token < self._floor or self._deleted.get(key, 0) > token):
+                self.stale_fills += 1
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def token(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def _forget(self, key: Hashable) -> None:
+        """Evict key and record the delete; the caller holds the lock."""
+        self._entries.pop(key, None)
+        self._generation += 1
+        self._deleted[key] = self._generation
+        self._deleted.move_to_end(key)
+        if len(self._deleted) > self.maxsize:
+            _, generation = self._deleted.popitem(last=False)
+            self._floor = generation
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._forget(key)
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._forget(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._deleted.clear()
+            self._generation += 1
+            self._floor = self._generation
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "lru",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "stale_fills": self.stale_fills,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+def create_cache_from_env(prefix: str, default_size: int = 1024, default_ttl: float = 30.0) -> CacheBackend:
+    """
+    Build a cache backend from environment variables.
+
+    Reads ``<prefix>_BACKEND`` ('lru' or 'none'), ``<prefix>_SIZE`` and
+    ``<prefix>_TTL``.
+
+    Args:
+        prefix (str): Environment variable prefix, e.g. 'INVENTORY_CACHE'
+        default_size (int, optional): Default maximum entries. Defaults to 1024.
+        default_ttl (float, optional): Default TTL in seconds. Defaults to 30.0.
+
+    Returns:
+        CacheBackend: The configured cache backend
+    """
+    backend = os.getenv(f"{prefix}_BACKEND", "lru").lower()
+    if backend == "none":
+        return NullCache()
+
+    return LRUCache(
+        maxsize=int(os.getenv(f"{prefix}_SIZE", str(default_size))),
+        ttl=float(os.getenv(f"{prefix}_TTL", str(default_ttl)))
+    )
+
+
+# Cache for inventory items keyed by ID
+inventory_cache: CacheBackend = create_cache_from_env("INVENTORY_CACHE")
+
+
+def get_inventory_cache() -> CacheBackend:
+    """
+    Return the current inventory cache backend.
+
+    Returns:
+        CacheBackend: The inventory cache
+    """
+    return inventory_cache
+
+
+def set_inventory_cache(backend: CacheBackend) -> None:
+    """
+    Replace the inventory cache backend (e.g. with a shared cache).
+
+    Args:
+        backend (CacheBackend): The new cache backend
+    """
+    global inventory_cache
+    inventory_cache = backend
+
+
+# Cache for customer directory entries keyed by ID
+customer_cache: CacheBackend = create_cache_from_env("CUSTOMER_CACHE", default_size=4096, default_ttl=300.0)
+
+
+def get_customer_cache() -> CacheBackend:
+    """
+    Return the current customer cache backend.
+
+    Returns:
+        CacheBackend: The customer cache
+    """
+    return customer_cache
+
+
+def set_customer_cache(backend: CacheBackend) -> None:
+    """
+    Replace the customer cache backend (e.g. with a shared cache).
+
+    Args:
+        backend (CacheBackend): The new cache backend
+    """
+    global customer_cache
+    customer_cache = backend
@@ -0,0 +1,335 @@
+"""
+Customer CRUD operations for the Customer Management module.
+
+This module provides CRUD (Create, Read, Update, Delete) operations
+for customers in the Amanat Al-Kalima Company ERP system.
+
+Customer lookups by ID go through the customer cache, so rendering a page of
+invoices resolves all customer names with at most one ``IN`` query.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from cache import get_customer_cache
+from database import reads_from_replica
+from models.customer_model import Customer
+from schemas.customer_schema import CustomerCreate, CustomerUpdate
+from crud.pagination import paginate, next_cursor
+
+
+# Sort keys accepted by order_by, mapped to their columns
+CUSTOMER_SORT_KEYS = {
+    "id": Customer.id,
+    "name": Customer.name,
+}
+
+
+def _to_cache_value(db_customer: Customer) -> Dict[str, Any]:
+    """Snapshot a customer row's column values for the cache."""
+    return {column.key: getattr(db_customer, column.key) for column in Customer.__table__.columns}
+
+
+def create_customer(db: Session, customer: CustomerCreate) -> Customer:
+    """
+    Create a new customer in the database.
+    
+    Args:
+        db (Session): Database session
+        customer (CustomerCreate): Customer data to create
+        
+    Returns:
+        Customer: The created customer
+        
+    Raises:
+        SQLAlchemyError: If database operation fails
+    """
+    try:
+        db_customer = Customer(**customer.model_dump())
+        db.add(db_customer)
+        db.commit()
+        db.refresh(db_customer)
+        return db_customer
+        
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def get_customer_by_id(db: Session, customer_id: int) -> Optional[Customer]:
+    """
+    Retrieve a customer by ID through the customer cache.
+    
+    Args:
+        db (Session): Database session
+        customer_id (int): ID of the customer to retrieve
+        
+    Returns:
+        Optional[Customer]: The customer if found, None otherwise
+    """
+    return get_customers_by_ids(db, [customer_id]).get(customer_id)
+
+
+def get_customers_by_ids(db: Session, customer_ids: Iterable[int]) -> Dict[int, Customer]:
+    """
+    Retrieve many customers by ID.
+    
+    Cached customers are served from the customer cache and all misses are
+    fetched with one ``IN`` query. Cache hits are detached Customer objects
+    built from the cached column values. Misses read from a replica, or
+    evicted by a write while they were being read, are not cached.
+    
+    Args:
+        db (Session): Database session
+        customer_ids (Iterable[int]): IDs of the customers to retrieve
+        
+    Returns:
+        Dict[int, Customer]: Found customers keyed by ID; missing IDs are absent
+    """
+    cache = get_customer_cache()
+    found: Dict[int, Customer] = {}
+    misses: List[int] = []
+    
+    for customer_id in dict.fromkeys(customer_ids):
+        cached = cache.get(customer_id)
+        if cached is not None:
+            found[customer_id] = Customer(**cached)
+        else:
+            misses.append(customer_id)
+    
+    if misses:
+        token = cache.token()
+        try:
+            rows = db.query(Customer).filter(Customer.id.in_(misses)).all()
+        except SQLAlchemyError as e:
+            raise e
+        cacheable = not reads_from_replica(db)
+        for db_customer in rows:
+            if cacheable:
+                cache.set(db_customer.id, _to_cache_value(db_customer), token)
+            found[db_customer.id] = db_customer
+    
+    return found
+
+
+def get_customer_names(db: Session, customer_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Resolve customer names for rendering, e.g. a page of invoices.
+    
+    Args:
+        db (Session): Database session
+        customer_ids (Iterable[int]): Customer IDs to resolve
+        
+    Returns:
+        Dict[int, str]: Customer names keyed by ID; unknown IDs are absent
+    """
+    return {customer_id: customer.name for customer_id, customer in get_customers_by_ids(db, customer_ids).items()}
+
+
+def get_all_customers(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id"
+) -> List[Customer]:
+    """
+    Retrieve all customers with optional pagination.
+    
+    When ``after`` is given, keyset pagination is used and ``skip`` is ignored.
+    
+    Args:
+        db (Session): Database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key from CUSTOMER_SORT_KEYS, '-' prefix for descending. Defaults to "id".
+        
+    Returns:
+        List[Customer]: List of customers
+        
+    Raises:
+        ValueError: If order_by is unsupported or the cursor is invalid
+    """
+    try:
+        query = paginate(
+            db.query(Customer), CUSTOMER_SORT_KEYS, Customer.id,
+            skip=skip, limit=limit, after=after, order_by=order_by
+        )
+        return query.all()
+    except SQLAlchemyError as e:
+        raise e
+
+
+def get_customers_next_cursor(customers: List[Customer], limit: int, order_by: str = "id") -> Optional[str]:
+    """
+    Compute the cursor for the page following ``customers``.
+    
+    Args:
+        customers (List[Customer]): Customers of the current page
+        limit (int): Page size the customers were fetched with
+        order_by (str, optional): Sort key of the page. Defaults to "id".
+        
+    Returns:
+        Optional[str]: Cursor for the next page, or None on the last page
+    """
+    return next_cursor(customers, limit, CUSTOMER_SORT_KEYS, order_by)
+
+
+def update_customer(db: Session, customer_id: int, customer_update: CustomerUpdate) -> Optional[Customer]:
+    """
+    Update an existing customer.
+    
+    Args:
+        db (Session): Database session
+        customer_id (int): ID of the customer to update
+        customer_update (CustomerUpdate): Updated customer data
+        
+    Returns:
+        Optional[Customer]: The updated customer if found, None otherwise
+        
+    Raises:
+        SQLAlchemyError: If database operation fails
+    """
+    try:
+        db_customer = db.get(Customer, customer_id)
+        if db_customer is None:
+            return None
+        
+        for field, value in customer_update.model_dump(exclude_unset=True).items():
+            if value is not None:
+                setattr(db_customer, field, value)
+        
+        db.commit()
+        db.refresh(db_customer)
+        get_customer_cache().delete(customer_id)
+        return db_customer
+        
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def delete_customer(db: Session, customer_id: int) -> bool:
+    """
+    Delete a customer by ID.
+    
+    Args:
+        db (Session): Database session
+        customer_id (int): ID of the customer to delete
+        
+    Returns:
+        bool: True if the customer was deleted, False if not found
+        
+    Raises:
+        IntegrityError: If invoices still reference the customer
+        SQLAlchemyError: If database operation fails
+    """
+    try:
+        db_customer = db.get(Customer, customer_id)
+        if db_customer is None:
+            return False
+        
+        db.delete(db_customer)
+        db.commit()
+        get_customer_cache().delete(customer_id)
+        return True
+        
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+async def create_customer_async(db: AsyncSession, customer: CustomerCreate) -> Customer:
+    """
+    Create a new customer using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        customer (CustomerCreate): Customer data to create
+        
+    Returns:
+        Customer: The created customer
+    """
+    return await db.run_sync(create_customer, customer)
+
+
+async def get_customer_by_id_async(db: AsyncSession, customer_id: int) -> Optional[Customer]:
+    """
+    Retrieve a customer by ID using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        customer_id (int): ID of the customer to retrieve
+        
+    Returns:
+        Optional[Customer]: The customer if found, None otherwise
+    """
+    return await db.run_sync(get_customer_by_id, customer_id)
+
+
+async def get_customers_by_ids_async(db: AsyncSession, customer_ids: Iterable[int]) -> Dict[int, Customer]:
+    """
+    Retrieve many customers by ID using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        customer_ids (Iterable[int]): IDs of the customers to retrieve
+        
+    Returns:
+        Dict[int, Customer]: Found customers keyed by ID; missing IDs are absent
+    """
+    return await db.run_sync(get_customers_by_ids, list(customer_ids))
+
+
+async def get_all_customers_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id"
+) -> List[Customer]:
+    """
+    Retrieve all customers with optional pagination using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key, '-' prefix for descending. Defaults to "id".
+        
+    Returns:
+        List[Customer]: List of customers
+    """
+    return await db.run_sync(get_all_customers, skip, limit, after, order_by)
+
+
+async def update_customer_async(db: AsyncSession, customer_id: int, customer_update: CustomerUpdate) -> Optional[Customer]:
+    """
+    Update an existing customer using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        customer_id (int): ID of the customer to update
+        customer_update (CustomerUpdate): Updated customer data
+        
+    Returns:
+        Optional[Customer]: The updated customer if found, None otherwise
+    """
+    return await db.run_sync(update_customer, customer_id, customer_update)
+
+
+async def delete_customer_async(db: AsyncSession, customer_id: int) -> bool:
+    """
+    Delete a customer by ID using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        customer_id (int): ID of the customer to delete
+        
+    Returns:
+        bool: True if the customer was deleted, False if not found
+    """
+    return await db.run_sync(delete_customer, customer_id)
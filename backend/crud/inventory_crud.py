@@ -3,13 +3,140 @@ Inventory CRUD operations for the Inventory Management module.
 
 This module provides CRUD (Create, Read, Update, Delete) operations
 for inventory items in the Amanat Al-Kalima Company ERP system.
+
+Each operation also has an ``*_async`` variant taking an AsyncSession. The
+async variants run the sync implementation through ``AsyncSession.run_sync``,
+so the queries are identical while DB waits are awaited on the event loop.
 """
 
-from typing import List, Optional
+import asyncio
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy import Row, bindparam, case, delete, insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
+from cache import get_inventory_cache
+from database import reads_from_replica
 from models.inventory_model import Inventory
-from schemas.inventory_schema import InventoryCreate, InventoryUpdate
+from search_index import SEARCH_FIELDS, inventory_search_index, record_inventory_changes
+from schemas.inventory_schema import InventoryCreate, InventoryFilter, InventoryUpdate
+from crud.pagination import paginate, next_cursor
+from crud.inventory_summary_crud import (
+    Contributions,
+    SUMMARY_FIELDS,
+    apply_summary_delta,
+    SUMMARY_COLUMNS,
+    contributions_of,
+    quantity_delta_contributions,
+    snapshot_contributions
+)
+
+
+class StockAdjustmentError(Exception):
+    """
+    Raised when a stock adjustment cannot be applied.
+    
+    Attributes:
+        missing (List[int]): IDs of inventory items that do not exist
+        insufficient (List[int]): IDs whose quantity would drop below zero
+    """
+    
+    def __init__(self, missing: List[int], insufficient: List[int]):
+        self.missing = missing
+        self.insufficient = insufficient
+        super().__init__(
+            f"Stock adjustment rejected (missing: {missing}, insufficient stock: {insufficient})"
+        )
+
+
+class VersionConflictError(Exception):
+    """
+    Raised when a guarded write targets an outdated version of an inventory item.
+    
+    Attributes:
+        item_id (int): ID of the inventory item
+        expected_version (int): Version the client based its write on
+        current_version (int): Version currently stored
+    """
+    
+    def __init__(self, item_id: int, expected_version: int, current_version: int):
+        self.item_id = item_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+        super().__init__(
+            f"Inventory item {item_id} is at version {current_version}, not {expected_version}"
+        )
+
+
+class SearchIndexNotReadyError(Exception):
+    """
+    Raised when a search arrives before the search index has been built.
+    
+    Startup builds the index, and the background refresher builds it if
+    that failed; searches never build it themselves.
+    """
+    
+    def __init__(self):
+        super().__init__("The inventory search index is still being built")
+
+
+# Sort keys accepted by order_by, mapped to their columns
+INVENTORY_SORT_KEYS = {
+    "id": Inventory.id,
+    "item_name": Inventory.item_name,
+    "item_type": Inventory.item_type,
+    "quantity": Inventory.quantity,
+    "purchase_price": Inventory.purchase_price,
+    "location": Inventory.location,
+}
+
+# Filter fields mapped to (column, comparison)
+INVENTORY_FILTERS = {
+    "item_type": (Inventory.item_type, "eq"),
+    "location": (Inventory.location, "eq"),
+    "unit": (Inventory.unit, "eq"),
+    "min_quantity": (Inventory.quantity, "ge"),
+    "max_quantity": (Inventory.quantity, "le"),
+    "min_price": (Inventory.purchase_price, "ge"),
+    "max_price": (Inventory.purchase_price, "le"),
+}
+
+# Columns written by exports
+INVENTORY_EXPORT_COLUMNS = (
+    Inventory.id,
+    Inventory.item_name,
+    Inventory.item_type,
+    Inventory.quantity,
+    Inventory.weight,
+    Inventory.unit,
+    Inventory.purchase_price,
+    Inventory.location,
+)
+
+# Bind parameters per INSERT statement (SQLite allows 32766, MySQL 65535)
+MAX_INSERT_PARAMETERS = 30000
+
+# Keys of the exported columns, used as NDJSON keys and the CSV header
+INVENTORY_EXPORT_FIELDS = [column.key for column in INVENTORY_EXPORT_COLUMNS]
+
+# Columns of the Inventory response schema, in schema order, for listings
+# served as plain rows
+INVENTORY_LISTING_COLUMNS = INVENTORY_EXPORT_COLUMNS + (Inventory.version,)
+
+
+def _to_cache_value(db_inventory: Inventory) -> Dict[str, Any]:
+    """Snapshot an inventory row's column values for the cache."""
+    return {column.key: getattr(db_inventory, column.key) for column in Inventory.__table__.columns}
+
+
+def _invalidate_cached_items(item_ids: Iterable[int]) -> None:
+    """Evict inventory items from the cache after a committed write."""
+    get_inventory_cache().delete_many(item_ids)
 
 
 def create_inventory_item(db: Session, inventory_item: InventoryCreate) -> Inventory:
@@ -38,10 +165,15 @@ def create_inventory_item(db: Session, inventory_item: InventoryCreate) -> Inven
             location=inventory_item.location
         )
         
-        # Add to database session
+        # Add to database session and roll the item into the summary
         db.add(db_inventory)
+        db.flush()
+        apply_summary_delta(db, {}, contributions_of([inventory_item]))
+        record_inventory_changes(db, [db_inventory.id])
         db.commit()
         db.refresh(db_inventory)
+        _invalidate_cached_items([db_inventory.id])
+        inventory_search_index.index_item(db_inventory.id, db_inventory)
         
         return db_inventory
         
@@ -54,6 +186,12 @@ def get_inventory_item_by_id(db: Session, item_id: int) -> Optional[Inventory]:
     """
     Retrieve an inventory item by its ID.
     
+    Reads go through the inventory cache; on a hit a detached Inventory is
+    built from the cached column values without touching the database.
+    Misses read from a replica are not cached, so the cache only ever holds
+    rows read from the primary. A miss is only cached if the item was not
+    evicted by a write while it was being read.
+    
     Args:
         db (Session): Database session
         item_id (int): ID of the inventory item to retrieve
@@ -61,61 +199,479 @@ def get_inventory_item_by_id(db: Session, item_id: int) -> Optional[Inventory]:
     Returns:
         Optional[Inventory]: The inventory item if found, None otherwise
     """
+    cache = get_inventory_cache()
+    cached = cache.get(item_id)
+    if cached is not None:
+        return Inventory(**cached)
+    
+    token = cache.token()
     try:
-        return db.query(Inventory).filter(Inventory.id == item_id).first()
+        db_inventory = db.query(Inventory).filter(Inventory.id == item_id).first()
     except SQLAlchemyError as e:
         raise e
+    
+    if db_inventory is not None and not reads_from_replica(db):
+        cache.set(item_id, _to_cache_value(db_inventory), token)
+    return db_inventory
+
+
+def get_inventory_item_version(db: Session, item_id: int) -> Optional[int]:
+    """
+    Get the current version of an inventory item, for conditional GETs.
+    
+    Served from the inventory cache when possible, which only holds rows
+    read from the primary and is invalidated on every write, otherwise with
+    a single-column SELECT by primary key.
+    
+    Args:
+        db (Session): Database session
+        item_id (int): ID of the inventory item
+        
+    Returns:
+        Optional[int]: The item's version, or None if it does not exist
+    """
+    cached = get_inventory_cache().get(item_id)
+    if cached is not None:
+        return cached["version"]
+    
+    return db.execute(
+        select(Inventory.version).where(Inventory.id == item_id)
+    ).scalar_one_or_none()
+
+
+def get_inventory_items_by_ids(db: Session, item_ids: Iterable[int]) -> Dict[int, Inventory]:
+    """
+    Retrieve many inventory items by ID.
+    
+    Cached items are served from the inventory cache and all misses are
+    fetched with one ``IN`` query; misses read from a replica, or evicted by
+    a write while they were being read, are not cached.
+    
+    Args:
+        db (Session): Database session
+        item_ids (Iterable[int]): IDs of the inventory items to retrieve
+        
+    Returns:
+        Dict[int, Inventory]: Found inventory items keyed by ID; missing IDs are absent
+    """
+    cache = get_inventory_cache()
+    found: Dict[int, Inventory] = {}
+    misses: List[int] = []
+    
+    for item_id in dict.fromkeys(item_ids):
+        cached = cache.get(item_id)
+        if cached is not None:
+            found[item_id] = Inventory(**cached)
+        else:
+            misses.append(item_id)
+    
+    if misses:
+        token = cache.token()
+        try:
+            rows = db.query(Inventory).filter(Inventory.id.in_(misses)).all()
+        except SQLAlchemyError as e:
+            raise e
+        cacheable = not reads_from_replica(db)
+        for db_inventory in rows:
+            if cacheable:
+                cache.set(db_inventory.id, _to_cache_value(db_inventory), token)
+            found[db_inventory.id] = db_inventory
+    
+    return found
+
+
+def inventory_filter_conditions(filters: Optional[InventoryFilter]) -> List[Any]:
+    """
+    Translate listing filters into SQL conditions.
+    
+    Args:
+        filters (Optional[InventoryFilter]): Filters to apply
+        
+    Returns:
+        List[Any]: Conditions to AND together; empty when nothing is filtered
+    """
+    if filters is None:
+        return []
+    
+    conditions = []
+    for field, value in filters.model_dump(exclude_none=True).items():
+        column, comparison = INVENTORY_FILTERS[field]
+        if comparison == "eq":
+            conditions.append(column == value)
+        elif comparison == "ge":
+            conditions.append(column >= value)
+        else:
+            conditions.append(column <= value)
+    return conditions
+
+
+def inventory_listing_query(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: Optional[InventoryFilter] = None,
+    columns: Optional[Sequence[Any]] = None
+) -> Any:
+    """
+    Build the query behind inventory listings.
+    
+    Equality filters on item_type/location and ranges on quantity map onto
+    the composite indexes declared on the Inventory model, so common
+    warehouse listings are index range scans.
+    
+    Args:
+        db (Session): Database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key from INVENTORY_SORT_KEYS, '-' prefix for descending. Defaults to "id".
+        filters (Optional[InventoryFilter], optional): Filters to apply. Defaults to None.
+        columns (Optional[Sequence[Any]], optional): Columns to select instead of Inventory entities. Defaults to None.
+        
+    Returns:
+        Any: The filtered, ordered and paginated query
+        
+    Raises:
+        ValueError: If order_by is unsupported or the cursor is invalid
+    """
+    query = db.query(*(columns or (Inventory,))).filter(*inventory_filter_conditions(filters))
+    return paginate(
+        query, INVENTORY_SORT_KEYS, Inventory.id,
+        skip=skip, limit=limit, after=after, order_by=order_by
+    )
 
 
-def get_all_inventory_items(db: Session, skip: int = 0, limit: int = 100) -> List[Inventory]:
+def get_all_inventory_items(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: Optional[InventoryFilter] = None
+) -> List[Inventory]:
     """
-    Retrieve all inventory items with optional pagination.
+    Retrieve all inventory items with optional filtering and pagination.
+    
+    When ``after`` is given, keyset pagination is used and ``skip`` is ignored.
+    Cursors stay valid only for the filters they were issued with.
     
     Args:
         db (Session): Database session
         skip (int, optional): Number of records to skip. Defaults to 0.
         limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key from INVENTORY_SORT_KEYS, '-' prefix for descending. Defaults to "id".
+        filters (Optional[InventoryFilter], optional): Filters to apply. Defaults to None.
         
     Returns:
         List[Inventory]: List of inventory items
+        
+    Raises:
+        ValueError: If order_by is unsupported or the cursor is invalid
+    """
+    try:
+        return inventory_listing_query(db, skip, limit, after, order_by, filters).all()
+    except SQLAlchemyError as e:
+        raise e
+
+
+def get_inventory_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: Optional[InventoryFilter] = None
+) -> List[Row]:
+    """
+    Retrieve an inventory listing page as plain rows of INVENTORY_LISTING_COLUMNS.
+    
+    Same query and pagination as get_all_inventory_items, without building
+    ORM objects or registering them in the session; for read-only listings
+    that are serialized straight to JSON.
+    
+    Args:
+        db (Session): Database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key from INVENTORY_SORT_KEYS, '-' prefix for descending. Defaults to "id".
+        filters (Optional[InventoryFilter], optional): Filters to apply. Defaults to None.
+        
+    Returns:
+        List[Row]: Rows in INVENTORY_LISTING_COLUMNS order
+        
+    Raises:
+        ValueError: If order_by is unsupported or the cursor is invalid
     """
     try:
-        return db.query(Inventory).offset(skip).limit(limit).all()
+        return inventory_listing_query(
+            db, skip, limit, after, order_by, filters, columns=INVENTORY_LISTING_COLUMNS
+        ).all()
     except SQLAlchemyError as e:
         raise e
 
 
-def update_inventory_item(db: Session, item_id: int, inventory_update: InventoryUpdate) -> Optional[Inventory]:
+def get_inventory_page_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: Optional[InventoryFilter] = None
+) -> List[Row]:
+    """
+    Get the (id, version) pairs of the rows an inventory listing page holds.
+    
+    Runs the listing query selecting only the two columns, so a polling
+    client's copy of the page can be validated without loading the rows.
+    
+    Args:
+        db (Session): Database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key from INVENTORY_SORT_KEYS, '-' prefix for descending. Defaults to "id".
+        filters (Optional[InventoryFilter], optional): Filters to apply. Defaults to None.
+        
+    Returns:
+        List[Row]: (id, version) rows in page order
+        
+    Raises:
+        ValueError: If order_by is unsupported or the cursor is invalid
+    """
+    return inventory_listing_query(
+        db, skip, limit, after, order_by, filters, columns=(Inventory.id, Inventory.version)
+    ).all()
+
+
+def get_inventory_next_cursor(items: List[Any], limit: int, order_by: str = "id") -> Optional[str]:
+    """
+    Compute the cursor for the page following ``items``.
+    
+    Args:
+        items (List[Any]): Inventory items or listing rows of the current page
+        limit (int): Page size the items were fetched with
+        order_by (str, optional): Sort key of the page. Defaults to "id".
+        
+    Returns:
+        Optional[str]: Cursor for the next page, or None on the last page
+    """
+    return next_cursor(items, limit, INVENTORY_SORT_KEYS, order_by)
+
+
+def stream_inventory_rows(db: Session, batch_size: int = 1000) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Stream all inventory rows as plain column tuples over a server-side cursor.
+    
+    Sync counterpart of stream_inventory_rows_async, for background jobs
+    running in worker threads.
+    
+    Args:
+        db (Session): Database session
+        batch_size (int, optional): Rows fetched per batch. Defaults to 1000.
+        
+    Yields:
+        List[Tuple[Any, ...]]: Batches of rows in INVENTORY_EXPORT_COLUMNS order
+    """
+    result = db.execute(
+        select(*INVENTORY_EXPORT_COLUMNS)
+        .order_by(Inventory.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+def encode_inventory_rows(rows: List[Tuple[Any, ...]], export_format: str) -> str:
+    """
+    Encode a batch of export rows as newline-delimited JSON or CSV.
+    
+    Args:
+        rows (List[Tuple[Any, ...]]): Rows in INVENTORY_EXPORT_COLUMNS order
+        export_format (str): 'ndjson' or 'csv'
+        
+    Returns:
+        str: The encoded lines
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    return "".join(json.dumps(dict(zip(INVENTORY_EXPORT_FIELDS, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+def search_inventory_items(
+    db: Session,
+    query: str,
+    fields: Optional[List[str]] = None,
+    limit: int = 20
+) -> List[Tuple[Inventory, float]]:
+    """
+    Search inventory items by partial, normalised text.
+    
+    Matching and ranking run against the in-memory search index; the hits
+    are then loaded through the inventory cache with at most one ``IN``
+    query.
+    
+    Args:
+        db (Session): Database session
+        query (str): Text to search for
+        fields (Optional[List[str]], optional): Fields to search (item_name,
+            item_type, location). Defaults to item_name only.
+        limit (int, optional): Maximum number of results. Defaults to 20.
+        
+    Returns:
+        List[Tuple[Inventory, float]]: Matching items with their scores, best first
+        
+    Raises:
+        ValueError: If a field is not searchable
+        SearchIndexNotReadyError: If the search index has not been built yet
+    """
+    if not inventory_search_index.ready:
+        raise SearchIndexNotReadyError()
+    
+    hits = inventory_search_index.search(query, fields=fields, limit=limit)
+    items = get_inventory_items_by_ids(db, [item_id for item_id, _ in hits])
+    return [(items[item_id], score) for item_id, score in hits if item_id in items]
+
+
+def _version_conflict_or_missing(db: Session, item_id: int, expected_version: Optional[int]) -> None:
+    """
+    Diagnose a guarded write that matched no row.
+    
+    Raises:
+        VersionConflictError: If the item exists but its version differs
+    """
+    if expected_version is None:
+        return
+    
+    current_version = db.execute(
+        select(Inventory.version).where(Inventory.id == item_id)
+    ).scalar_one_or_none()
+    if current_version is not None:
+        raise VersionConflictError(item_id, expected_version, current_version)
+
+
+def _update_inventory_returning(
+    db: Session,
+    item_id: int,
+    conditions: List[Any],
+    update_data: Dict[str, Any],
+    touches_summary: bool
+) -> Tuple[Optional[Inventory], Contributions]:
+    """
+    Apply an inventory update with ``UPDATE ... RETURNING``, taking no row lock.
+    
+    When the summary is affected, the row's version and summarised columns
+    are read first and the UPDATE is guarded by that version, so the summary
+    delta is computed from exactly the row the UPDATE replaced. If another
+    write committed in between, the read and the UPDATE are repeated; this
+    only happens when some other write to the row succeeded.
+    
+    Returns:
+        Tuple[Optional[Inventory], Contributions]: The updated row, or None if
+        no row matched ``conditions``, and its summary contribution before the update
+    """
+    statement = (
+        update(Inventory)
+        .values(**update_data, version=Inventory.version + 1)
+        .returning(Inventory)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    if not touches_summary:
+        return db.execute(statement.where(*conditions)).scalar_one_or_none(), {}
+    
+    while True:
+        snapshot = db.execute(select(Inventory.version, *SUMMARY_COLUMNS).where(*conditions)).first()
+        if snapshot is None:
+            return None, {}
+        db_inventory = db.execute(
+            statement.where(Inventory.id == item_id, Inventory.version == snapshot.version)
+        ).scalar_one_or_none()
+        if db_inventory is not None:
+            return db_inventory, contributions_of([snapshot])
+
+
+def update_inventory_item(
+    db: Session,
+    item_id: int,
+    inventory_update: InventoryUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[Inventory]:
     """
     Update an existing inventory item.
     
+    The write is a single ``UPDATE ... WHERE id = :id [AND version = :v]``
+    that also increments ``version``. Where the dialect supports UPDATE ...
+    RETURNING it returns the updated row (see _update_inventory_returning).
+    Otherwise (MySQL) whether it applied is taken from the rowcount and the
+    row is read back by primary key, and when a summarised field changes the
+    row's summarised columns are first read with a row lock, so the
+    inventory summary can be adjusted by delta in the same transaction.
+    
     Args:
         db (Session): Database session
         item_id (int): ID of the inventory item to update
         inventory_update (InventoryUpdate): Updated inventory item data
+        expected_version (Optional[int], optional): Only update if the row is at this version. Defaults to None.
         
     Returns:
         Optional[Inventory]: The updated inventory item if found, None otherwise
         
     Raises:
+        VersionConflictError: If expected_version is given and does not match
         SQLAlchemyError: If database operation fails
     """
     try:
-        # Get the existing inventory item
-        db_inventory = db.query(Inventory).filter(Inventory.id == item_id).first()
-        
-        if not db_inventory:
-            return None
-            
         # Update only the fields that are provided (not None)
-        update_data = inventory_update.model_dump(exclude_unset=True)
+        update_data = {
+            field: value
+            for field, value in inventory_update.model_dump(exclude_unset=True).items()
+            if value is not None
+        }
+        
+        conditions = [Inventory.id == item_id]
+        if expected_version is not None:
+            conditions.append(Inventory.version == expected_version)
         
-        for field, value in update_data.items():
-            if hasattr(db_inventory, field):
-                setattr(db_inventory, field, value)
+        if not update_data:
+            db_inventory = db.execute(select(Inventory).where(*conditions)).scalar_one_or_none()
+            if db_inventory is None:
+                _version_conflict_or_missing(db, item_id, expected_version)
+            return db_inventory
         
+        touches_summary = bool(SUMMARY_FIELDS & update_data.keys())
+        if db.get_bind().dialect.update_returning:
+            db_inventory, before = _update_inventory_returning(
+                db, item_id, conditions, update_data, touches_summary
+            )
+        else:
+            # Lock and snapshot the row only when the summary is affected
+            before = snapshot_contributions(db, [item_id], lock=True) if touches_summary else {}
+            result = db.execute(
+                update(Inventory)
+                .where(*conditions)
+                .values(**update_data, version=Inventory.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            db_inventory = db.get(Inventory, item_id, populate_existing=True) if result.rowcount == 1 else None
+        
+        if db_inventory is None:
+            db.rollback()
+            _version_conflict_or_missing(db, item_id, expected_version)
+            return None
+        
+        if touches_summary:
+            apply_summary_delta(db, before, contributions_of([db_inventory]))
+        if SEARCH_FIELDS.keys() & update_data.keys():
+            record_inventory_changes(db, [item_id])
         db.commit()
-        db.refresh(db_inventory)
+        _invalidate_cached_items([item_id])
+        if SEARCH_FIELDS.keys() & update_data.keys():
+            inventory_search_index.index_item(item_id, db_inventory)
         
         return db_inventory
         
@@ -124,33 +680,691 @@ def update_inventory_item(db: Session, item_id: int, inventory_update: Inventory
         raise e
 
 
-def delete_inventory_item(db: Session, item_id: int) -> bool:
+def delete_inventory_item(db: Session, item_id: int, expected_version: Optional[int] = None) -> bool:
     """
     Delete an inventory item by its ID.
     
+    The delete is a single ``DELETE ... WHERE id = :id [AND version = :v]``
+    returning the row's summarised columns, whose contribution is removed
+    from the inventory summary. Dialects without DELETE ... RETURNING (MySQL)
+    read the columns with a row lock first.
+    
     Args:
         db (Session): Database session
         item_id (int): ID of the inventory item to delete
+        expected_version (Optional[int], optional): Only delete if the row is at this version. Defaults to None.
         
     Returns:
         bool: True if the item was deleted, False if not found
         
     Raises:
+        VersionConflictError: If expected_version is given and does not match
         SQLAlchemyError: If database operation fails
     """
     try:
-        # Get the existing inventory item
-        db_inventory = db.query(Inventory).filter(Inventory.id == item_id).first()
+        conditions = [Inventory.id == item_id]
+        if expected_version is not None:
+            conditions.append(Inventory.version == expected_version)
+        
+        statement = delete(Inventory).where(*conditions).execution_options(synchronize_session=False)
+        if db.get_bind().dialect.delete_returning:
+            deleted = db.execute(statement.returning(*SUMMARY_COLUMNS)).all()
+            before = contributions_of(deleted)
+        else:
+            before = snapshot_contributions(db, [item_id], lock=True)
+            deleted = [None] * db.execute(statement).rowcount
         
-        if not db_inventory:
+        if len(deleted) != 1:
+            db.rollback()
+            _version_conflict_or_missing(db, item_id, expected_version)
             return False
-            
-        # Delete the item
-        db.delete(db_inventory)
-        db.commit()
         
+        apply_summary_delta(db, before, {})
+        record_inventory_changes(db, [item_id])
+        db.commit()
+        _invalidate_cached_items([item_id])
+        inventory_search_index.remove_item(item_id)
         return True
         
     except SQLAlchemyError as e:
         db.rollback()
-        raise e
\ No newline at end of file
+        raise e
+
+
+def validate_inventory_rows(rows: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, InventoryCreate]], List[Dict[str, Any]]]:
+    """
+    Validate raw rows against InventoryCreate in a single pass.
+    
+    Args:
+        rows (List[Dict[str, Any]]): Raw inventory rows
+        
+    Returns:
+        Tuple[List[Tuple[int, InventoryCreate]], List[Dict[str, Any]]]: Valid rows
+        with their positions, and one error entry per invalid row
+    """
+    valid: List[Tuple[int, InventoryCreate]] = []
+    errors: List[Dict[str, Any]] = []
+    
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, InventoryCreate.model_validate(row)))
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "errors": [
+                    f"{'.'.join(str(loc) for loc in error['loc']) or 'row'}: {error['msg']}"
+                    for error in e.errors()
+                ]
+            })
+    
+    return valid, errors
+
+
+def _existing_ids_by_natural_key(db: Session, items: List[InventoryCreate]) -> Dict[Tuple[str, str], int]:
+    """
+    Look up existing inventory IDs by (item_name, location) with one query.
+    
+    Args:
+        db (Session): Database session
+        items (List[InventoryCreate]): Items whose natural keys to look up
+        
+    Returns:
+        Dict[Tuple[str, str], int]: Existing IDs keyed by (item_name, location)
+    """
+    keys = {(item.item_name, item.location) for item in items}
+    names = {name for name, _ in keys}
+    locations = {location for _, location in keys}
+    
+    rows = db.execute(
+        select(Inventory.id, Inventory.item_name, Inventory.location)
+        .where(Inventory.item_name.in_(names), Inventory.location.in_(locations))
+        .order_by(Inventory.id)
+    )
+    
+    existing: Dict[Tuple[str, str], int] = {}
+    for item_id, item_name, location in rows:
+        if (item_name, location) in keys:
+            existing.setdefault((item_name, location), item_id)
+    return existing
+
+
+def _insert_inventory_chunk(db: Session, items: List[InventoryCreate]) -> List[int]:
+    """
+    Insert a chunk of inventory items with multi-row INSERTs.
+    
+    Where the dialect supports RETURNING, the rows are sent as one
+    executemany with ``sort_by_parameter_order``, so SQLAlchemy returns the
+    IDs in the order of ``items``; it batches them into multi-row INSERTs
+    where it can match returned rows to parameters (PostgreSQL) and inserts
+    one row per statement where it cannot (SQLite, in-process, where that is
+    cheap).
+    
+    MySQL has no RETURNING, and with its default innodb_autoinc_lock_mode 2
+    a multi-row INSERT may get non-consecutive IDs interleaved with
+    concurrent inserts, so each
+    ``INSERT ... VALUES (...), (...)`` (split only to stay under
+    MAX_INSERT_PARAMETERS bind parameters) is followed by a read of the rows
+    from LAST_INSERT_ID() on. A consistent read taken before the INSERT pins
+    the transaction's snapshot (REPEATABLE READ), so that read sees this
+    transaction's new rows but no row committed by others afterwards, and
+    the IDs of one statement ascend in row order.
+    
+    Args:
+        db (Session): Database session
+        items (List[InventoryCreate]): Items to insert
+        
+    Returns:
+        List[int]: IDs of the inserted rows, in the order of ``items``
+    """
+    values = [item.model_dump() for item in items]
+    if not values:
+        return []
+    if db.get_bind().dialect.insert_returning:
+        statement = insert(Inventory).returning(Inventory.id, sort_by_parameter_order=True)
+        return list(db.execute(statement, values).scalars())
+    
+    rows_per_statement = max(MAX_INSERT_PARAMETERS // len(values[0]), 1)
+    db.execute(select(Inventory.id).limit(1)).all()
+    
+    ids: List[int] = []
+    for start in range(0, len(values), rows_per_statement):
+        batch = values[start:start + rows_per_statement]
+        first_id = db.execute(insert(Inventory).values(batch)).lastrowid
+        new_ids = list(db.execute(
+            select(Inventory.id)
+            .where(
+                Inventory.id >= first_id,
+                Inventory.item_name.in_({row["item_name"] for row in batch}),
+                Inventory.location.in_({row["location"] for row in batch})
+            )
+            .order_by(Inventory.id)
+            .limit(len(batch))
+        ).scalars())
+        if len(new_ids) != len(batch):
+            raise SQLAlchemyError(f"Resolved {len(new_ids)} IDs for {len(batch)} inserted inventory rows")
+        ids.extend(new_ids)
+    return ids
+
+
+def _bulk_update_statement():
+    """Build the executemany UPDATE used by upserts, bumping each row's version."""
+    table = Inventory.__table__
+    return (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(version=table.c.version + 1)
+    )
+
+
+def write_inventory_items(
+    db: Session,
+    items: List[InventoryCreate],
+    upsert: bool = False,
+    chunk_size: int = 500
+) -> Tuple[List[int], int, int]:
+    """
+    Write many inventory items with multi-row INSERTs, without committing.
+    
+    For callers that commit the items together with statements of their own,
+    such as an import checkpoint. The items are logged for other workers'
+    search index refreshes in the same transaction; after the commit, call
+    publish_inventory_items so this process's caches and search index see
+    them.
+    
+    In upsert mode, items matching an existing row on (item_name, location)
+    update that row instead; duplicates within the request collapse onto one
+    row with the last occurrence winning.
+    
+    Args:
+        db (Session): Database session
+        items (List[InventoryCreate]): Validated inventory items
+        upsert (bool, optional): Update rows matching on the natural key. Defaults to False.
+        chunk_size (int, optional): Rows written per statement. Defaults to 500.
+        
+    Returns:
+        Tuple[List[int], int, int]: ID per item (in order), created count and updated count
+        
+    Raises:
+        SQLAlchemyError: If database operation fails; the caller rolls back
+    """
+    ids: List[Optional[int]] = [None] * len(items)
+    created = 0
+    updated = 0
+    
+    for start in range(0, len(items), chunk_size):
+        chunk = list(enumerate(items[start:start + chunk_size], start))
+        
+        if not upsert:
+            new_ids = _insert_inventory_chunk(db, [item for _, item in chunk])
+            apply_summary_delta(db, {}, contributions_of(item for _, item in chunk))
+            for (index, _), item_id in zip(chunk, new_ids):
+                ids[index] = item_id
+            created += len(new_ids)
+            continue
+        
+        existing = _existing_ids_by_natural_key(db, [item for _, item in chunk])
+        updates: Dict[int, InventoryCreate] = {}
+        inserts: Dict[Tuple[str, str], InventoryCreate] = {}
+        positions: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        
+        for index, item in chunk:
+            key = (item.item_name, item.location)
+            if key in existing:
+                ids[index] = existing[key]
+                updates[existing[key]] = item
+            else:
+                inserts[key] = item
+                positions[key].append(index)
+        
+        if updates:
+            before = snapshot_contributions(db, updates.keys(), lock=True)
+            db.execute(
+                _bulk_update_statement(),
+                [{"b_id": item_id, **item.model_dump()} for item_id, item in updates.items()]
+            )
+            apply_summary_delta(db, before, contributions_of(updates.values()))
+            updated += len(updates)
+        
+        if inserts:
+            new_ids = _insert_inventory_chunk(db, list(inserts.values()))
+            apply_summary_delta(db, {}, contributions_of(inserts.values()))
+            for key, item_id in zip(inserts.keys(), new_ids):
+                for index in positions[key]:
+                    ids[index] = item_id
+            created += len(new_ids)
+    
+    record_inventory_changes(db, (item_id for item_id in ids if item_id is not None))
+    return ids, created, updated
+
+
+def publish_inventory_items(ids: List[int], items: List[InventoryCreate]) -> None:
+    """
+    Evict committed items from the cache and apply them to the search index.
+    
+    Args:
+        ids (List[int]): IDs returned by write_inventory_items
+        items (List[InventoryCreate]): The items written, in the same order
+    """
+    _invalidate_cached_items(item_id for item_id in ids if item_id is not None)
+    inventory_search_index.index_items(zip(ids, items))
+
+
+def bulk_create_inventory_items(
+    db: Session,
+    items: List[InventoryCreate],
+    upsert: bool = False,
+    chunk_size: int = 500
+) -> Tuple[List[int], int, int]:
+    """
+    Create many inventory items in one transaction with multi-row INSERTs.
+    
+    In upsert mode, items matching an existing row on (item_name, location)
+    update that row instead; duplicates within the request collapse onto one
+    row with the last occurrence winning.
+    
+    Args:
+        db (Session): Database session
+        items (List[InventoryCreate]): Validated inventory items
+        upsert (bool, optional): Update rows matching on the natural key. Defaults to False.
+        chunk_size (int, optional): Rows written per statement. Defaults to 500.
+        
+    Returns:
+        Tuple[List[int], int, int]: ID per item (in order), created count and updated count
+        
+    Raises:
+        SQLAlchemyError: If database operation fails
+    """
+    try:
+        ids, created, updated = write_inventory_items(db, items, upsert=upsert, chunk_size=chunk_size)
+        db.commit()
+        publish_inventory_items(ids, items)
+        return ids, created, updated
+        
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def _stock_adjustment_error(db: Session, deltas: Dict[int, float]) -> StockAdjustmentError:
+    """Work out which adjustments failed the existence or non-negative guard."""
+    quantities = dict(db.execute(
+        select(Inventory.id, Inventory.quantity).where(Inventory.id.in_(deltas.keys()))
+    ).all())
+    missing = sorted(item_id for item_id in deltas if item_id not in quantities)
+    insufficient = sorted(
+        item_id for item_id, quantity in quantities.items()
+        if quantity + deltas[item_id] < 0
+    )
+    return StockAdjustmentError(missing, insufficient)
+
+
+def adjust_inventory_quantity(db: Session, item_id: int, delta: float) -> Inventory:
+    """
+    Atomically add ``delta`` to an item's quantity.
+    
+    Runs one conditional ``UPDATE ... SET quantity = quantity + :delta WHERE
+    id = :id AND quantity + :delta >= 0``, so concurrent adjustments never
+    overwrite each other and no lock is taken before the statement. The
+    updated item is read back by primary key in the same transaction, and
+    the summary is moved by ``delta`` and ``delta * purchase_price``.
+    
+    Args:
+        db (Session): Database session
+        item_id (int): ID of the inventory item to adjust
+        delta (float): Quantity to add (negative to remove stock)
+        
+    Returns:
+        Inventory: The adjusted inventory item
+        
+    Raises:
+        StockAdjustmentError: If the item does not exist or stock would go negative
+        SQLAlchemyError: If database operation fails
+    """
+    try:
+        result = db.execute(
+            update(Inventory)
+            .where(Inventory.id == item_id, Inventory.quantity + delta >= 0)
+            .values(quantity=Inventory.quantity + delta, version=Inventory.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        
+        if result.rowcount != 1:
+            db.rollback()
+            raise _stock_adjustment_error(db, {item_id: delta})
+        
+        db_inventory = db.get(Inventory, item_id, populate_existing=True)
+        apply_summary_delta(db, {}, quantity_delta_contributions([db_inventory], {item_id: delta}))
+        db.commit()
+        _invalidate_cached_items([item_id])
+        
+        return db_inventory
+        
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def adjust_inventory_quantities(db: Session, adjustments: List[Tuple[int, float]]) -> List[int]:
+    """
+    Atomically apply many quantity adjustments with a single CASE-based UPDATE.
+    
+    Deltas for the same item are summed. The batch is all-or-nothing: if any
+    item is missing or would go negative, nothing is applied.
+    
+    Args:
+        db (Session): Database session
+        adjustments (List[Tuple[int, float]]): (item_id, delta) pairs
+        
+    Returns:
+        List[int]: IDs of the adjusted inventory items
+        
+    Raises:
+        StockAdjustmentError: If any item does not exist or stock would go negative
+        SQLAlchemyError: If database operation fails
+    """
+    deltas: Dict[int, float] = defaultdict(float)
+    for item_id, delta in adjustments:
+        deltas[item_id] += delta
+    deltas = dict(deltas)
+    
+    try:
+        delta_case = case(deltas, value=Inventory.id)
+        result = db.execute(
+            update(Inventory)
+            .where(Inventory.id.in_(deltas.keys()), Inventory.quantity + delta_case >= 0)
+            .values(quantity=Inventory.quantity + delta_case, version=Inventory.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        
+        if result.rowcount != len(deltas):
+            db.rollback()
+            raise _stock_adjustment_error(db, deltas)
+        
+        # The UPDATE holds the row locks, so the groups and prices read here
+        # are the ones the adjustment applied to
+        rows = db.execute(
+            select(Inventory.id, Inventory.item_type, Inventory.location, Inventory.purchase_price)
+            .where(Inventory.id.in_(deltas.keys()))
+        )
+        apply_summary_delta(db, {}, quantity_delta_contributions(rows, deltas))
+        db.commit()
+        _invalidate_cached_items(deltas.keys())
+        return sorted(deltas)
+        
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+async def create_inventory_item_async(db: AsyncSession, inventory_item: InventoryCreate) -> Inventory:
+    """
+    Create a new inventory item using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        inventory_item (InventoryCreate): Inventory item data to create
+        
+    Returns:
+        Inventory: The created inventory item
+    """
+    return await db.run_sync(create_inventory_item, inventory_item)
+
+
+async def get_inventory_item_by_id_async(db: AsyncSession, item_id: int) -> Optional[Inventory]:
+    """
+    Retrieve an inventory item by its ID using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        item_id (int): ID of the inventory item to retrieve
+        
+    Returns:
+        Optional[Inventory]: The inventory item if found, None otherwise
+    """
+    return await db.run_sync(get_inventory_item_by_id, item_id)
+
+
+async def get_inventory_item_version_async(db: AsyncSession, item_id: int) -> Optional[int]:
+    """
+    Get the current version of an inventory item using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        item_id (int): ID of the inventory item
+        
+    Returns:
+        Optional[int]: The item's version, or None if it does not exist
+    """
+    return await db.run_sync(get_inventory_item_version, item_id)
+
+
+async def get_inventory_items_by_ids_async(db: AsyncSession, item_ids: Iterable[int]) -> Dict[int, Inventory]:
+    """
+    Retrieve many inventory items by ID using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        item_ids (Iterable[int]): IDs of the inventory items to retrieve
+        
+    Returns:
+        Dict[int, Inventory]: Found inventory items keyed by ID; missing IDs are absent
+    """
+    return await db.run_sync(get_inventory_items_by_ids, list(item_ids))
+
+
+async def get_all_inventory_items_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: Optional[InventoryFilter] = None
+) -> List[Inventory]:
+    """
+    Retrieve all inventory items with optional filtering and pagination using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key, '-' prefix for descending. Defaults to "id".
+        filters (Optional[InventoryFilter], optional): Filters to apply. Defaults to None.
+        
+    Returns:
+        List[Inventory]: List of inventory items
+    """
+    return await db.run_sync(get_all_inventory_items, skip, limit, after, order_by, filters)
+
+
+async def get_inventory_rows_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: Optional[InventoryFilter] = None
+) -> List[Row]:
+    """
+    Retrieve an inventory listing page as plain rows using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key, '-' prefix for descending. Defaults to "id".
+        filters (Optional[InventoryFilter], optional): Filters to apply. Defaults to None.
+        
+    Returns:
+        List[Row]: Rows in INVENTORY_LISTING_COLUMNS order
+    """
+    return await db.run_sync(get_inventory_rows, skip, limit, after, order_by, filters)
+
+
+async def get_inventory_page_versions_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: Optional[InventoryFilter] = None
+) -> List[Row]:
+    """
+    Get the (id, version) pairs of an inventory listing page using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor returned with the previous page. Defaults to None.
+        order_by (str, optional): Sort key, '-' prefix for descending. Defaults to "id".
+        filters (Optional[InventoryFilter], optional): Filters to apply. Defaults to None.
+        
+    Returns:
+        List[Row]: (id, version) rows in page order
+    """
+    return await db.run_sync(get_inventory_page_versions, skip, limit, after, order_by, filters)
+
+
+async def search_inventory_items_async(
+    db: AsyncSession,
+    query: str,
+    fields: Optional[List[str]] = None,
+    limit: int = 20
+) -> List[Tuple[Inventory, float]]:
+    """
+    Search inventory items by partial, normalised text using an async database session.
+    
+    Matching and ranking run on a worker thread, so a broad query over a
+    large index does not hold up the event loop. The hits are then loaded
+    through the inventory cache with the async session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        query (str): Text to search for
+        fields (Optional[List[str]], optional): Fields to search. Defaults to item_name only.
+        limit (int, optional): Maximum number of results. Defaults to 20.
+        
+    Returns:
+        List[Tuple[Inventory, float]]: Matching items with their scores, best first
+        
+    Raises:
+        ValueError: If a field is not searchable
+        SearchIndexNotReadyError: If the search index has not been built yet
+    """
+    if not inventory_search_index.ready:
+        raise SearchIndexNotReadyError()
+    
+    hits = await asyncio.to_thread(inventory_search_index.search, query, fields, limit)
+    items = await get_inventory_items_by_ids_async(db, [item_id for item_id, _ in hits])
+    return [(items[item_id], score) for item_id, score in hits if item_id in items]
+
+
+async def update_inventory_item_async(
+    db: AsyncSession,
+    item_id: int,
+    inventory_update: InventoryUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[Inventory]:
+    """
+    Update an existing inventory item using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        item_id (int): ID of the inventory item to update
+        inventory_update (InventoryUpdate): Updated inventory item data
+        expected_version (Optional[int], optional): Only update if the row is at this version. Defaults to None.
+        
+    Returns:
+        Optional[Inventory]: The updated inventory item if found, None otherwise
+    """
+    return await db.run_sync(update_inventory_item, item_id, inventory_update, expected_version)
+
+
+async def delete_inventory_item_async(db: AsyncSession, item_id: int, expected_version: Optional[int] = None) -> bool:
+    """
+    Delete an inventory item by its ID using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        item_id (int): ID of the inventory item to delete
+        expected_version (Optional[int], optional): Only delete if the row is at this version. Defaults to None.
+        
+    Returns:
+        bool: True if the item was deleted, False if not found
+    """
+    return await db.run_sync(delete_inventory_item, item_id, expected_version)
+
+
+async def bulk_create_inventory_items_async(
+    db: AsyncSession,
+    items: List[InventoryCreate],
+    upsert: bool = False,
+    chunk_size: int = 500
+) -> Tuple[List[int], int, int]:
+    """
+    Create many inventory items in one transaction using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        items (List[InventoryCreate]): Validated inventory items
+        upsert (bool, optional): Update rows matching on the natural key. Defaults to False.
+        chunk_size (int, optional): Rows written per statement. Defaults to 500.
+        
+    Returns:
+        Tuple[List[int], int, int]: ID per item (in order), created count and updated count
+    """
+    return await db.run_sync(bulk_create_inventory_items, items, upsert, chunk_size)
+
+
+async def stream_inventory_rows_async(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator[List[Tuple[Any, ...]]]:
+    """
+    Stream all inventory rows as plain column tuples over a server-side cursor.
+    
+    Rows are fetched ``batch_size`` at a time, so memory stays flat regardless
+    of table size and the first batch is available before the query finishes.
+    
+    Args:
+        db (AsyncSession): Async database session
+        batch_size (int, optional): Rows fetched per batch. Defaults to 1000.
+        
+    Yields:
+        List[Tuple[Any, ...]]: Batches of rows in INVENTORY_EXPORT_COLUMNS order
+    """
+    result = await db.stream(
+        select(*INVENTORY_EXPORT_COLUMNS)
+        .order_by(Inventory.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+async def adjust_inventory_quantity_async(db: AsyncSession, item_id: int, delta: float) -> Inventory:
+    """
+    Atomically add ``delta`` to an item's quantity using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        item_id (int): ID of the inventory item to adjust
+        delta (float): Quantity to add (negative to remove stock)
+        
+    Returns:
+        Inventory: The adjusted inventory item
+    """
+    return await db.run_sync(adjust_inventory_quantity, item_id, delta)
+
+
+async def adjust_inventory_quantities_async(db: AsyncSession, adjustments: List[Tuple[int, float]]) -> List[int]:
+    """
+    Atomically apply many quantity adjustments using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        adjustments (List[Tuple[int, float]]): (item_id, delta) pairs
+        
+    Returns:
+        List[int]: IDs of the adjusted inventory items
+    """
+    return await db.run_sync(adjust_inventory_quantities, adjustments)
@@ -0,0 +1,192 @@
+"""
+Chunked CSV import for the Inventory Management module.
+
+This module streams supplier stock sheets from an uploaded CSV file into the
+inventory table. Rows are read one at a time, validated against
+InventoryCreate in batches and written with multi-row INSERTs, committing each
+chunk, so neither the file nor the full row set is ever held in memory and no
+single transaction grows with the file.
+
+Imports run as ``inventory_import`` background jobs, so their status and
+progress are kept in the jobs table and visible from every worker. Each
+chunk is committed in one transaction with the job's checkpoint (its
+counters and the number of rows consumed), so an import interrupted by a
+shutdown or a dead worker resumes after the last committed chunk, never
+writing a chunk twice. The upload is stored in JOB_OUTPUT_DIR, which must
+be shared when several hosts run jobs.
+"""
+
+import csv
+import io
+import os
+from typing import Any, Dict, List, Tuple
+from database import session_scope
+from jobs import JOB_OUTPUT_DIR, JobContext, JobInterrupted
+from models.job_model import Job
+from schemas.inventory_schema import InventoryCreate
+from crud.inventory_crud import publish_inventory_items, validate_inventory_rows, write_inventory_items
+
+
+# Job type that runs imports
+IMPORT_JOB_TYPE = "inventory_import"
+
+# Maximum number of row errors kept on a job
+MAX_REPORTED_ERRORS = 1000
+
+
+def import_upload_path(file: str) -> str:
+    """
+    Path of an uploaded import file.
+    
+    Args:
+        file (str): File name in JOB_OUTPUT_DIR, as stored in the job parameters
+    
+    Returns:
+        str: Path under JOB_OUTPUT_DIR
+    """
+    return os.path.join(JOB_OUTPUT_DIR, os.path.basename(file))
+
+
+def import_job_status(job: Job) -> Dict[str, Any]:
+    """
+    Describe an import job as InventoryImportStatus.
+    
+    Args:
+        job (Job): An inventory_import job
+    
+    Returns:
+        Dict[str, Any]: Job status, parameters and the counters of its last checkpoint
+    """
+    state = job.result or {}
+    return {
+        "id": job.id,
+        "status": job.status,
+        "progress": job.progress,
+        "upsert": job.params["upsert"],
+        "chunk_size": job.params["chunk_size"],
+        "total_bytes": job.params["total_bytes"],
+        "bytes_read": state.get("bytes_read", 0),
+        "rows_processed": state.get("rows_processed", 0),
+        "rows_created": state.get("rows_created", 0),
+        "rows_updated": state.get("rows_updated", 0),
+        "rows_failed": state.get("rows_failed", 0),
+        "errors": state.get("errors", []),
+        "error": job.error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at
+    }
+
+
+def _clean_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip cell whitespace and drop empty cells so schema defaults apply."""
+    return {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in row.items()
+        if key is not None and value not in (None, "")
+    }
+
+
+def _write_batch(
+    db,
+    state: Dict[str, Any],
+    params: Dict[str, Any],
+    batch: List[Dict[str, Any]],
+    line_numbers: List[int]
+) -> Tuple[List[int], List[InventoryCreate]]:
+    """
+    Validate a batch of raw rows, write the valid ones as one chunk without
+    committing and count them in ``state``; returns the written IDs and items.
+    """
+    valid, errors = validate_inventory_rows(batch)
+    
+    state["rows_processed"] += len(batch)
+    state["rows_failed"] += len(errors)
+    for error in errors:
+        if len(state["errors"]) < MAX_REPORTED_ERRORS:
+            state["errors"].append({"line": line_numbers[error["index"]], "errors": error["errors"]})
+    
+    items = [item for _, item in valid]
+    if not items:
+        return [], []
+    ids, created, updated = write_inventory_items(db, items, upsert=params["upsert"], chunk_size=params["chunk_size"])
+    state["rows_created"] += created
+    state["rows_updated"] += updated
+    return ids, items
+
+
+def _commit_batch(
+    db,
+    context: JobContext,
+    state: Dict[str, Any],
+    written: Tuple[List[int], List[InventoryCreate]],
+    done: int
+) -> None:
+    """Commit a written chunk together with the job's checkpoint, then publish it."""
+    context.checkpoint(db, state, done, context.params["total_bytes"])
+    publish_inventory_items(*written)
+    context.report(done, context.params["total_bytes"])
+
+
+def run_inventory_import(context: JobContext) -> Dict[str, Any]:
+    """
+    Import the uploaded CSV file of an inventory_import job.
+    
+    The CSV header must name InventoryCreate fields. Each chunk of
+    ``chunk_size`` data rows is validated and committed in one transaction
+    with the job's checkpoint, so a failure stops the import with the earlier
+    chunks committed and a rerun skips exactly the committed rows. The file is
+    removed when the import completes or fails, and kept when it is
+    interrupted.
+    
+    Args:
+        context (JobContext): The running job
+    
+    Returns:
+        Dict[str, Any]: Bytes read, row counters and row errors keyed by CSV line number
+    """
+    params = context.params
+    path = import_upload_path(params["file"])
+    state: Dict[str, Any] = dict(context.state or {
+        "bytes_read": 0,
+        "rows_processed": 0,
+        "rows_created": 0,
+        "rows_updated": 0,
+        "rows_failed": 0,
+        "errors": []
+    })
+    state["errors"] = list(state["errors"])
+    resume_after = state["rows_processed"]
+    
+    interrupted = False
+    try:
+        with open(path, "rb") as raw, session_scope() as db:
+            reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+            batch: List[Dict[str, Any]] = []
+            line_numbers: List[int] = []
+            
+            for rows_read, row in enumerate(reader, 1):
+                if rows_read <= resume_after:
+                    continue
+                batch.append(_clean_row(row))
+                line_numbers.append(reader.line_num)
+                
+                if len(batch) >= params["chunk_size"]:
+                    written = _write_batch(db, state, params, batch, line_numbers)
+                    batch, line_numbers = [], []
+                    # The file position runs a read buffer ahead of the
+                    # rows parsed; rows may be left until the loop ends
+                    state["bytes_read"] = min(raw.tell(), params["total_bytes"] - 1)
+                    _commit_batch(db, context, state, written, state["bytes_read"])
+            
+            written = _write_batch(db, state, params, batch, line_numbers)
+            state["bytes_read"] = params["total_bytes"]
+            _commit_batch(db, context, state, written, params["total_bytes"])
+        
+        return state
+    except JobInterrupted:
+        # The rerun resumes from the file
+        interrupted = True
+        raise
+    finally:
+        if not interrupted and os.path.exists(path):
+            os.remove(path)
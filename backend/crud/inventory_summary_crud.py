@@ -0,0 +1,278 @@
+"""
+Inventory summary operations for the Inventory Management module.
+
+This module maintains the inventory_summary rollup table by deltas. Write
+paths in inventory_crud work out how the rows they touch change the
+affected (item_type, location) groups (from values they already hold where
+possible, otherwise from one locking read of the rows) and apply the
+difference inside the same transaction. A full rebuild
+reconciles the table with the inventory (e.g. after out-of-band writes).
+
+Run a full rebuild from the backend directory with:
+    python -m crud.inventory_summary_crud
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from models.inventory_model import Inventory
+from models.inventory_summary_model import InventorySummary
+
+
+# Group key and rollup values (item_count, total_quantity, total_weight, stock_value)
+SummaryKey = Tuple[str, str]
+Contributions = Dict[SummaryKey, List[float]]
+
+# Inventory fields whose changes affect the summary
+SUMMARY_FIELDS = {"item_type", "location", "quantity", "weight", "purchase_price"}
+
+# Inventory columns read to compute a row's contribution
+SUMMARY_COLUMNS = (
+    Inventory.item_type,
+    Inventory.location,
+    Inventory.quantity,
+    Inventory.weight,
+    Inventory.purchase_price,
+)
+
+# Columns summary rows can be grouped by
+SUMMARY_GROUP_KEYS = {
+    "item_type": InventorySummary.item_type,
+    "location": InventorySummary.location,
+}
+
+
+def contributions_of(items: Iterable[Any]) -> Contributions:
+    """
+    Compute the summary contribution of rows held in memory.
+
+    Args:
+        items (Iterable[Any]): Objects with item_type, location, quantity, weight and purchase_price
+
+    Returns:
+        Contributions: Rollup values keyed by (item_type, location)
+    """
+    contributions: Contributions = defaultdict(lambda: [0, 0.0, 0.0, 0.0])
+    for item in items:
+        values = contributions[(item.item_type, item.location)]
+        values[0] += 1
+        values[1] += item.quantity
+        values[2] += item.weight
+        values[3] += item.quantity * item.purchase_price
+    return dict(contributions)
+
+
+def snapshot_contributions(db: Session, item_ids: Iterable[int], lock: bool = False) -> Contributions:
+    """
+    Compute the summary contribution of stored inventory rows.
+
+    Reads the summarised columns of the rows with one query and aggregates
+    them in Python, so the same statement can take the row locks.
+
+    Args:
+        db (Session): Database session
+        item_ids (Iterable[int]): IDs of the inventory rows
+        lock (bool, optional): Lock the rows (SELECT ... FOR UPDATE) so the
+            snapshot stays valid until the transaction ends. Defaults to False.
+
+    Returns:
+        Contributions: Rollup values keyed by (item_type, location)
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return {}
+
+    statement = select(*SUMMARY_COLUMNS).where(Inventory.id.in_(item_ids))
+    if lock:
+        statement = statement.with_for_update()
+    return contributions_of(db.execute(statement))
+
+
+def quantity_delta_contributions(rows: Iterable[Any], deltas: Dict[int, float]) -> Contributions:
+    """
+    Compute the summary change of quantity adjustments.
+
+    Only quantity and stock value change, so the delta follows from the
+    adjustment and the row's group and purchase price without reading the
+    old quantity.
+
+    Args:
+        rows (Iterable[Any]): Objects with id, item_type, location and purchase_price
+        deltas (Dict[int, float]): Quantity added, keyed by item ID
+
+    Returns:
+        Contributions: Rollup changes keyed by (item_type, location)
+    """
+    contributions: Contributions = defaultdict(lambda: [0, 0.0, 0.0, 0.0])
+    for row in rows:
+        values = contributions[(row.item_type, row.location)]
+        values[1] += deltas[row.id]
+        values[3] += deltas[row.id] * row.purchase_price
+    return dict(contributions)
+
+
+def _upsert_summary_row(db: Session, key: SummaryKey, delta: List[float]) -> None:
+    """Add a delta to one summary group, creating the group if needed."""
+    item_type, location = key
+    increments = {
+        "item_count": InventorySummary.item_count + delta[0],
+        "total_quantity": InventorySummary.total_quantity + delta[1],
+        "total_weight": InventorySummary.total_weight + delta[2],
+        "stock_value": InventorySummary.stock_value + delta[3],
+    }
+    values = {
+        "item_type": item_type,
+        "location": location,
+        "item_count": delta[0],
+        "total_quantity": delta[1],
+        "total_weight": delta[2],
+        "stock_value": delta[3],
+    }
+
+    # Dialect inserts are imported on first use: the postgresql dialect alone
+    # adds tens of milliseconds to application import time
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        db.execute(mysql_insert(InventorySummary).values(**values).on_duplicate_key_update(**increments))
+        return
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        db.execute(
+            dialect_insert(InventorySummary).values(**values).on_conflict_do_update(
+                index_elements=[InventorySummary.item_type, InventorySummary.location],
+                set_=increments
+            )
+        )
+        return
+
+    result = db.execute(
+        update(InventorySummary)
+        .where(InventorySummary.item_type == item_type, InventorySummary.location == location)
+        .values(**increments)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(InventorySummary).values(**values))
+
+
+def apply_summary_delta(db: Session, before: Contributions, after: Contributions) -> None:
+    """
+    Apply the difference between two contributions to the summary table.
+
+    Runs one upsert per affected group and does not commit; call it inside
+    the transaction of the inventory write.
+
+    Args:
+        db (Session): Database session
+        before (Contributions): Contribution of the touched rows before the write
+        after (Contributions): Contribution of the touched rows after the write
+    """
+    for key in set(before) | set(after):
+        old = before.get(key, [0, 0.0, 0.0, 0.0])
+        new = after.get(key, [0, 0.0, 0.0, 0.0])
+        delta = [(new_value or 0) - (old_value or 0) for old_value, new_value in zip(old, new)]
+        if any(delta):
+            _upsert_summary_row(db, key, delta)
+
+
+def rebuild_inventory_summary(db: Session) -> int:
+    """
+    Rebuild the summary table from the inventory in one transaction.
+
+    Args:
+        db (Session): Database session
+
+    Returns:
+        int: Number of summary groups written
+
+    Raises:
+        SQLAlchemyError: If database operation fails
+    """
+    try:
+        db.execute(delete(InventorySummary))
+        grouped = (
+            select(
+                Inventory.item_type,
+                Inventory.location,
+                func.count(Inventory.id),
+                func.coalesce(func.sum(Inventory.quantity), 0.0),
+                func.coalesce(func.sum(Inventory.weight), 0.0),
+                func.coalesce(func.sum(Inventory.quantity * Inventory.purchase_price), 0.0),
+            )
+            .group_by(Inventory.item_type, Inventory.location)
+        )
+        result = db.execute(
+            insert(InventorySummary).from_select(
+                ["item_type", "location", "item_count", "total_quantity", "total_weight", "stock_value"],
+                grouped
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def get_inventory_summary(db: Session, group_by: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Read stock rollups from the summary table.
+
+    Args:
+        db (Session): Database session
+        group_by (Optional[str], optional): 'item_type' or 'location' to roll up
+            further; None returns one row per (item_type, location). Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: Rollup rows
+
+    Raises:
+        ValueError: If group_by is not supported
+    """
+    if group_by is not None and group_by not in SUMMARY_GROUP_KEYS:
+        raise ValueError(f"Unsupported group_by '{group_by}'. Supported: {', '.join(sorted(SUMMARY_GROUP_KEYS))}")
+
+    group_columns = [SUMMARY_GROUP_KEYS[group_by]] if group_by else list(SUMMARY_GROUP_KEYS.values())
+    rows = db.execute(
+        select(
+            *group_columns,
+            func.sum(InventorySummary.item_count).label("item_count"),
+            func.sum(InventorySummary.total_quantity).label("total_quantity"),
+            func.sum(InventorySummary.total_weight).label("total_weight"),
+            func.sum(InventorySummary.stock_value).label("stock_value"),
+        )
+        .where(InventorySummary.item_count > 0)
+        .group_by(*group_columns)
+        .order_by(*group_columns)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+async def get_inventory_summary_async(db: AsyncSession, group_by: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Read stock rollups from the summary table using an async database session.
+
+    Args:
+        db (AsyncSession): Async database session
+        group_by (Optional[str], optional): 'item_type' or 'location'. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: Rollup rows
+    """
+    return await db.run_sync(get_inventory_summary, group_by)
+
+
+if __name__ == "__main__":
+    from database import session_scope
+
+    with session_scope() as session:
+        groups = rebuild_inventory_summary(session)
+    print(f"Inventory summary rebuilt: {groups} groups")
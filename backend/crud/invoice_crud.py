@@ -1,90 +1,310 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+"""
+Invoice CRUD operations for the ZATCA E-Invoicing module.
 
-from ..models.invoice import Invoice
-from ..schemas.invoice import InvoiceCreate, InvoiceUpdate
+This module provides CRUD (Create, Read, Update, Delete) operations
+for invoices and their line items in the Amanat Al-Kalima Company ERP system.
+"""
+
+import os
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.invoice_model import Invoice, InvoiceItem
+from schemas.invoice_schema import InvoiceCreate, InvoiceUpdate
+from crud.pagination import paginate, next_cursor
+from crud.customer_crud import get_customer_names
+
+
+# VAT rate applied to invoice totals (ZATCA standard rate is 15%)
+VAT_RATE = float(os.getenv("VAT_RATE", "0.15"))
+
+# Maximum number of invoice lines written per multi-row INSERT
+INVOICE_ITEMS_CHUNK_SIZE = 1000
+
+
+def _invoice_query(db: Session, include_items: bool):
+    """
+    Base invoice query, loading items with one batched SELECT ... IN when requested.
+    
+    Invoice.items is declared lazy="raise_on_sql", so callers that skip
+    include_items and later touch items fail loudly instead of issuing one
+    query per invoice.
+    """
+    query = db.query(Invoice)
+    if include_items:
+        query = query.options(selectinload(Invoice.items))
+    return query
+
+
+def _attach_customer_names(db: Session, invoices: List[Invoice]) -> List[Invoice]:
+    """
+    Resolve the customer names of a batch of invoices.
+    
+    Names come from the customer cache, with one IN query for all misses, so
+    a page of invoices never triggers a customer lookup per row.
+    """
+    names = get_customer_names(db, {invoice.customer_id for invoice in invoices})
+    for invoice in invoices:
+        invoice.customer_name = names.get(invoice.customer_id)
+    return invoices
+
+
+def _with_customer_names(db: Session, rows: List[Any]) -> List[Tuple[int, int, Optional[str]]]:
+    """Turn (id, version, customer_id) rows into (id, version, customer_name) triples."""
+    names = get_customer_names(db, {row.customer_id for row in rows})
+    return [(row.id, row.version, names.get(row.customer_id)) for row in rows]
+
+
+def invoice_etag_parts(invoices: List[Invoice]) -> List[Tuple[int, int, Optional[str]]]:
+    """
+    Values an invoice response's ETag is computed from.
+    
+    Invoice items are written with the invoice and never change on their
+    own, so an invoice's representation changes only with its version or its
+    customer's name.
+    
+    Args:
+        invoices: Invoices with their customer names attached
+        
+    Returns:
+        (id, version, customer_name) per invoice, in order
+    """
+    return [(invoice.id, invoice.version, invoice.customer_name) for invoice in invoices]
+
+
+# Sort keys accepted by order_by, mapped to their columns
+INVOICE_SORT_KEYS = {
+    "id": Invoice.id,
+    "invoice_issue_date": Invoice.invoice_issue_date,
+    "due_date": Invoice.due_date,
+    "total_amount_with_vat": Invoice.total_amount_with_vat,
+}
+
+
+def calculate_invoice_totals(invoice_in: InvoiceCreate, vat_rate: float = VAT_RATE) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """
+    Compute line totals and invoice totals in one pass over the items.
+    
+    Amounts are rounded to 2 decimal places (halalas) per line and per total.
+    
+    Args:
+        invoice_in: Invoice data
+        vat_rate: VAT rate applied to the total amount
+        
+    Returns:
+        The invoice item rows (without invoice_id) and the header totals
+    """
+    rows = []
+    total_amount = 0.0
+    for item in invoice_in.items:
+        line_total = round(item.quantity * item.unit_price, 2)
+        total_amount += line_total
+        rows.append({
+            "item_name": item.item_name,
+            "quantity": item.quantity,
+            "unit_price": item.unit_price,
+            "line_total": line_total,
+        })
+    
+    total_amount = round(total_amount, 2)
+    vat_amount = round(total_amount * vat_rate, 2)
+    totals = {
+        "total_amount": total_amount,
+        "vat_amount": vat_amount,
+        "total_amount_with_vat": round(total_amount + vat_amount, 2),
+    }
+    return rows, totals
 
 
 def create_invoice(db: Session, invoice_in: InvoiceCreate) -> Invoice:
     """
-    Create a new invoice in the database.
+    Create a new invoice with its items in a single transaction.
+    
+    The header is inserted first, then all line items with multi-row INSERTs,
+    and the stored items are read back with one query. The number of round
+    trips does not grow with the number of lines.
     
     Args:
         db: Database session
         invoice_in: Invoice data
         
     Returns:
-        The created invoice with ID
-    """
-    # Create invoice object with the main details from schema
-    invoice = Invoice(
-        customer_id=invoice_in.customer_id,
-        issue_date=invoice_in.issue_date,
-        due_date=invoice_in.due_date,
-        status=invoice_in.status,
-        amount_total=invoice_in.amount_total,
-        amount_due=invoice_in.amount_due,
-        notes=invoice_in.notes if hasattr(invoice_in, "notes") else None,
-        payment_terms=invoice_in.payment_terms if hasattr(invoice_in, "payment_terms") else None,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
-    
-    # Add to database
-    db.add(invoice)
-    db.commit()
-    db.refresh(invoice)
+        The created invoice with ID and items
+        
+    Raises:
+        SQLAlchemyError: If database operation fails
+    """
+    rows, totals = calculate_invoice_totals(invoice_in)
     
-    return invoice
+    try:
+        invoice = Invoice(
+            customer_id=invoice_in.customer_id,
+            invoice_issue_date=invoice_in.invoice_issue_date,
+            due_date=invoice_in.due_date,
+            status=invoice_in.status,
+            **totals
+        )
+        db.add(invoice)
+        db.flush()
+        
+        for row in rows:
+            row["invoice_id"] = invoice.id
+        for start in range(0, len(rows), INVOICE_ITEMS_CHUNK_SIZE):
+            db.execute(insert(InvoiceItem).values(rows[start:start + INVOICE_ITEMS_CHUNK_SIZE]))
+        
+        items = []
+        if rows:
+            items = db.execute(
+                select(InvoiceItem).where(InvoiceItem.invoice_id == invoice.id).order_by(InvoiceItem.id)
+            ).scalars().all()
+        set_committed_value(invoice, "items", items)
+        
+        db.commit()
+        return _attach_customer_names(db, [invoice])[0]
+        
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
 
 
-def get_invoice(db: Session, invoice_id: int) -> Optional[Invoice]:
+def get_invoice(db: Session, invoice_id: int, include_items: bool = True) -> Optional[Invoice]:
     """
     Get an invoice by ID.
     
     Args:
         db: Database session
         invoice_id: ID of the invoice to retrieve
+        include_items: Load the invoice items (one extra query)
         
     Returns:
         Invoice if found, None otherwise
     """
-    return db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    invoice = _invoice_query(db, include_items).filter(Invoice.id == invoice_id).first()
+    if invoice is not None:
+        _attach_customer_names(db, [invoice])
+    return invoice
+
+
+def get_invoice_version(db: Session, invoice_id: int) -> Optional[Tuple[int, int, Optional[str]]]:
+    """
+    Get the ETag values of an invoice without loading it.
+    
+    Args:
+        db: Database session
+        invoice_id: ID of the invoice
+        
+    Returns:
+        (id, version, customer_name), or None if the invoice does not exist
+    """
+    row = db.execute(
+        select(Invoice.id, Invoice.version, Invoice.customer_id).where(Invoice.id == invoice_id)
+    ).first()
+    return _with_customer_names(db, [row])[0] if row is not None else None
 
 
-def get_invoices(db: Session, skip: int = 0, limit: int = 100) -> List[Invoice]:
+def get_invoices(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    include_items: bool = False
+) -> List[Invoice]:
     """
     Get all invoices with pagination.
     
+    When ``after`` is given, keyset pagination is used and ``skip`` is ignored.
+    With include_items, the items of the whole page are loaded with one
+    additional query, so a page costs two queries regardless of its size.
+    Customer names are resolved through the customer cache, adding at most
+    one more query for the customers not cached yet.
+    
     Args:
         db: Database session
         skip: Number of records to skip
         limit: Maximum number of records to return
+        after: Cursor returned with the previous page
+        order_by: Sort key from INVOICE_SORT_KEYS, '-' prefix for descending
+        include_items: Load the invoice items
         
     Returns:
         List of invoices
     """
-    return db.query(Invoice).offset(skip).limit(limit).all()
+    query = paginate(
+        _invoice_query(db, include_items), INVOICE_SORT_KEYS, Invoice.id,
+        skip=skip, limit=limit, after=after, order_by=order_by
+    )
+    return _attach_customer_names(db, query.all())
+
+
+def get_invoice_page_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id"
+) -> List[Tuple[int, int, Optional[str]]]:
+    """
+    Get the ETag values of an invoice page without loading the invoices.
+    
+    Runs the page query selecting only IDs, versions and customer IDs;
+    customer names come from the customer cache.
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        after: Cursor returned with the previous page
+        order_by: Sort key from INVOICE_SORT_KEYS, '-' prefix for descending
+        
+    Returns:
+        (id, version, customer_name) per invoice, in page order
+    """
+    query = paginate(
+        db.query(Invoice.id, Invoice.version, Invoice.customer_id), INVOICE_SORT_KEYS, Invoice.id,
+        skip=skip, limit=limit, after=after, order_by=order_by
+    )
+    return _with_customer_names(db, query.all())
+
+
+def get_invoices_next_cursor(invoices: List[Invoice], limit: int, order_by: str = "id") -> Optional[str]:
+    """
+    Compute the cursor for the page following ``invoices``.
+    
+    Args:
+        invoices: Invoices of the current page
+        limit: Page size the invoices were fetched with
+        order_by: Sort key of the page
+        
+    Returns:
+        Cursor for the next page, or None on the last page
+    """
+    return next_cursor(invoices, limit, INVOICE_SORT_KEYS, order_by)
 
 
-def get_customer_invoices(db: Session, customer_id: int) -> List[Invoice]:
+def get_customer_invoices(db: Session, customer_id: int, include_items: bool = False) -> List[Invoice]:
     """
     Get all invoices for a specific customer.
     
     Args:
         db: Database session
         customer_id: ID of the customer
+        include_items: Load the invoice items (one extra query for all invoices)
         
     Returns:
         List of invoices for the customer
     """
-    return db.query(Invoice).filter(Invoice.customer_id == customer_id).all()
+    invoices = _invoice_query(db, include_items).filter(Invoice.customer_id == customer_id).all()
+    return _attach_customer_names(db, invoices)
 
 
 def update_invoice(db: Session, invoice_id: int, invoice_in: InvoiceUpdate) -> Optional[Invoice]:
     """
-    Update an existing invoice.
+    Update an existing invoice header.
     
     Args:
         db: Database session
@@ -94,14 +314,20 @@ def update_invoice(db: Session, invoice_id: int, invoice_in: InvoiceUpdate) -> O
     Returns:
         Updated invoice if found, None otherwise
     """
-    invoice = get_invoice(db, invoice_id)
+    invoice = get_invoice(db, invoice_id, include_items=False)
     if invoice:
-        update_data = invoice_in.dict(exclude_unset=True)
+        update_data = invoice_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
-            setattr(invoice, field, value)
+            if value is not None:
+                setattr(invoice, field, value)
+        if db.is_modified(invoice):
+            invoice.version = Invoice.version + 1
         
-        invoice.updated_at = datetime.utcnow()
-        db.commit()
+        try:
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise e
         db.refresh(invoice)
         
     return invoice
@@ -120,7 +346,117 @@ def delete_invoice(db: Session, invoice_id: int) -> bool:
     """
     invoice = get_invoice(db, invoice_id)
     if invoice:
-        db.delete(invoice)
-        db.commit()
+        try:
+            db.delete(invoice)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise e
         return True
     return False
+
+
+async def create_invoice_async(db: AsyncSession, invoice_in: InvoiceCreate) -> Invoice:
+    """
+    Create a new invoice with its items using an async database session.
+    
+    Args:
+        db: Async database session
+        invoice_in: Invoice data
+        
+    Returns:
+        The created invoice with ID and items
+    """
+    return await db.run_sync(create_invoice, invoice_in)
+
+
+async def get_invoice_async(db: AsyncSession, invoice_id: int, include_items: bool = True) -> Optional[Invoice]:
+    """
+    Get an invoice by ID using an async database session.
+    
+    Args:
+        db: Async database session
+        invoice_id: ID of the invoice to retrieve
+        include_items: Load the invoice items (one extra query)
+        
+    Returns:
+        Invoice if found, None otherwise
+    """
+    return await db.run_sync(get_invoice, invoice_id, include_items)
+
+
+async def get_invoice_version_async(db: AsyncSession, invoice_id: int) -> Optional[Tuple[int, int, Optional[str]]]:
+    """
+    Get the ETag values of an invoice using an async database session.
+    
+    Args:
+        db: Async database session
+        invoice_id: ID of the invoice
+        
+    Returns:
+        (id, version, customer_name), or None if the invoice does not exist
+    """
+    return await db.run_sync(get_invoice_version, invoice_id)
+
+
+async def get_invoice_page_versions_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id"
+) -> List[Tuple[int, int, Optional[str]]]:
+    """
+    Get the ETag values of an invoice page using an async database session.
+    
+    Args:
+        db: Async database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        after: Cursor returned with the previous page
+        order_by: Sort key, '-' prefix for descending
+        
+    Returns:
+        (id, version, customer_name) per invoice, in page order
+    """
+    return await db.run_sync(get_invoice_page_versions, skip, limit, after, order_by)
+
+
+async def get_invoices_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id",
+    include_items: bool = False
+) -> List[Invoice]:
+    """
+    Get all invoices with pagination using an async database session.
+    
+    Args:
+        db: Async database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        after: Cursor returned with the previous page
+        order_by: Sort key, '-' prefix for descending
+        include_items: Load the invoice items
+        
+    Returns:
+        List of invoices
+    """
+    return await db.run_sync(get_invoices, skip, limit, after, order_by, include_items)
+
+
+async def get_customer_invoices_async(db: AsyncSession, customer_id: int, include_items: bool = False) -> List[Invoice]:
+    """
+    Get all invoices for a specific customer using an async database session.
+    
+    Args:
+        db: Async database session
+        customer_id: ID of the customer
+        include_items: Load the invoice items
+        
+    Returns:
+        List of invoices for the customer
+    """
+    return await db.run_sync(get_customer_invoices, customer_id, include_items)
@@ -0,0 +1,294 @@
+"""
+Background job CRUD operations for the job runner.
+
+The jobs table is the queue. A job is submitted as 'pending'; a worker
+process claims it with a conditional UPDATE, so when several processes poll
+the same table each job is started by exactly one of them. Running jobs carry
+a heartbeat, and jobs whose worker stopped reporting are put back in the
+queue by whichever worker notices first.
+
+Each operation also has an ``*_async`` variant taking an AsyncSession that
+runs the sync implementation through ``AsyncSession.run_sync``.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Row, bindparam, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from database import utc_now
+from models.job_model import Job
+
+
+def create_job(db: Session, job_type: str, params: Dict[str, Any]) -> Job:
+    """
+    Queue a new job.
+    
+    Args:
+        db (Session): Database session
+        job_type (str): Registered job type
+        params (Dict[str, Any]): Validated job parameters
+    
+    Returns:
+        Job: The queued job
+    """
+    db_job = Job(id=uuid.uuid4().hex, job_type=job_type, status="pending", params=params, progress=0.0, attempts=0)
+    try:
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        return db_job
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def get_job(db: Session, job_id: str) -> Optional[Job]:
+    """
+    Retrieve a job by its ID.
+    
+    Args:
+        db (Session): Database session
+        job_id (str): ID of the job
+    
+    Returns:
+        Optional[Job]: The job if found, None otherwise
+    """
+    return db.get(Job, job_id)
+
+
+def get_pending_jobs(db: Session, job_type: str, limit: int) -> List[Row]:
+    """
+    List the oldest pending jobs of a type.
+    
+    Args:
+        db (Session): Database session
+        job_type (str): Job type
+        limit (int): Maximum number of jobs returned
+    
+    Returns:
+        List[Row]: (id, job_type, params, result, created_at) rows, oldest
+        first; result is the checkpoint of an interrupted run, if any
+    """
+    if limit <= 0:
+        return []
+    return db.execute(
+        select(Job.id, Job.job_type, Job.params, Job.result, Job.created_at)
+        .where(Job.status == "pending", Job.job_type == job_type)
+        .order_by(Job.created_at, Job.id)
+        .limit(limit)
+    ).all()
+
+
+def claim_job(db: Session, job_id: str, worker_id: str) -> bool:
+    """
+    Mark a pending job as running on a worker.
+    
+    Args:
+        db (Session): Database session
+        job_id (str): ID of the job
+        worker_id (str): ID of the claiming worker process
+    
+    Returns:
+        bool: True if the job was claimed, False if another worker got it first
+    """
+    now = utc_now()
+    try:
+        result = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "pending")
+            .values(
+                status="running",
+                worker_id=worker_id,
+                attempts=Job.attempts + 1,
+                progress=0.0,
+                started_at=now,
+                heartbeat_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def record_job_heartbeats(db: Session, worker_id: str, progress: Dict[str, float]) -> None:
+    """
+    Record the progress of a worker's running jobs and refresh their heartbeat.
+    
+    Jobs that are no longer running on this worker (e.g. requeued after a
+    missed heartbeat) are left alone.
+    
+    Args:
+        db (Session): Database session
+        worker_id (str): ID of the worker process
+        progress (Dict[str, float]): Progress keyed by job ID
+    """
+    if not progress:
+        return
+    table = Job.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"), table.c.worker_id == worker_id, table.c.status == "running")
+        .values(progress=bindparam("b_progress"), heartbeat_at=utc_now())
+    )
+    try:
+        db.execute(statement, [{"b_id": job_id, "b_progress": value} for job_id, value in progress.items()])
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def record_job_checkpoint(
+    db: Session,
+    job_id: str,
+    worker_id: str,
+    progress: float,
+    state: Dict[str, Any]
+) -> bool:
+    """
+    Save the progress and resumable state of a running job, without committing.
+    
+    The state is stored in the result column until the job finishes, so it is
+    visible while the job runs and a rerun after an interruption resumes from
+    it. The caller commits it in the same transaction as the work it
+    describes, so the two cannot disagree after a crash.
+    
+    Args:
+        db (Session): Database session
+        job_id (str): ID of the job
+        worker_id (str): ID of the worker running it
+        progress (float): Fraction of the work done
+        state (Dict[str, Any]): JSON-serialisable state of the job
+    
+    Returns:
+        bool: False if the job was no longer running on this worker
+    """
+    updated = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+        .values(progress=progress, result=state, heartbeat_at=utc_now())
+        .execution_options(synchronize_session=False)
+    )
+    return updated.rowcount == 1
+
+
+def finish_job(
+    db: Session,
+    job_id: str,
+    worker_id: str,
+    status: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None
+) -> bool:
+    """
+    Record the outcome of a running job.
+    
+    Args:
+        db (Session): Database session
+        job_id (str): ID of the job
+        worker_id (str): ID of the worker that ran it
+        status (str): 'completed', 'failed', or 'pending' to put it back in the queue
+        result (Optional[Dict[str, Any]], optional): What the job produced; ignored
+            for 'pending', which keeps the last checkpoint. Defaults to None.
+        error (Optional[str], optional): Why the job failed. Defaults to None.
+    
+    Returns:
+        bool: False if the job was no longer running on this worker
+    """
+    values: Dict[str, Any] = {"status": status, "error": error}
+    if status == "pending":
+        # Keep the checkpoint, so the next run resumes from it
+        values["worker_id"] = None
+    else:
+        values["result"] = result
+        values["finished_at"] = utc_now()
+        if status == "completed":
+            values["progress"] = 1.0
+    try:
+        updated = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return updated.rowcount == 1
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+def requeue_stale_jobs(db: Session, stale_before: datetime, max_attempts: int) -> Tuple[int, int]:
+    """
+    Recover running jobs whose worker stopped sending heartbeats.
+    
+    Jobs that have been started fewer than ``max_attempts`` times go back to
+    the queue; the others are failed, so a job that keeps killing its worker
+    does not take down every worker in turn.
+    
+    Args:
+        db (Session): Database session
+        stale_before (datetime): Heartbeats older than this are stale
+        max_attempts (int): Starts allowed per job
+    
+    Returns:
+        Tuple[int, int]: Number of jobs requeued and failed
+    """
+    stale = (Job.status == "running", Job.heartbeat_at < stale_before)
+    try:
+        requeued = db.execute(
+            update(Job)
+            .where(*stale, Job.attempts < max_attempts)
+            .values(status="pending", worker_id=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        failed = db.execute(
+            update(Job)
+            .where(*stale, Job.attempts >= max_attempts)
+            .values(
+                status="failed",
+                error=f"Worker stopped responding after {max_attempts} attempts",
+                finished_at=utc_now()
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return requeued, failed
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+
+async def create_job_async(db: AsyncSession, job_type: str, params: Dict[str, Any]) -> Job:
+    """
+    Queue a new job using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        job_type (str): Registered job type
+        params (Dict[str, Any]): Validated job parameters
+    
+    Returns:
+        Job: The queued job
+    """
+    return await db.run_sync(create_job, job_type, params)
+
+
+async def get_job_async(db: AsyncSession, job_id: str) -> Optional[Job]:
+    """
+    Retrieve a job by its ID using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        job_id (str): ID of the job
+    
+    Returns:
+        Optional[Job]: The job if found, None otherwise
+    """
+    return await db.run_sync(get_job, job_id)
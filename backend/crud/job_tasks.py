@@ -0,0 +1,125 @@
+"""
+Built-in background job types.
+
+- ``zatca_issue`` issues the ZATCA documents of any number of invoices,
+  in chunks, with no request-sized limit on the batch.
+- ``inventory_export`` writes the full inventory to an NDJSON or CSV file
+  that is downloaded from ``GET /jobs/{job_id}/output``.
+- ``inventory_import`` imports a CSV file uploaded to
+  ``POST /inventory/import``; it is not submitted through ``POST /jobs``.
+
+All are safe to run again after an interruption: issued ZATCA documents are
+returned as stored, the export file is rewritten from the start and an
+import resumes after its last checkpointed chunk.
+"""
+
+import os
+from typing import Any, Dict, List
+from sqlalchemy.exc import IntegrityError
+from database import async_session_scope, session_scope
+from jobs import JobContext, job_output_path, job_type
+from schemas.job_schema import InventoryExportJobParams, InventoryImportJobParams
+from schemas.zatca_schema import ZatcaIssueRequest
+from crud.inventory_crud import INVENTORY_EXPORT_FIELDS, encode_inventory_rows, stream_inventory_rows
+from crud.inventory_import import IMPORT_JOB_TYPE, run_inventory_import
+from crud.inventory_summary_crud import get_inventory_summary
+from crud.zatca_crud import issue_zatca_documents_async
+
+
+# Invoices issued per chunk of a zatca_issue job
+ZATCA_JOB_CHUNK_SIZE = 100
+
+# Tries per chunk when another process takes the same counter values
+ZATCA_JOB_CHUNK_ATTEMPTS = 3
+
+# Media types of the export formats
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+# One at a time per process: concurrent issuers compete for the same counter values
+@job_type("zatca_issue", ZatcaIssueRequest, concurrency=1)
+async def issue_zatca_documents_job(context: JobContext) -> Dict[str, Any]:
+    """
+    Issue the ZATCA documents of the invoices in ``invoice_ids``.
+    
+    Each chunk is issued and committed on its own, in issue-date order within
+    the chunk, so progress survives an interruption.
+    
+    Args:
+        context (JobContext): The running job
+    
+    Returns:
+        Dict[str, Any]: Number of documents and the requested IDs with no invoice
+    """
+    invoice_ids = list(dict.fromkeys(context.params["invoice_ids"]))
+    documents = 0
+    missing: List[int] = []
+    
+    for start in range(0, len(invoice_ids), ZATCA_JOB_CHUNK_SIZE):
+        chunk = invoice_ids[start:start + ZATCA_JOB_CHUNK_SIZE]
+        for attempt in range(1, ZATCA_JOB_CHUNK_ATTEMPTS + 1):
+            try:
+                async with async_session_scope() as db:
+                    issued, chunk_missing = await issue_zatca_documents_async(db, chunk)
+                break
+            except IntegrityError:
+                # Another process issued documents at the same time; the
+                # retry continues the chain after them
+                if attempt == ZATCA_JOB_CHUNK_ATTEMPTS:
+                    raise
+        documents += len(issued)
+        missing += chunk_missing
+        context.report(start + len(chunk), len(invoice_ids))
+    
+    return {"documents": documents, "missing": missing}
+
+
+@job_type("inventory_export", InventoryExportJobParams, concurrency=2)
+def export_inventory_job(context: JobContext) -> Dict[str, Any]:
+    """
+    Export the full inventory to a file under JOB_OUTPUT_DIR.
+    
+    Rows are streamed from a server-side cursor and written batch by batch;
+    progress is measured against the item count in the inventory summary.
+    
+    Args:
+        context (JobContext): The running job
+    
+    Returns:
+        Dict[str, Any]: Output file name, media type, format, rows and size
+    """
+    export_format = context.params["format"]
+    path = job_output_path(context.job_id, export_format)
+    rows = 0
+    
+    with session_scope() as db, open(path, "w", encoding="utf-8", newline="") as output:
+        total = sum(group["item_count"] for group in get_inventory_summary(db))
+        if export_format == "csv":
+            output.write(encode_inventory_rows([tuple(INVENTORY_EXPORT_FIELDS)], export_format))
+        for batch in stream_inventory_rows(db, batch_size=context.params["batch_size"]):
+            output.write(encode_inventory_rows(batch, export_format))
+            rows += len(batch)
+            context.report(rows, total)
+    
+    return {
+        "file": os.path.basename(path),
+        "media_type": EXPORT_MEDIA_TYPES[export_format],
+        "format": export_format,
+        "rows": rows,
+        "bytes": os.path.getsize(path),
+    }
+
+
+# One at a time per process: concurrent imports lock the same summary rows
+@job_type(IMPORT_JOB_TYPE, InventoryImportJobParams, concurrency=1, submittable=False)
+def import_inventory_job(context: JobContext) -> Dict[str, Any]:
+    """
+    Import the CSV file uploaded to ``POST /inventory/import``.
+    
+    Args:
+        context (JobContext): The running job
+    
+    Returns:
+        Dict[str, Any]: Bytes read, row counters and row errors keyed by CSV line number
+    """
+    return run_inventory_import(context)
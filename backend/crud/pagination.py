@@ -0,0 +1,192 @@
+"""
+Keyset (cursor) pagination helpers shared by the CRUD modules.
+
+Cursors are opaque, URL-safe tokens encoding the sort key and the values of
+the last row of a page. The next page is fetched with a ``WHERE (sort, id) >
+(last_sort, last_id)`` condition instead of OFFSET, so every page costs the
+same index range scan no matter how deep it is.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+from schemas.limits import MAX_PAGE_SIZE
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token is malformed or was issued for another sort key."""
+
+
+def parse_order_by(order_by: str, sort_keys: Dict[str, Any]) -> Tuple[str, Any, bool]:
+    """
+    Resolve an ``order_by`` value such as ``"quantity"`` or ``"-quantity"``.
+
+    Args:
+        order_by (str): Sort key, optionally prefixed with '-' for descending order
+        sort_keys (Dict[str, Any]): Allowed sort keys mapped to model columns
+
+    Returns:
+        Tuple[str, Any, bool]: Sort key name, model column and descending flag
+
+    Raises:
+        ValueError: If the sort key is not supported
+    """
+    descending = order_by.startswith("-")
+    key = order_by[1:] if descending else order_by
+    if key not in sort_keys:
+        raise ValueError(f"Unsupported order_by '{key}'. Supported: {', '.join(sorted(sort_keys))}")
+    return key, sort_keys[key], descending
+
+
+def encode_cursor(order_by: str, values: List[Any]) -> str:
+    """
+    Build an opaque cursor token.
+
+    Args:
+        order_by (str): The order_by value the page was fetched with
+        values (List[Any]): Sort values of the last row, ending with its id
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps({"o": order_by, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> List[Any]:
+    """
+    Decode a cursor token produced by :func:`encode_cursor`.
+
+    Args:
+        cursor (str): Cursor token
+        order_by (str): The order_by value of the current request
+
+    Returns:
+        List[Any]: Sort values of the last row, ending with its id
+
+    Raises:
+        InvalidCursorError: If the token is malformed or does not match order_by
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["v"]
+        cursor_order_by = payload["o"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+
+    if cursor_order_by != order_by:
+        raise InvalidCursorError("Pagination cursor was issued for a different order_by")
+    if not isinstance(values, list) or not values:
+        raise InvalidCursorError("Malformed pagination cursor")
+    return values
+
+
+def keyset_condition(
+    sort_column: Any,
+    id_column: Any,
+    values: List[Any],
+    descending: bool = False
+) -> ColumnElement:
+    """
+    Build the WHERE condition selecting rows after the cursor position.
+
+    Args:
+        sort_column (Any): Column the page is sorted by (may be the id column)
+        id_column (Any): Primary key column used as tie-breaker
+        values (List[Any]): Decoded cursor values
+        descending (bool, optional): Whether the sort is descending. Defaults to False.
+
+    Returns:
+        ColumnElement: SQL condition for the next page
+    """
+    if sort_column is id_column:
+        last_id = values[-1]
+        return id_column < last_id if descending else id_column > last_id
+
+    last_value, last_id = values[0], values[-1]
+    if isinstance(last_value, str) and sort_column.type.python_type is datetime:
+        try:
+            last_value = datetime.fromisoformat(last_value)
+        except ValueError as e:
+            raise InvalidCursorError("Malformed pagination cursor") from e
+    if descending:
+        return or_(sort_column < last_value, and_(sort_column == last_value, id_column < last_id))
+    return or_(sort_column > last_value, and_(sort_column == last_value, id_column > last_id))
+
+
+def paginate(
+    query: Any,
+    sort_keys: Dict[str, Any],
+    id_column: Any,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    order_by: str = "id"
+) -> Any:
+    """
+    Apply ordering and either keyset or offset pagination to a query.
+
+    When ``after`` is given, ``skip`` is ignored and the page starts right
+    after the cursor position. Otherwise the legacy OFFSET path is used.
+
+    Args:
+        query (Any): SQLAlchemy query to paginate
+        sort_keys (Dict[str, Any]): Allowed sort keys mapped to model columns
+        id_column (Any): Primary key column used as tie-breaker
+        skip (int, optional): Number of records to skip. Defaults to 0.
+        limit (int, optional): Maximum number of records to return. Defaults to 100.
+        after (Optional[str], optional): Cursor from a previous page. Defaults to None.
+        order_by (str, optional): Sort key, '-' prefix for descending. Defaults to "id".
+
+    Returns:
+        Any: The paginated query
+
+    Raises:
+        ValueError: If limit is out of range, order_by is unsupported or the cursor is invalid
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    _, sort_column, descending = parse_order_by(order_by, sort_keys)
+
+    if sort_column is id_column:
+        ordering = [id_column.desc() if descending else id_column.asc()]
+    else:
+        ordering = [
+            sort_column.desc() if descending else sort_column.asc(),
+            id_column.desc() if descending else id_column.asc(),
+        ]
+
+    if after:
+        values = decode_cursor(after, order_by)
+        query = query.filter(keyset_condition(sort_column, id_column, values, descending))
+    query = query.order_by(*ordering)
+    if skip and not after:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor(rows: List[Any], limit: int, sort_keys: Dict[str, Any], order_by: str = "id") -> Optional[str]:
+    """
+    Compute the cursor for the page following ``rows``.
+
+    Args:
+        rows (List[Any]): Rows of the current page
+        limit (int): Page size the rows were fetched with
+        sort_keys (Dict[str, Any]): Allowed sort keys mapped to model columns
+        order_by (str, optional): Sort key of the page. Defaults to "id".
+
+    Returns:
+        Optional[str]: Cursor token, or None when this was the last page
+    """
+    if not rows or len(rows) < limit:
+        return None
+
+    key, _, _ = parse_order_by(order_by, sort_keys)
+    last = rows[-1]
+    values = [last.id] if key == "id" else [getattr(last, key), last.id]
+    return encode_cursor(order_by, values)
@@ -0,0 +1,245 @@
+"""
+ZATCA document issuing for the ZATCA E-Invoicing module.
+
+Issuing gives each invoice the next invoice counter value (ICV) and links it
+to the hash of the last issued document. The documents are rendered on the
+ZATCA render pool (see ``zatca``) and stored. An issued document is never
+rendered again: later requests return the stored one, so the chain stays
+intact even if the invoice or its customer changes afterwards.
+
+No transaction is held open while documents render: the reads end before
+rendering starts and the documents are stored from a fresh session.
+"""
+
+import uuid
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from database import async_session_scope
+from models.customer_model import Customer
+from models.invoice_model import Invoice
+from models.zatca_model import ZatcaDocument
+from crud.customer_crud import get_customers_by_ids
+from crud.invoice_crud import VAT_RATE, _invoice_query
+from zatca import INITIAL_PREVIOUS_HASH, GeneratedDocument, generate_documents_async, seller_from_env
+
+
+class ZatcaIssuePlan(NamedTuple):
+    """
+    What an issue request has to do, as read from the database.
+    
+    Attributes:
+        issued (Dict[int, ZatcaDocument]): Documents already issued, keyed by invoice ID
+        payloads (List[Dict[str, Any]]): Invoices to render, in chain order
+        previous_hash (str): Hash of the last issued document
+        missing (List[int]): Requested IDs with no invoice
+    """
+    issued: Dict[int, ZatcaDocument]
+    payloads: List[Dict[str, Any]]
+    previous_hash: str
+    missing: List[int]
+
+
+def get_zatca_documents(db: Session, invoice_ids: Iterable[int]) -> Dict[int, ZatcaDocument]:
+    """
+    Get the issued documents of many invoices.
+    
+    Args:
+        db (Session): Database session
+        invoice_ids (Iterable[int]): IDs of the invoices
+    
+    Returns:
+        Dict[int, ZatcaDocument]: Issued documents keyed by invoice ID; invoices without one are absent
+    """
+    invoice_ids = list(invoice_ids)
+    if not invoice_ids:
+        return {}
+    documents = db.execute(
+        select(ZatcaDocument).where(ZatcaDocument.invoice_id.in_(invoice_ids))
+    ).scalars().all()
+    return {document.invoice_id: document for document in documents}
+
+
+def get_chain_head(db: Session) -> Tuple[int, str]:
+    """
+    Get the counter value and hash of the last issued document.
+    
+    Args:
+        db (Session): Database session
+    
+    Returns:
+        Tuple[int, str]: (counter, invoice_hash); (0, INITIAL_PREVIOUS_HASH) before the first document
+    """
+    row = db.execute(
+        select(ZatcaDocument.counter, ZatcaDocument.invoice_hash).order_by(ZatcaDocument.counter.desc()).limit(1)
+    ).first()
+    if row is None:
+        return 0, INITIAL_PREVIOUS_HASH
+    return row.counter, row.invoice_hash
+
+
+def zatca_payload(
+    invoice: Invoice,
+    customer: Optional[Customer],
+    seller: Dict[str, str],
+    counter: int,
+    document_uuid: str
+) -> Dict[str, Any]:
+    """
+    Convert an invoice with its items into the plain data the renderer takes.
+    
+    Args:
+        invoice (Invoice): Invoice with its items loaded
+        customer (Optional[Customer]): The invoice's customer
+        seller (Dict[str, str]): Seller details (see zatca.seller_from_env)
+        counter (int): Invoice counter value assigned to the document
+        document_uuid (str): UUID assigned to the document
+    
+    Returns:
+        Dict[str, Any]: Payload for zatca.render_invoice
+    """
+    return {
+        "invoice_id": invoice.id,
+        "number": f"INV-{invoice.id}",
+        "uuid": document_uuid,
+        "counter": counter,
+        "issue_date": invoice.invoice_issue_date.date().isoformat(),
+        "issue_time": invoice.invoice_issue_date.strftime("%H:%M:%S"),
+        "due_date": invoice.due_date.date().isoformat(),
+        "vat_rate": VAT_RATE,
+        "total_amount": invoice.total_amount,
+        "vat_amount": invoice.vat_amount,
+        "total_amount_with_vat": invoice.total_amount_with_vat,
+        "seller": seller,
+        "buyer": {
+            "name": customer.name if customer is not None else None,
+            "vat_number": customer.vat_number if customer is not None else None,
+            "address": customer.address if customer is not None else None,
+        },
+        "lines": [(item.item_name, item.quantity, item.unit_price, item.line_total) for item in invoice.items],
+    }
+
+
+def prepare_zatca_issue(db: Session, invoice_ids: List[int]) -> ZatcaIssuePlan:
+    """
+    Work out which invoices need a document and build their payloads.
+    
+    New documents are numbered after the last issued one, in order of issue
+    date and ID. The reads cost at most five queries for any batch size:
+    issued documents, invoices, their items, uncached customers and the
+    chain head.
+    
+    Args:
+        db (Session): Database session
+        invoice_ids (List[int]): IDs of the invoices to issue documents for
+    
+    Returns:
+        ZatcaIssuePlan: The issue plan
+    
+    Raises:
+        RuntimeError: If the seller is not configured
+    """
+    requested = list(dict.fromkeys(invoice_ids))
+    issued = get_zatca_documents(db, requested)
+    pending = [invoice_id for invoice_id in requested if invoice_id not in issued]
+    
+    payloads: List[Dict[str, Any]] = []
+    previous_hash = INITIAL_PREVIOUS_HASH
+    if pending:
+        invoices = (
+            _invoice_query(db, include_items=True)
+            .filter(Invoice.id.in_(pending))
+            .order_by(Invoice.invoice_issue_date, Invoice.id)
+            .all()
+        )
+        if invoices:
+            seller = seller_from_env()
+            customers = get_customers_by_ids(db, {invoice.customer_id for invoice in invoices})
+            counter, previous_hash = get_chain_head(db)
+            payloads = [
+                zatca_payload(invoice, customers.get(invoice.customer_id), seller, counter + offset, str(uuid.uuid4()))
+                for offset, invoice in enumerate(invoices, start=1)
+            ]
+    
+    found = set(issued) | {payload["invoice_id"] for payload in payloads}
+    missing = [invoice_id for invoice_id in requested if invoice_id not in found]
+    return ZatcaIssuePlan(issued, payloads, previous_hash, missing)
+
+
+def store_zatca_documents(db: Session, documents: List[GeneratedDocument]) -> List[ZatcaDocument]:
+    """
+    Store newly issued documents in one transaction.
+    
+    Args:
+        db (Session): Database session
+        documents (List[GeneratedDocument]): Generated documents, in chain order
+    
+    Returns:
+        List[ZatcaDocument]: The stored documents
+    
+    Raises:
+        IntegrityError: If another request issued one of the invoices or
+            took one of the counter values in the meantime
+    """
+    if not documents:
+        return []
+    rows = [ZatcaDocument(**document._asdict()) for document in documents]
+    try:
+        db.add_all(rows)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+    return rows
+
+
+async def get_zatca_document_async(db: AsyncSession, invoice_id: int) -> Optional[ZatcaDocument]:
+    """
+    Get the issued document of an invoice using an async database session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        invoice_id (int): ID of the invoice
+    
+    Returns:
+        Optional[ZatcaDocument]: The document if issued, None otherwise
+    """
+    documents = await db.run_sync(get_zatca_documents, [invoice_id])
+    return documents.get(invoice_id)
+
+
+async def issue_zatca_documents_async(db: AsyncSession, invoice_ids: Iterable[int]) -> Tuple[List[ZatcaDocument], List[int]]:
+    """
+    Issue the ZATCA documents of many invoices using an async database session.
+    
+    Invoices that already have a document get the stored one. The others are
+    rendered in parallel on the render pool, off the event loop, and stored.
+    The read transaction on ``db`` is committed before rendering, so its
+    connection goes back to the pool, and the new documents are stored from
+    a fresh session.
+    
+    Args:
+        db (AsyncSession): Async database session
+        invoice_ids (Iterable[int]): IDs of the invoices
+    
+    Returns:
+        Tuple[List[ZatcaDocument], List[int]]: The documents in chain order,
+        and the requested IDs with no invoice
+    
+    Raises:
+        IntegrityError: If another request issued one of the invoices or
+            took one of the counter values in the meantime
+    """
+    plan = await db.run_sync(prepare_zatca_issue, list(invoice_ids))
+    await db.commit()
+    
+    stored: List[ZatcaDocument] = []
+    if plan.payloads:
+        generated = await generate_documents_async(plan.payloads, plan.previous_hash)
+        async with async_session_scope() as store_db:
+            stored = await store_db.run_sync(store_zatca_documents, generated)
+    documents = sorted([*plan.issued.values(), *stored], key=lambda document: document.counter)
+    return documents, plan.missing
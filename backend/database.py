@@ -3,16 +3,30 @@ Database connection module for MySQL 8.0 on Google Cloud SQL.
 
 This module provides SQLAlchemy engine and session management for connecting
 to a MySQL database instance hosted on Google Cloud SQL.
+
+Optional read replicas are configured with DB_REPLICA_HOSTS. Read-only
+request dependencies (``get_async_read_db``) send their queries to a replica
+chosen round-robin, skipping replicas that recently failed to connect, and
+switch to the primary for the rest of the session on the first write.
+Rows read from a replica are never put in the shared caches.
 """
 
 import os
+import re
 import logging
-from typing import Optional
-from sqlalchemy import create_engine, Engine
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from sqlalchemy import create_engine, event, text, Engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.sql.expression import UpdateBase
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.pool import QueuePool
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, enable_idle_ping, pool_settings, warm_up_pool
+from metrics import current_request_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +35,196 @@ logger = logging.getLogger(__name__)
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a request issues more statements than its route's query budget."""
+
+# Query diagnostics: statements slower than DB_SLOW_QUERY_MS are logged, and
+# requests exceeding their query budget are logged or rejected depending on
+# DB_QUERY_BUDGET_MODE ('log', 'raise' or 'off'). DB_QUERY_BUDGET sets a
+# default budget for routes that do not declare one with query_budget().
+SLOW_QUERY_SECONDS = float(os.getenv('DB_SLOW_QUERY_MS', '0')) / 1000
+QUERY_BUDGET_MODE = os.getenv('DB_QUERY_BUDGET_MODE', 'log').lower()
+if QUERY_BUDGET_MODE not in ('log', 'raise', 'off'):
+    raise ValueError(f"DB_QUERY_BUDGET_MODE must be 'log', 'raise' or 'off', not '{QUERY_BUDGET_MODE}'")
+DEFAULT_QUERY_BUDGET = int(os.getenv('DB_QUERY_BUDGET', '0')) or None
+
+_SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_VALUE_LISTS = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)")
+_SQL_REPEATED_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SQL_WHITESPACE = re.compile(r"\s+")
+
+def normalize_sql(statement: str) -> str:
+    """
+    Normalise a SQL statement for logging and grouping.
+    
+    Literals become ``?``, placeholder lists such as ``IN (%s, %s, %s)`` or
+    multi-row VALUES collapse to ``(...)`` and whitespace is collapsed, so
+    statements differing only in parameters normalise identically.
+    
+    Args:
+        statement (str): SQL statement
+        
+    Returns:
+        str: Normalised statement
+    """
+    statement = _SQL_LITERALS.sub("?", statement)
+    statement = _SQL_VALUE_LISTS.sub("(...)", statement)
+    statement = _SQL_REPEATED_LISTS.sub("(...)", statement)
+    return _SQL_WHITESPACE.sub(" ", statement).strip()
+
+def query_budget(max_queries: int):
+    """
+    Build a route dependency declaring the route's statement budget.
+    
+    Usage: ``@router.get("/", dependencies=[Depends(query_budget(2))])``.
+    
+    Args:
+        max_queries (int): Statements the route may issue per request
+        
+    Returns:
+        Callable: FastAPI dependency
+    """
+    def declare_query_budget() -> None:
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+    return declare_query_budget
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_diagnostics_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["diagnostics_started"] = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _check_query_diagnostics(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("diagnostics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = current_request_stats.get()
+    
+    if SLOW_QUERY_SECONDS and elapsed >= SLOW_QUERY_SECONDS:
+        route = stats.route if stats is not None else "(no request)"
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms) on {route}: {normalize_sql(statement)}")
+    
+    if stats is None or QUERY_BUDGET_MODE == 'off':
+        return
+    budget = stats.budget if stats.budget is not None else DEFAULT_QUERY_BUDGET
+    # stats.queries already includes this statement (metrics listener runs first)
+    if budget is not None and stats.queries == budget + 1:
+        message = (
+            f"Query budget exceeded on {stats.route}: statement {stats.queries} "
+            f"over a budget of {budget}: {normalize_sql(statement)}"
+        )
+        if QUERY_BUDGET_MODE == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+class ReplicaSet:
+    """
+    Round-robin selection over read replica engines with health-aware failover.
+    
+    A replica whose connection fails (refused connect or dropped connection)
+    is skipped for ``retry_after`` seconds; when no replica is healthy,
+    callers fall back to the primary.
+    
+    Attributes:
+        engines (List[AsyncEngine]): Replica engines
+        hosts (List[str]): Replica host:port labels, parallel to engines
+        retry_after (float): Seconds a failed replica is skipped
+    """
+    
+    def __init__(self, engines: List[AsyncEngine], hosts: List[str], retry_after: float = 30.0):
+        self.engines = engines
+        self.hosts = hosts
+        self.retry_after = retry_after
+        self._unhealthy_until: Dict[int, float] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        
+        for index, engine in enumerate(engines):
+            event.listen(engine.sync_engine, "handle_error", self._error_listener(index))
+    
+    def _error_listener(self, index: int):
+        """Build a handle_error listener marking replica ``index`` unhealthy on connection failures."""
+        def on_error(context) -> None:
+            # No connection means the failure happened while connecting
+            if context.is_disconnect or context.connection is None:
+                self.mark_unhealthy(index)
+        return on_error
+    
+    def mark_unhealthy(self, index: int) -> None:
+        """Skip replica ``index`` for retry_after seconds."""
+        with self._lock:
+            self._unhealthy_until[index] = time.monotonic() + self.retry_after
+        logger.warning(f"Read replica {self.hosts[index]} marked unhealthy for {self.retry_after:.0f}s")
+    
+    def choose(self) -> Optional[AsyncEngine]:
+        """
+        Pick the next healthy replica in round-robin order.
+        
+        Returns:
+            Optional[AsyncEngine]: A replica engine, or None if none is healthy
+        """
+        with self._lock:
+            now = time.monotonic()
+            for _ in range(len(self.engines)):
+                index = self._next
+                self._next = (self._next + 1) % len(self.engines)
+                if self._unhealthy_until.get(index, 0.0) <= now:
+                    return self.engines[index]
+        return None
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Health of every replica."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "host": host,
+                    "healthy": self._unhealthy_until.get(index, 0.0) <= now,
+                    "retry_in": max(0.0, self._unhealthy_until.get(index, 0.0) - now),
+                }
+                for index, host in enumerate(self.hosts)
+            ]
+
+class ReadReplicaSession(Session):
+    """
+    Session that reads from its replica while it is flagged read-only.
+    
+    ``info["read_only"]`` marks the session as read-only and
+    ``info["replica"]`` holds the replica engine it reads from. A flush or an
+    INSERT, UPDATE or DELETE clears the flag, so the write and every later
+    read in the same session go to the primary and see the write. Locking
+    reads (SELECT ... FOR UPDATE) belong in primary sessions.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if isinstance(clause, UpdateBase):
+            self.info["read_only"] = False
+        if reads_from_replica(self):
+            return self.info["replica"]
+        return super().get_bind(mapper, clause=clause, **kw)
+
+@event.listens_for(ReadReplicaSession, "before_flush")
+def _leave_replica_on_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    """Send a read-only session's flush and everything after it to the primary."""
+    session.info["read_only"] = False
+
+def reads_from_replica(db: Session) -> bool:
+    """
+    Whether a session's reads currently go to a read replica.
+    
+    Shared caches must not be filled from such reads: a lagging replica can
+    return a row older than a write that has already invalidated the cache.
+    
+    Args:
+        db (Session): Database session
+        
+    Returns:
+        bool: True for a read-only session bound to a replica
+    """
+    return bool(db.info.get("read_only")) and db.info.get("replica") is not None
+
 class DatabaseManager:
     """
     Database manager class for handling MySQL connections using SQLAlchemy.
@@ -29,11 +233,20 @@ class DatabaseManager:
     def __init__(self):
         self.engine: Optional[Engine] = None
         self.SessionLocal: Optional[sessionmaker] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.AsyncSessionLocal: Optional[async_sessionmaker] = None
+        self.AsyncReadSessionLocal: Optional[async_sessionmaker] = None
+        self.replicas: Optional[ReplicaSet] = None
         
-    def get_database_url(self) -> str:
+    def get_database_url(self, driver: str = "mysqlconnector", host: Optional[str] = None, port: Optional[str] = None) -> str:
         """
         Construct database URL from environment variables.
         
+        Args:
+            driver (str, optional): SQLAlchemy MySQL driver name. Defaults to "mysqlconnector".
+            host (Optional[str], optional): Host overriding DB_HOST, e.g. a replica. Defaults to None.
+            port (Optional[str], optional): Port overriding DB_PORT. Defaults to None.
+        
         Returns:
             str: Database URL for SQLAlchemy
             
@@ -43,16 +256,73 @@ class DatabaseManager:
         # Database configuration from environment variables
         db_user = os.getenv('DB_USER', 'your_username')
         db_password = os.getenv('DB_PASSWORD', 'your_password')
-        db_host = os.getenv('DB_HOST', 'your_cloud_sql_host')
-        db_port = os.getenv('DB_PORT', '3306')
+        db_host = host or os.getenv('DB_HOST', 'your_cloud_sql_host')
+        db_port = port or os.getenv('DB_PORT', '3306')
         db_name = os.getenv('DB_NAME', 'your_database_name')
         
-        # Construct the database URL for mysql-connector-python
-        database_url = f"mysql+mysqlconnector://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+        # Construct the database URL for the requested driver
+        database_url = f"mysql+{driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
         
         logger.info(f"Connecting to database at {db_host}:{db_port}/{db_name}")
         return database_url
     
+    def get_async_database_url(self) -> str:
+        """
+        Construct the database URL for the async engine.
+        
+        The async driver defaults to aiomysql and can be changed with the
+        DB_ASYNC_DRIVER environment variable (e.g. 'asyncmy').
+        
+        Returns:
+            str: Async database URL for SQLAlchemy
+        """
+        return self.get_database_url(driver=os.getenv('DB_ASYNC_DRIVER', 'aiomysql'))
+    
+    def get_replica_hosts(self) -> List[str]:
+        """
+        Read replica hosts from DB_REPLICA_HOSTS.
+        
+        The variable is a comma-separated list of ``host`` or ``host:port``
+        entries; replicas use the primary's credentials and database name.
+        
+        Returns:
+            List[str]: Replica host[:port] entries, empty when not configured
+        """
+        return [host.strip() for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+    
+    def _engine_options(self) -> Dict[str, Any]:
+        """
+        Engine options shared by the sync and async engines.
+        
+        Pool settings come from the DB_POOL_* environment variables (see
+        db_pool.pool_settings); the defaults match the previous hardcoded
+        values except that liveness pings only happen after an idle period.
+        
+        Returns:
+            Dict[str, Any]: Keyword arguments for engine creation
+        """
+        settings = pool_settings()
+        return {
+            'pool_size': settings['pool_size'],
+            'max_overflow': settings['max_overflow'],
+            'pool_timeout': settings['pool_timeout'],
+            'pool_recycle': settings['pool_recycle'],  # Recycle connections after this many seconds
+            'pool_use_lifo': settings['pool_use_lifo'],
+            'pool_pre_ping': settings['pre_ping'] == 'always',  # Validate connections on every checkout
+            'echo': settings['echo'],                  # Set DB_ECHO=true for SQL query logging
+            'connect_args': {
+                'charset': 'utf8mb4',
+                'use_unicode': True,
+                'autocommit': False,
+            },
+        }
+    
+    def _configure_pool(self, engine: Engine) -> None:
+        """Install the idle-threshold liveness ping when DB_POOL_PRE_PING=idle."""
+        settings = pool_settings()
+        if settings['pre_ping'] == 'idle':
+            enable_idle_ping(engine, settings['ping_idle_seconds'])
+    
     def create_engine(self) -> Engine:
         """
         Create SQLAlchemy engine with connection pooling.
@@ -65,21 +335,57 @@ class DatabaseManager:
         # Engine configuration for Google Cloud SQL
         engine = create_engine(
             database_url,
-            poolclass=QueuePool,
-            pool_size=10,
-            max_overflow=20,
-            pool_pre_ping=True,  # Validate connections before use
-            pool_recycle=3600,   # Recycle connections after 1 hour
-            echo=False,          # Set to True for SQL query logging
-            connect_args={
-                'charset': 'utf8mb4',
-                'use_unicode': True,
-                'autocommit': False,
-            }
+            poolclass=InstrumentedQueuePool,
+            **self._engine_options()
         )
+        self._configure_pool(engine)
         
         return engine
     
+    def _create_async_engine(self, database_url: str) -> AsyncEngine:
+        """Create an async engine with the instrumented pool and liveness ping."""
+        engine = create_async_engine(
+            database_url,
+            poolclass=InstrumentedAsyncQueuePool,
+            **self._engine_options()
+        )
+        self._configure_pool(engine.sync_engine)
+        return engine
+    
+    def create_async_engine(self) -> AsyncEngine:
+        """
+        Create SQLAlchemy async engine with connection pooling.
+        
+        The async engine uses its own pool (AsyncAdaptedQueuePool), so DB waits
+        are awaited on the event loop instead of blocking it.
+        
+        Returns:
+            AsyncEngine: SQLAlchemy async engine instance
+        """
+        database_url = self.get_async_database_url()
+        
+        return self._create_async_engine(database_url)
+    
+    def create_replica_set(self) -> Optional[ReplicaSet]:
+        """
+        Create async engines for the configured read replicas.
+        
+        Returns:
+            Optional[ReplicaSet]: The replicas, or None when DB_REPLICA_HOSTS is empty
+        """
+        hosts = self.get_replica_hosts()
+        if not hosts:
+            return None
+        
+        driver = os.getenv('DB_ASYNC_DRIVER', 'aiomysql')
+        engines = []
+        for entry in hosts:
+            host, _, port = entry.partition(':')
+            engines.append(self._create_async_engine(
+                self.get_database_url(driver=driver, host=host, port=port or None)
+            ))
+        return ReplicaSet(engines, hosts, retry_after=float(os.getenv('DB_REPLICA_RETRY_AFTER', '30')))
+    
     def initialize_database(self) -> None:
         """
         Initialize database connection and create session factory.
@@ -96,6 +402,29 @@ class DatabaseManager:
             logger.error(f"Failed to initialize database connection: {e}")
             raise
     
+    def initialize_async_database(self) -> None:
+        """
+        Initialize async database connection and create async session factory.
+        """
+        try:
+            self.async_engine = self.create_async_engine()
+            self.AsyncSessionLocal = async_sessionmaker(
+                bind=self.async_engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
+            self.replicas = self.create_replica_set()
+            self.AsyncReadSessionLocal = async_sessionmaker(
+                bind=self.async_engine,
+                sync_session_class=ReadReplicaSession,
+                autoflush=False,
+                expire_on_commit=False
+            )
+            logger.info("Async database connection initialized successfully")
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to initialize async database connection: {e}")
+            raise
+    
     def get_session(self) -> Session:
         """
         Get a database session.
@@ -111,6 +440,44 @@ class DatabaseManager:
         
         return self.SessionLocal()
     
+    def get_async_session(self) -> AsyncSession:
+        """
+        Get an async database session.
+        
+        Returns:
+            AsyncSession: SQLAlchemy async session instance
+            
+        Raises:
+            RuntimeError: If async database is not initialized
+        """
+        if not self.AsyncSessionLocal:
+            raise RuntimeError("Async database not initialized. Call initialize_async_database() first.")
+        
+        return self.AsyncSessionLocal()
+    
+    def get_async_read_session(self) -> AsyncSession:
+        """
+        Get an async session for read-only work, bound to a read replica.
+        
+        Each session sticks to one replica picked round-robin among the
+        healthy ones, and to the primary once it writes. Without healthy
+        replicas the session uses the primary.
+        
+        Returns:
+            AsyncSession: SQLAlchemy async session instance
+            
+        Raises:
+            RuntimeError: If async database is not initialized
+        """
+        if not self.AsyncReadSessionLocal:
+            raise RuntimeError("Async database not initialized. Call initialize_async_database() first.")
+        
+        session = self.AsyncReadSessionLocal()
+        replica = self.replicas.choose() if self.replicas else None
+        if replica is not None:
+            session.sync_session.info.update(read_only=True, replica=replica.sync_engine)
+        return session
+    
     def test_connection(self) -> bool:
         """
         Test database connection.
@@ -123,13 +490,45 @@ class DatabaseManager:
                 self.initialize_database()
             
             with self.engine.connect() as connection:
-                connection.execute("SELECT 1")
+                connection.execute(text("SELECT 1"))
                 logger.info("Database connection test successful")
                 return True
         except SQLAlchemyError as e:
             logger.error(f"Database connection test failed: {e}")
             return False
     
+    async def warm_up_async_pools(self, connections: int) -> Dict[str, int]:
+        """
+        Pre-open pooled connections on the async primary and read replicas.
+        
+        Called at startup so the first requests do not wait for connection
+        setup (TCP, TLS and authentication) to Cloud SQL. A replica that
+        cannot be reached is skipped.
+        
+        Args:
+            connections (int): Connections to open per engine, capped at the pool size
+            
+        Returns:
+            Dict[str, int]: Connections opened per host
+            
+        Raises:
+            RuntimeError: If async database is not initialized
+            SQLAlchemyError: If the primary cannot be reached
+        """
+        if not self.async_engine:
+            raise RuntimeError("Async database not initialized. Call initialize_async_database() first.")
+        
+        opened = {'primary': await warm_up_pool(self.async_engine, connections)}
+        if self.replicas:
+            for engine, host in zip(self.replicas.engines, self.replicas.hosts):
+                try:
+                    opened[host] = await warm_up_pool(engine, connections)
+                except SQLAlchemyError as e:
+                    # The replica's error listener has already marked it unhealthy
+                    logger.warning(f"Could not warm up read replica {host}: {e}")
+                    opened[host] = 0
+        return opened
+    
     def close_connection(self) -> None:
         """
         Close database connection and dispose of engine.
@@ -137,6 +536,18 @@ class DatabaseManager:
         if self.engine:
             self.engine.dispose()
             logger.info("Database connection closed")
+    
+    async def close_async_connection(self) -> None:
+        """
+        Close async database connection and dispose of async engine.
+        """
+        if self.async_engine:
+            await self.async_engine.dispose()
+            logger.info("Async database connection closed")
+        if self.replicas:
+            for engine in self.replicas.engines:
+                await engine.dispose()
+            logger.info("Read replica connections closed")
 
 # Global database manager instance
 db_manager = DatabaseManager()
@@ -154,12 +565,93 @@ def get_db() -> Session:
     finally:
         db.close()
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Open a database session outside of a request dependency.
+    
+    Used by background work running in worker threads.
+    
+    Yields:
+        Session: Database session
+    """
+    if not db_manager.SessionLocal:
+        init_db()
+    
+    db = db_manager.get_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def async_session_scope(read_only: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Open an async database session outside of a request dependency.
+    
+    Used by streaming responses and background work whose lifetime is not
+    tied to the request handler.
+    
+    Args:
+        read_only (bool, optional): Read from a replica when configured. Defaults to False.
+    
+    Yields:
+        AsyncSession: Async database session
+    """
+    if not db_manager.AsyncSessionLocal:
+        init_async_db()
+    
+    db = db_manager.get_async_read_session() if read_only else db_manager.get_async_session()
+    try:
+        if reads_from_replica(db.sync_session):
+            try:
+                await db.connection()
+            except DBAPIError as e:
+                # The replica's error listener has marked it unhealthy; this
+                # session falls back to the primary instead of failing
+                logger.warning(f"Read replica unavailable, falling back to primary: {e.orig}")
+                await db.rollback()
+                db.sync_session.info["read_only"] = False
+        yield db
+    finally:
+        await db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency function to get async database session.
+    
+    Yields:
+        AsyncSession: Async database session
+    """
+    async with async_session_scope() as db:
+        yield db
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency function to get an async session for read-only endpoints.
+    
+    Queries go to a read replica when DB_REPLICA_HOSTS is configured; a
+    write pins the session to the primary for the rest of the request.
+    Replicas may lag the primary slightly.
+    
+    Yields:
+        AsyncSession: Async database session
+    """
+    async with async_session_scope(read_only=True) as db:
+        yield db
+
 def init_db() -> None:
     """
     Initialize database connection.
     """
     db_manager.initialize_database()
 
+def init_async_db() -> None:
+    """
+    Initialize async database connection.
+    """
+    db_manager.initialize_async_database()
+
 def create_tables() -> None:
     """
     Create all tables defined in the Base metadata.
@@ -170,6 +662,12 @@ def create_tables() -> None:
     Base.metadata.create_all(bind=db_manager.engine)
     logger.info("Database tables created successfully")
 
+def utc_now() -> datetime:
+    """
+    Return the current UTC time as a naive datetime, as DateTime columns store it.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 # Example usage and testing
 if __name__ == "__main__":
     # Initialize database
@@ -0,0 +1,226 @@
+"""
+Connection pool configuration and instrumentation.
+
+This module reads the pool settings from the environment, provides pool
+classes that record how long each checkout waits for a connection, and an
+idle-threshold liveness check: a pooled connection is pinged on checkout
+only if it has been idle longer than DB_POOL_PING_IDLE_SECONDS, instead of on
+every checkout as ``pool_pre_ping`` does.
+
+Pools can also be warmed up at startup, so the first requests after a deploy
+do not pay for opening connections.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Checkout wait samples kept per pool for percentiles
+WAIT_SAMPLES = 2048
+
+
+def pool_settings() -> Dict[str, Any]:
+    """
+    Read the connection pool settings from the environment.
+
+    DB_POOL_PRE_PING selects the liveness strategy: 'idle' (default) pings
+    connections idle for more than DB_POOL_PING_IDLE_SECONDS, 'always' pings
+    on every checkout and 'never' disables pinging.
+
+    Returns:
+        Dict[str, Any]: Pool settings
+    """
+    pre_ping = os.getenv('DB_POOL_PRE_PING', 'idle').lower()
+    if pre_ping not in ('idle', 'always', 'never'):
+        raise ValueError(f"DB_POOL_PRE_PING must be 'idle', 'always' or 'never', not '{pre_ping}'")
+
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '3600')),
+        'pool_use_lifo': os.getenv('DB_POOL_USE_LIFO', 'false').lower() == 'true',
+        'pre_ping': pre_ping,
+        'ping_idle_seconds': float(os.getenv('DB_POOL_PING_IDLE_SECONDS', '30')),
+        'warmup': int(os.getenv('DB_POOL_WARMUP', '2')),
+        'echo': os.getenv('DB_ECHO', 'false').lower() == 'true',
+    }
+
+
+class PoolStats:
+    """
+    Checkout and liveness counters of one pool.
+
+    Attributes:
+        checkouts (int): Connections handed out
+        failures (int): Checkouts that timed out or could not connect
+        pings (int): Idle-threshold pings issued
+        ping_failures (int): Pings that found a dead connection
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.failures = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, failed: bool = False) -> None:
+        """Record how long one checkout waited."""
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.checkouts += 1
+            self._waits.append(seconds)
+
+    def wait_percentiles(self) -> Dict[str, float]:
+        """Checkout wait percentiles in milliseconds over the recent samples."""
+        with self._lock:
+            waits = sorted(self._waits)
+        if not waits:
+            return {"samples": 0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+
+        def percentile(fraction: float) -> float:
+            return waits[min(len(waits) - 1, int(fraction * len(waits)))] * 1000
+
+        return {
+            "samples": len(waits),
+            "p50": percentile(0.50),
+            "p90": percentile(0.90),
+            "p99": percentile(0.99),
+            "max": waits[-1] * 1000,
+        }
+
+
+class _InstrumentedPoolMixin:
+    """Time every checkout, including waiting for a free slot and opening overflow connections."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except Exception:
+            self.stats.record_wait(time.perf_counter() - started, failed=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return entry
+
+    @property
+    def stats(self) -> PoolStats:
+        stats = self.__dict__.get("_stats")
+        if stats is None:
+            stats = self.__dict__["_stats"] = PoolStats()
+        return stats
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool recording checkout waits."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout waits."""
+
+
+def enable_idle_ping(engine: Engine, idle_seconds: float) -> None:
+    """
+    Ping pooled connections on checkout only after they sat idle.
+
+    A failed ping raises DisconnectionError, which makes the pool discard the
+    connection and retry the checkout with a fresh one.
+
+    Args:
+        engine (Engine): Sync engine (use ``AsyncEngine.sync_engine`` for async engines)
+        idle_seconds (float): Idle time after which a connection is pinged
+    """
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        idle_since = connection_record.info.get("idle_since")
+        if idle_since is None or time.monotonic() - idle_since < idle_seconds:
+            return
+
+        stats = getattr(engine.pool, "stats", None)
+        if stats is not None:
+            stats.pings += 1
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            if stats is not None:
+                stats.ping_failures += 1
+            raise DisconnectionError(f"Idle connection failed liveness ping: {e}") from e
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Open pooled connections ahead of the first requests.
+
+    The connections are opened concurrently and held together, so the pool
+    keeps ``connections`` distinct connections afterwards. The count is capped
+    at the pool size, since overflow connections are closed when returned.
+
+    Args:
+        engine (AsyncEngine): Engine whose pool to fill
+        connections (int): Connections to open
+
+    Returns:
+        int: Connections opened
+    """
+    pool = engine.sync_engine.pool
+    if isinstance(pool, QueuePool):
+        connections = min(connections, pool.size())
+    if connections <= 0:
+        return 0
+
+    opened = [engine.connect() for _ in range(connections)]
+    await asyncio.gather(*(connection.start() for connection in opened))
+    for connection in opened:
+        await connection.close()
+    return connections
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """
+    Describe the state of an engine's pool.
+
+    Args:
+        engine (Engine): Sync engine (use ``AsyncEngine.sync_engine`` for async engines)
+
+    Returns:
+        Dict[str, Any]: Pool occupancy, limits and checkout wait statistics
+    """
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "idle": pool.checkedin(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolStats):
+        status.update({
+            "checkouts": stats.checkouts,
+            "failures": stats.failures,
+            "pings": stats.pings,
+            "ping_failures": stats.ping_failures,
+            "checkout_wait_ms": stats.wait_percentiles(),
+        })
+    return status
@@ -0,0 +1,75 @@
+"""
+Entity tags for conditional GETs.
+
+Read endpoints send an ``ETag`` derived from row versions, and answer a
+request whose ``If-None-Match`` still matches with ``304 Not Modified``. The
+tag is checked with a narrow query (IDs and versions only) before the full
+rows are loaded, so an unchanged resource costs neither the full fetch nor
+its serialization.
+"""
+
+import hashlib
+from typing import Any, Iterable, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """
+    Build a strong entity tag from the values identifying a representation.
+
+    Args:
+        parts (Iterable[Any]): Values that change whenever the response body does,
+            e.g. ``(id, version)`` pairs of the rows on a page
+
+    Returns:
+        str: Quoted entity tag
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current entity tag.
+
+    Uses the weak comparison required for If-None-Match: ``W/`` prefixes are
+    ignored, a list of tags matches if any of them does, and ``*`` matches
+    any existing representation.
+
+    Args:
+        if_none_match (Optional[str]): If-None-Match header value
+        etag (str): Current quoted entity tag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build the 304 response for a matching conditional GET.
+
+    Args:
+        etag (str): Current quoted entity tag
+
+    Returns:
+        Response: Empty 304 response carrying the ETag
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,440 @@
+"""
+In-process background job runner.
+
+Large exports and ZATCA batches are submitted with ``POST /jobs`` and queued
+in the ``jobs`` table, so the request returns at once instead of holding a
+database session for the whole run. Each API worker process runs a
+JobRunner that polls the table, claims jobs and runs them; there is no
+broker, the table is the queue.
+
+Job types are registered with ``job_type``. A handler receives a JobContext
+and returns a JSON-serialisable result; it opens its own sessions. Coroutine
+handlers run on the event loop, plain functions on the runner's own thread
+pool, so jobs never take threads from request handling.
+
+Up to ``JOB_WORKERS`` jobs run at once per process, and each job type at
+most its concurrency limit (``JOB_CONCURRENCY`` overrides the registered
+limits). Running jobs refresh a heartbeat on every poll. A job interrupted by
+a shutdown goes back to the queue at its next progress report; the jobs of a
+process that died are requeued once their heartbeat is ``JOB_STALE_AFTER``
+seconds old. Handlers therefore have to be safe to run again; a handler
+that cannot simply start over saves its position with
+``JobContext.checkpoint`` and resumes from ``JobContext.state``.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Type, Union
+from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from database import async_session_scope, utc_now
+from crud.job_crud import (
+    claim_job,
+    finish_job,
+    get_pending_jobs,
+    record_job_checkpoint,
+    record_job_heartbeats,
+    requeue_stale_jobs
+)
+
+logger = logging.getLogger(__name__)
+
+# Jobs run at once per process; 0 disables the runner in this process
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+
+# Seconds between queue polls (a submit to this process polls at once)
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+
+# Seconds without a heartbeat after which a running job is requeued
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "60"))
+
+# Starts allowed per job before a job whose worker keeps dying is failed
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# Directory for files produced by jobs, such as exports
+JOB_OUTPUT_DIR = os.getenv("JOB_OUTPUT_DIR", os.path.join(tempfile.gettempdir(), "erp-jobs"))
+
+
+class JobInterrupted(Exception):
+    """
+    Raised by JobContext.report when the runner is stopping, and by
+    JobContext.checkpoint when the job was taken over; the job goes back to
+    the queue.
+    """
+
+
+class JobContext:
+    """
+    Running job as seen by its handler.
+
+    Attributes:
+        job_id (str): ID of the job
+        worker_id (str): ID of the worker process running it
+        params (Dict[str, Any]): Validated job parameters
+        state (Optional[Dict[str, Any]]): Last checkpoint, saved by an earlier run if it was interrupted
+        progress (float): Fraction of the work done, saved with the next heartbeat
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        worker_id: str,
+        params: Dict[str, Any],
+        state: Optional[Dict[str, Any]],
+        stopping: threading.Event
+    ):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.params = params
+        self.state = state
+        self.progress = 0.0
+        self._stopping = stopping
+
+    def report(self, done: float, total: float) -> None:
+        """
+        Record progress; handlers call this between units of work.
+
+        Args:
+            done (float): Units of work done
+            total (float): Units of work in the job; progress is left unchanged if 0
+
+        Raises:
+            JobInterrupted: If the runner is stopping and work is left
+        """
+        if total > 0:
+            self.progress = min(max(done / total, 0.0), 1.0)
+        if self._stopping.is_set() and done < total:
+            raise JobInterrupted()
+
+    def checkpoint(self, db: Session, state: Dict[str, Any], done: float, total: float) -> None:
+        """
+        Record progress, save the job's state and commit ``db``.
+
+        Call it with the unit of work written but not committed: the work and
+        the state are committed in one transaction, so a rerun of the job
+        (which starts with ``state`` as JobContext.state) never repeats or
+        skips committed work. Call report afterwards to honour a shutdown.
+
+        Args:
+            db (Session): Database session holding the uncommitted work
+            state (Dict[str, Any]): JSON-serialisable state to resume from
+            done (float): Units of work done
+            total (float): Units of work in the job
+
+        Raises:
+            JobInterrupted: If the job was requeued to another worker after a
+                missed heartbeat; the work is rolled back
+        """
+        if total > 0:
+            self.progress = min(max(done / total, 0.0), 1.0)
+        try:
+            if not record_job_checkpoint(db, self.job_id, self.worker_id, self.progress, state):
+                db.rollback()
+                raise JobInterrupted()
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        self.state = state
+
+
+JobHandler = Callable[[JobContext], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class JobType:
+    """
+    Registered job type.
+
+    Attributes:
+        name (str): Name submitted as job_type
+        handler (JobHandler): Function or coroutine function running a job
+        params_model (Type[BaseModel]): Schema of the job parameters
+        concurrency (int): Jobs of this type run at once per process
+        submittable (bool): Whether clients may submit it with ``POST /jobs``
+    """
+
+    name: str
+    handler: JobHandler
+    params_model: Type[BaseModel]
+    concurrency: int = 1
+    submittable: bool = True
+
+
+# Registered job types by name
+JOB_TYPES: Dict[str, JobType] = {}
+
+
+def job_type(
+    name: str,
+    params_model: Type[BaseModel],
+    concurrency: int = 1,
+    submittable: bool = True
+) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register the decorated function as the handler of a job type.
+
+    Args:
+        name (str): Job type name
+        params_model (Type[BaseModel]): Schema of the job parameters
+        concurrency (int, optional): Jobs of this type run at once per process. Defaults to 1.
+        submittable (bool, optional): Whether clients may submit it with ``POST /jobs``;
+            False for jobs queued by another endpoint. Defaults to True.
+    """
+    def register(handler: JobHandler) -> JobHandler:
+        JOB_TYPES[name] = JobType(name, handler, params_model, concurrency, submittable)
+        return handler
+    return register
+
+
+def job_output_path(job_id: str, suffix: str) -> str:
+    """
+    Path of a file produced by a job, creating JOB_OUTPUT_DIR if needed.
+
+    Args:
+        job_id (str): ID of the job
+        suffix (str): File extension
+
+    Returns:
+        str: Path under JOB_OUTPUT_DIR
+    """
+    os.makedirs(JOB_OUTPUT_DIR, exist_ok=True)
+    return os.path.join(JOB_OUTPUT_DIR, f"{job_id}.{suffix}")
+
+
+def concurrency_from_env() -> Dict[str, int]:
+    """
+    Parse per-type concurrency limits from JOB_CONCURRENCY, e.g. ``inventory_export=1,zatca_issue=1``.
+
+    Returns:
+        Dict[str, int]: Limits keyed by job type
+    """
+    limits = {}
+    for entry in os.getenv("JOB_CONCURRENCY", "").split(","):
+        if "=" in entry:
+            name, limit = entry.split("=", 1)
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+class JobRunner:
+    """
+    Bounded pool running queued jobs in this process.
+
+    A dispatcher task polls the queue, records heartbeats, requeues stale
+    jobs and claims pending jobs while slots are free.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        stale_after: float = JOB_STALE_AFTER,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        concurrency: Optional[Dict[str, int]] = None
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency_from_env() if concurrency is None else concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._running: Dict[str, Tuple[str, JobContext]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping = threading.Event()
+        self._wake: Optional[asyncio.Event] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._next_stale_check = 0.0
+
+    def limit(self, name: str) -> int:
+        """Concurrency limit of a job type in this process."""
+        return self.concurrency.get(name, JOB_TYPES[name].concurrency)
+
+    def start(self) -> None:
+        """Start the dispatcher on the running event loop; does nothing if JOB_WORKERS is 0."""
+        if self.workers <= 0 or self._dispatcher is not None:
+            return
+        self._stopping.clear()
+        self._wake = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        logger.info(f"Job runner {self.worker_id} started with {self.workers} workers")
+
+    def wake(self) -> None:
+        """Poll the queue now rather than at the next interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop claiming jobs and wait up to ``timeout`` seconds for running ones.
+
+        Running jobs stop at their next progress report and go back to the
+        queue. Coroutine jobs still running after the timeout are cancelled
+        and put back in the queue at once; jobs running in a thread cannot be
+        cancelled and are requeued by another worker once their heartbeat
+        goes stale.
+        """
+        if self._dispatcher is None:
+            return
+        self._stopping.set()
+        self.wake()
+        await self._dispatcher
+        self._dispatcher = None
+
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            if pending:
+                logger.warning(f"{len(pending)} jobs still running at shutdown; cancelling them")
+                for task in pending:
+                    task.cancel()
+                await asyncio.wait(pending)
+            # Outcomes of the cancelled jobs, recorded in tasks of their own
+            if self._tasks:
+                await asyncio.wait(self._tasks, timeout=timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the runner's configuration and the jobs it is running."""
+        return {
+            "worker_id": self.worker_id,
+            "workers": self.workers,
+            "running": {job_id: {"job_type": name, "progress": context.progress}
+                        for job_id, (name, context) in self._running.items()},
+            "limits": {name: self.limit(name) for name in JOB_TYPES},
+        }
+
+    async def _dispatch(self) -> None:
+        """Poll the queue until the runner stops."""
+        while not self._stopping.is_set():
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.warning(f"Job queue poll failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _poll(self) -> None:
+        """Record heartbeats, requeue stale jobs and claim pending jobs into free slots."""
+        async with async_session_scope() as db:
+            progress = {job_id: context.progress for job_id, (_, context) in self._running.items()}
+            await db.run_sync(record_job_heartbeats, self.worker_id, progress)
+
+            if time.monotonic() >= self._next_stale_check:
+                self._next_stale_check = time.monotonic() + self.stale_after / 2
+                stale_before = utc_now() - timedelta(seconds=self.stale_after)
+                requeued, failed = await db.run_sync(requeue_stale_jobs, stale_before, self.max_attempts)
+                if requeued or failed:
+                    logger.warning(f"Recovered stale jobs: {requeued} requeued, {failed} failed")
+
+            free = self.workers - len(self._running)
+            if free <= 0:
+                return
+            running = Counter(name for name, _ in self._running.values())
+            capacity = {name: self.limit(name) - running[name] for name in JOB_TYPES}
+
+            # One query per type with free capacity, so a long queue of one
+            # type cannot hide the jobs of another
+            candidates = []
+            for name, slots in capacity.items():
+                if slots > 0:
+                    candidates += await db.run_sync(get_pending_jobs, name, min(slots, free))
+            candidates.sort(key=lambda row: (row.created_at, row.id))
+
+            for row in candidates:
+                if free <= 0 or self._stopping.is_set():
+                    break
+                if capacity[row.job_type] <= 0:
+                    continue
+                if await db.run_sync(claim_job, row.id, self.worker_id):
+                    free -= 1
+                    capacity[row.job_type] -= 1
+                    self._start_job(row.id, row.job_type, row.params, row.result)
+
+    def _start_job(self, job_id: str, name: str, params: Dict[str, Any], state: Optional[Dict[str, Any]]) -> None:
+        """Run a claimed job in a task."""
+        context = JobContext(job_id, self.worker_id, params, state, self._stopping)
+        self._running[job_id] = (name, context)
+        self._track(asyncio.create_task(self._run_job(name, context)))
+
+    def _track(self, task: asyncio.Task) -> None:
+        """Keep a task referenced until it is done, so stop() can wait for it."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, name: str, context: JobContext) -> None:
+        """Run a job's handler and record its outcome."""
+        handler = JOB_TYPES[name].handler
+        is_coroutine = inspect.iscoroutinefunction(handler)
+        status, result, error = "completed", None, None
+        started = time.perf_counter()
+        try:
+            if is_coroutine:
+                result = await handler(context)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, handler, context)
+        except JobInterrupted:
+            status = "pending"
+        except asyncio.CancelledError:
+            del self._running[context.job_id]
+            if is_coroutine:
+                # This task can no longer await; put the job back in the
+                # queue from a task of its own
+                self._track(asyncio.create_task(self._record_outcome(name, context, "pending", None, None, started)))
+            # Otherwise the thread is still running the handler; leave the
+            # job claimed so nobody else starts it before it is stale
+            raise
+        except Exception as e:
+            status, error = "failed", str(e) or type(e).__name__
+            logger.exception(f"Job {context.job_id} ({name}) failed")
+        del self._running[context.job_id]
+        await self._record_outcome(name, context, status, result, error, started)
+
+    async def _record_outcome(
+        self,
+        name: str,
+        context: JobContext,
+        status: str,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+        started: float
+    ) -> None:
+        """Record the outcome of a job that has stopped running."""
+        try:
+            async with async_session_scope() as db:
+                await db.run_sync(finish_job, context.job_id, self.worker_id, status, result, error)
+        except Exception as e:
+            logger.warning(f"Outcome of job {context.job_id} not recorded; it is requeued once stale: {e}")
+        logger.info(f"Job {context.job_id} ({name}) {status} after {time.perf_counter() - started:.3f}s")
+        self.wake()
+
+
+# Job runner of this process, started and stopped by the application lifespan
+job_runner = JobRunner()
+
+
+def get_job_runner() -> JobRunner:
+    """
+    Return the job runner of this process.
+
+    Returns:
+        JobRunner: The job runner
+    """
+    return job_runner
@@ -2,16 +2,116 @@
 Main FastAPI application for Amanat Al-Kalima Company ERP API.
 """
 
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from database import db_manager, init_async_db, init_db, session_scope
+from db_pool import pool_settings
+from jobs import get_job_runner
+from metrics import MetricsMiddleware
+from search_index import (
+    SEARCH_INDEX_REFRESH_SECONDS,
+    SEARCH_INDEX_RETRY_SECONDS,
+    build_inventory_search_index,
+    inventory_search_index,
+    refresh_inventory_search_index
+)
+from zatca import shutdown_render_pool
 from routers.customer_router import router as customer_router
 from routers.inventory_router import router as inventory_router
+from routers.invoice_router import router as invoice_router
+from routers.job_router import router as job_router
+from routers.internal_router import router as internal_router
+from routers.metrics_router import router as metrics_router
+
+logger = logging.getLogger(__name__)
+
+
+def _build_search_index() -> None:
+    """Build the inventory search index; the refresher builds it if this fails."""
+    try:
+        with session_scope() as db:
+            build_inventory_search_index(db)
+    except Exception as e:
+        logger.warning(f"Inventory search index not built at startup: {e}")
+
+
+def _refresh_search_index_once() -> None:
+    """Apply other workers' inventory writes to the search index."""
+    with session_scope() as db:
+        refresh_inventory_search_index(db)
+
+
+async def _refresh_search_index() -> None:
+    """
+    Refresh the inventory search index every SEARCH_INDEX_REFRESH_SECONDS until cancelled.
+    
+    With refreshes disabled this only retries a failed startup build, every
+    SEARCH_INDEX_RETRY_SECONDS, and returns once the index is built.
+    """
+    while SEARCH_INDEX_REFRESH_SECONDS > 0 or not inventory_search_index.ready:
+        await asyncio.sleep(SEARCH_INDEX_RETRY_SECONDS)
+        try:
+            await run_in_threadpool(_refresh_search_index_once)
+        except Exception as e:
+            logger.warning(f"Inventory search index refresh failed: {e}")
+
+
+async def _warm_up_pools() -> None:
+    """Pre-open DB_POOL_WARMUP connections per async pool; requests open them lazily if this fails."""
+    connections = pool_settings()['warmup']
+    if connections <= 0:
+        return
+    try:
+        opened = await db_manager.warm_up_async_pools(connections)
+        logger.info(f"Database pools warmed up: {opened}")
+    except Exception as e:
+        logger.warning(f"Database pools not warmed up at startup: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown work.
+    
+    The database is initialised and its pools warmed up before the worker
+    starts accepting requests, then the search index refresh and the
+    background job runner are started. On shutdown they and the ZATCA render
+    pool are stopped and the engines are disposed.
+    Engines configured before startup (e.g. by benchmarks) are kept.
+    """
+    started = time.perf_counter()
+    if db_manager.engine is None:
+        init_db()
+    if db_manager.async_engine is None:
+        init_async_db()
+    await _warm_up_pools()
+    await run_in_threadpool(_build_search_index)
+    refresher = asyncio.create_task(_refresh_search_index())
+    get_job_runner().start()
+    logger.info(f"Startup finished in {time.perf_counter() - started:.3f}s")
+    
+    yield
+    
+    refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresher
+    await get_job_runner().stop()
+    await run_in_threadpool(shutdown_render_pool)
+    await db_manager.close_async_connection()
+    db_manager.close_connection()
+
 
 # Create FastAPI app instance
 app = FastAPI(
     title="Amanat Al-Kalima Company ERP API",
     description="Enterprise Resource Planning API for Amanat Al-Kalima Company",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS middleware to allow requests from any origin
@@ -23,9 +123,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route latency and per-request DB timing (outermost, so it sees the full request)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(customer_router)
 app.include_router(inventory_router)
+app.include_router(invoice_router)
+app.include_router(job_router)
+app.include_router(internal_router)
+app.include_router(metrics_router)
 
 # Root endpoint
 @app.get("/")
@@ -0,0 +1,233 @@
+"""
+Request and database metrics in the Prometheus text format.
+
+This module keeps per-route latency histograms and per-request database
+timing in process memory:
+
+- ``MetricsMiddleware`` (pure ASGI, no per-request task) times every request
+  and labels it with the route template and status code.
+- SQLAlchemy ``before/after_cursor_execute`` listeners registered on the
+  Engine class count statements and DB time into the current request's
+  ``RequestStats``, found through a ContextVar, so every engine (primary,
+  async, replicas) is covered.
+- The numbers are exposed as histograms on ``/metrics`` and per response in
+  a ``Server-Timing`` header.
+
+The hot path is two ``perf_counter`` calls per statement and one lock
+acquisition per histogram observation.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Default latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class RequestStats:
+    """
+    Database activity of one request.
+
+    Attributes:
+        queries (int): Statements executed
+        db_time (float): Seconds spent executing statements
+        scope (dict): ASGI scope of the request
+        budget (Optional[int]): Statement budget declared for the route, if any
+    """
+
+    __slots__ = ("queries", "db_time", "scope", "budget")
+
+    def __init__(self, scope=None):
+        self.queries = 0
+        self.db_time = 0.0
+        self.scope = scope or {}
+        self.budget: Optional[int] = None
+
+    @property
+    def route(self) -> str:
+        """Method and route template of the request, e.g. 'GET /inventory/{item_id}'."""
+        return f"{self.scope.get('method', '-')} {route_label(self.scope)}"
+
+
+# Stats of the request being handled in the current context
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class Histogram:
+    """
+    Prometheus histogram with a fixed label set.
+
+    Attributes:
+        name (str): Metric name
+        documentation (str): HELP text
+        label_names (Tuple[str, ...]): Label names, in order
+        buckets (Tuple[float, ...]): Upper bounds of the buckets
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # Per label values: bucket counts (non-cumulative, last one is +Inf), sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation for the given label values."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        """Render the histogram in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+
+        for label_values, counts, total in sorted(series):
+            labels = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, label_values)
+            )
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database statements executed per HTTP request.",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing database statements per HTTP request.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+
+HISTOGRAMS = (REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME)
+
+
+def render_metrics() -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: Metrics text
+    """
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    # Statements on one connection never overlap; a failed statement's start
+    # time is simply overwritten by the next one
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def route_label(scope) -> str:
+    """Route template of a request (e.g. /inventory/{item_id}), bounded to known routes."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and database timing.
+
+    Adds a ``Server-Timing`` header with the DB time and statement count
+    accumulated when the response starts. Streaming responses keep
+    accumulating into the histograms until their body is complete.
+    """
+
+    def __init__(self, app, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            recorded = True
+            method = scope["method"]
+            route = route_label(scope)
+            REQUEST_LATENCY.observe(time.perf_counter() - started, method, route, str(status_code))
+            REQUEST_QUERIES.observe(stats.queries, method, route)
+            REQUEST_DB_TIME.observe(stats.db_time, method, route)
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timing = (
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.2f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+            # Record when the body is complete, before any background tasks run
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not recorded:
+                record()
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_stats.reset(token)
+            if not recorded:
+                record()
@@ -2,7 +2,12 @@
 Models package for Amanat Al-Kalima Company ERP System.
 """
 
+from .customer_model import Customer
 from .inventory_model import Inventory
+from .inventory_change_model import InventoryChange
+from .inventory_summary_model import InventorySummary
 from .invoice_model import Invoice, InvoiceItem
+from .job_model import Job
+from .zatca_model import ZatcaDocument
 
-__all__ = ["Inventory", "Invoice", "InvoiceItem"]
\ No newline at end of file
+__all__ = ["Customer", "Inventory", "InventoryChange", "InventorySummary", "Invoice", "InvoiceItem", "Job", "ZatcaDocument"]
\ No newline at end of file
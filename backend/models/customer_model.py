@@ -0,0 +1,41 @@
+"""
+Customer model for the Customer Management module.
+
+This module defines the Customer SQLAlchemy model referenced by invoices
+in the Amanat Al-Kalima Company ERP system.
+"""
+
+from sqlalchemy import Column, Integer, String
+from database import Base
+
+
+class Customer(Base):
+    """
+    Customer model for the buyers invoices are issued to.
+    
+    Attributes:
+        id (int): Primary key identifier for the customer
+        name (str): Customer or company name
+        vat_number (str): VAT registration number (required on ZATCA standard invoices)
+        email (str): Contact email address
+        phone (str): Contact phone number
+        address (str): Postal address
+    """
+    
+    __tablename__ = "customers"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Customer information
+    name = Column(String(255), nullable=False, index=True)
+    vat_number = Column(String(15), nullable=True, unique=True)
+    
+    # Contact information
+    email = Column(String(255), nullable=True)
+    phone = Column(String(50), nullable=True)
+    address = Column(String(500), nullable=True)
+    
+    def __repr__(self):
+        """String representation of the Customer object."""
+        return f"<Customer(id={self.id}, name='{self.name}', vat_number='{self.vat_number}')>"
@@ -0,0 +1,38 @@
+"""
+Inventory change log model for the Inventory Management module.
+
+This module defines the InventoryChange SQLAlchemy model. The inventory CRUD
+write paths append the IDs of items whose searchable text or existence
+changed, in the same transaction as the write, so each worker's search index
+refresh reads only the recent entries instead of scanning the inventory.
+Entries are pruned once they are older than the refresh retention.
+"""
+
+from sqlalchemy import Column, Integer, DateTime
+from database import Base, utc_now
+
+
+class InventoryChange(Base):
+    """
+    Change log entry for one written inventory item.
+    
+    Attributes:
+        id (int): Primary key identifier for the entry
+        item_id (int): ID of the inventory item written (it may since have been deleted)
+        changed_at (datetime): When the write was made (UTC)
+    """
+    
+    __tablename__ = "inventory_changes"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True)
+    
+    # Written item; not a foreign key, deletions are logged too
+    item_id = Column(Integer, nullable=False)
+    
+    # Refreshes read entries newer than their last run
+    changed_at = Column(DateTime, nullable=False, default=utc_now, index=True)
+    
+    def __repr__(self):
+        """String representation of the InventoryChange object."""
+        return f"<InventoryChange(id={self.id}, item_id={self.item_id}, changed_at='{self.changed_at}')>"
@@ -5,7 +5,7 @@ This module defines the Inventory SQLAlchemy model for tracking inventory items
 in the Amanat Al-Kalima Company ERP system.
 """
 
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 from database import Base
 
 
@@ -22,9 +22,16 @@ class Inventory(Base):
         unit (str): Unit of measurement (e.g., 'kg', 'ton', 'lbs')
         purchase_price (float): Purchase price of the item
         location (str): Storage location of the item
+        version (int): Row version, incremented on every write for optimistic concurrency
     """
     
     __tablename__ = "inventory"
+    __table_args__ = (
+        # Listings filtered by type, optionally narrowed to a location
+        Index("ix_inventory_item_type_location", "item_type", "location"),
+        # Stock per location, filtered or sorted by quantity
+        Index("ix_inventory_location_quantity", "location", "quantity"),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -44,6 +51,9 @@ class Inventory(Base):
     # Location information
     location = Column(String(255), nullable=False)
     
+    # Concurrency control
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
     def __repr__(self):
         """String representation of the Inventory object."""
         return f"<Inventory(id={self.id}, item_name='{self.item_name}', quantity={self.quantity}, location='{self.location}')>"
\ No newline at end of file
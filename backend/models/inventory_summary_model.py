@@ -0,0 +1,41 @@
+"""
+Inventory summary model for the Inventory Management module.
+
+This module defines the InventorySummary SQLAlchemy model holding stock
+rollups per item type and location. The rows are maintained incrementally by
+the inventory CRUD write paths, so dashboards read O(groups) rows instead of
+scanning the inventory table.
+"""
+
+from sqlalchemy import Column, Integer, String, Float
+from database import Base
+
+
+class InventorySummary(Base):
+    """
+    Inventory summary model with stock rollups per (item_type, location).
+    
+    Attributes:
+        item_type (str): Type/category of the inventory items
+        location (str): Storage location of the inventory items
+        item_count (int): Number of inventory items in the group
+        total_quantity (float): Sum of item quantities
+        total_weight (float): Sum of item weights
+        stock_value (float): Sum of quantity * purchase_price
+    """
+    
+    __tablename__ = "inventory_summary"
+    
+    # Composite primary key
+    item_type = Column(String(100), primary_key=True)
+    location = Column(String(255), primary_key=True)
+    
+    # Rollups
+    item_count = Column(Integer, nullable=False, default=0)
+    total_quantity = Column(Float, nullable=False, default=0.0)
+    total_weight = Column(Float, nullable=False, default=0.0)
+    stock_value = Column(Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        """String representation of the InventorySummary object."""
+        return f"<InventorySummary(item_type='{self.item_type}', location='{self.location}', item_count={self.item_count}, stock_value={self.stock_value})>"
@@ -23,6 +23,7 @@ class Invoice(Base):
         vat_amount (float): VAT amount
         total_amount_with_vat (float): Total amount including VAT
         status (str): Invoice status (e.g., 'Draft', 'Sent', 'Paid')
+        version (int): Row version, incremented on every update; drives the ETag
         items (relationship): Related invoice items
     """
     
@@ -46,8 +47,19 @@ class Invoice(Base):
     # Status information
     status = Column(String(50), nullable=False, default='Draft')
     
-    # Relationship to invoice items
-    items = relationship("InvoiceItem", back_populates="invoice", cascade="all, delete-orphan")
+    # Change tracking for conditional GETs
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    # Relationship to invoice items; never lazy-loaded, use selectinload(Invoice.items)
+    items = relationship(
+        "InvoiceItem",
+        back_populates="invoice",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql"
+    )
+    
+    # Customer name resolved from the customer directory when rendering; not stored
+    customer_name = None
     
     def __repr__(self):
         """String representation of the Invoice object."""
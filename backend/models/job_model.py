@@ -0,0 +1,60 @@
+"""
+Background job model for the job runner.
+
+This module defines the Job SQLAlchemy model. Jobs are queued, claimed and
+tracked in the database, so they outlive the worker process that accepted
+them and any worker process can run them.
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, Index
+from database import Base, utc_now
+
+
+class Job(Base):
+    """
+    Background job with its status and progress.
+    
+    Attributes:
+        id (str): Primary key, a random hex identifier
+        job_type (str): Registered job type that runs the job
+        status (str): 'pending', 'running', 'completed' or 'failed'
+        params (dict): Validated job parameters
+        progress (float): Fraction of the work done, between 0.0 and 1.0
+        result (dict): What the job produced, or its last checkpoint while it runs
+        error (str): Why the job failed
+        attempts (int): Number of times the job was started
+        worker_id (str): Worker process running the job
+        created_at (datetime): When the job was submitted
+        started_at (datetime): When the job was last started
+        heartbeat_at (datetime): Last time the running worker reported in
+        finished_at (datetime): When the job completed or failed
+    """
+    
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Queue scans: pending jobs oldest first, and stale running jobs
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+    
+    id = Column(String(32), primary_key=True)
+    job_type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    params = Column(JSON, nullable=False)
+    
+    # Progress and outcome
+    progress = Column(Float, nullable=False, default=0.0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    # Claim bookkeeping
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100), nullable=True)
+    
+    created_at = Column(DateTime, nullable=False, default=utc_now)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        """String representation of the Job object."""
+        return f"<Job(id='{self.id}', job_type='{self.job_type}', status='{self.status}')>"
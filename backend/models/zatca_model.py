@@ -0,0 +1,50 @@
+"""
+ZATCA document model for the ZATCA E-Invoicing module.
+
+This module defines the ZatcaDocument SQLAlchemy model holding the issued
+e-invoice document of an invoice together with its place in the invoice hash
+chain.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from database import Base, utc_now
+
+
+class ZatcaDocument(Base):
+    """
+    Issued ZATCA document of an invoice.
+    
+    Documents are immutable once issued: each one embeds the hash of the
+    previous document, so re-rendering an issued invoice would break the chain.
+    
+    Attributes:
+        invoice_id (int): Primary key, the invoice the document was issued for
+        counter (int): Invoice counter value (ICV), the document's position in the chain
+        uuid (str): Document UUID
+        previous_hash (str): Hash of the previous document in the chain (PIH), base64
+        invoice_hash (str): SHA-256 of the canonical document, base64
+        qr_code (str): Base64 TLV payload for the QR code
+        xml (str): The UBL invoice document
+        issued_at (datetime): When the document was issued
+    """
+    
+    __tablename__ = "zatca_documents"
+    
+    # One document per invoice
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), primary_key=True)
+    
+    # Chain position; unique so two concurrent issuers cannot fork the chain
+    counter = Column(Integer, nullable=False, unique=True)
+    uuid = Column(String(36), nullable=False)
+    previous_hash = Column(String(44), nullable=False)
+    invoice_hash = Column(String(44), nullable=False)
+    
+    # Issued document (MEDIUMTEXT on MySQL; invoices with many lines exceed TEXT)
+    qr_code = Column(String(1024), nullable=False)
+    xml = Column(Text(16777215), nullable=False)
+    
+    issued_at = Column(DateTime, nullable=False, default=utc_now)
+    
+    def __repr__(self):
+        """String representation of the ZatcaDocument object."""
+        return f"<ZatcaDocument(invoice_id={self.invoice_id}, counter={self.counter}, invoice_hash='{self.invoice_hash}')>"
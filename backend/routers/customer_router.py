@@ -2,14 +2,179 @@
 Customer router for handling customer-related API endpoints.
 """
 
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_async_read_db, query_budget
+from schemas.limits import MAX_BATCH_SIZE, MAX_PAGE_SIZE
+from schemas.customer_schema import Customer, CustomerCreate, CustomerUpdate
+from crud.customer_crud import (
+    create_customer_async,
+    get_customer_by_id_async,
+    get_customers_by_ids_async,
+    get_all_customers_async,
+    get_customers_next_cursor,
+    update_customer_async,
+    delete_customer_async
+)
 
 router = APIRouter(
     prefix="/customers",
     tags=["customers"]
 )
 
-@router.get("/")
-async def get_customers():
-    """Get all customers."""
-    return {"message": "Customer endpoints will be implemented here"}
\ No newline at end of file
+def _parse_ids(ids: str) -> List[int]:
+    """Parse a comma-separated ID list such as ``1,2,3``."""
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers, e.g. ids=1,2,3"
+        )
+    if len(parsed) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_SIZE} ids can be requested at once"
+        )
+    return parsed
+
+@router.post("/", response_model=Customer, status_code=status.HTTP_201_CREATED)
+async def create_customer(
+    customer: CustomerCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new customer."""
+    try:
+        return await create_customer_async(db=db, customer=customer)
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Customer conflicts with an existing one (duplicate VAT number?): {str(e.orig)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create customer: {str(e)}"
+        )
+
+@router.get("/", response_model=List[Customer], dependencies=[Depends(query_budget(1))])
+async def get_customers(
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated customer IDs to fetch in one batch"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order_by: str = "id",
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get customers, either a batch by ID or a paginated listing.
+
+    With ``ids``, the customers are returned in the requested order (unknown
+    IDs are skipped) using the customer cache and at most one IN query.
+    Otherwise customers are paginated; pass the X-Next-Cursor response header
+    back as ``after`` to fetch the next page.
+    """
+    try:
+        if ids is not None:
+            requested = _parse_ids(ids)
+            found = await get_customers_by_ids_async(db=db, customer_ids=requested)
+            return [found[customer_id] for customer_id in dict.fromkeys(requested) if customer_id in found]
+
+        customers = await get_all_customers_async(
+            db=db, skip=skip, limit=limit, after=after, order_by=order_by
+        )
+        cursor = get_customers_next_cursor(customers, limit, order_by)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        return customers
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve customers: {str(e)}"
+        )
+
+@router.get("/{customer_id}", response_model=Customer, dependencies=[Depends(query_budget(1))])
+async def get_customer(
+    customer_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get a specific customer by ID."""
+    try:
+        customer = await get_customer_by_id_async(db=db, customer_id=customer_id)
+        if customer is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Customer with ID {customer_id} not found"
+            )
+        return customer
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve customer: {str(e)}"
+        )
+
+@router.put("/{customer_id}", response_model=Customer)
+async def update_customer(
+    customer_id: int,
+    customer_update: CustomerUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update an existing customer."""
+    try:
+        customer = await update_customer_async(db=db, customer_id=customer_id, customer_update=customer_update)
+        if customer is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Customer with ID {customer_id} not found"
+            )
+        return customer
+    except HTTPException:
+        raise
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Customer conflicts with an existing one (duplicate VAT number?): {str(e.orig)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update customer: {str(e)}"
+        )
+
+@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_customer(
+    customer_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a customer that has no invoices."""
+    try:
+        success = await delete_customer_async(db=db, customer_id=customer_id)
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Customer with ID {customer_id} not found"
+            )
+    except HTTPException:
+        raise
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Customer with ID {customer_id} still has invoices"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete customer: {str(e)}"
+        )
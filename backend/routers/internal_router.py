@@ -0,0 +1,50 @@
+"""
+Internal router exposing operational statistics of the API process.
+"""
+
+from fastapi import APIRouter
+from cache import get_customer_cache, get_inventory_cache
+from database import db_manager
+from db_pool import pool_status
+from jobs import get_job_runner
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"]
+)
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Get hit/miss counters and size of the in-process caches."""
+    return {
+        "inventory": get_inventory_cache().stats(),
+        "customers": get_customer_cache().stats(),
+    }
+
+@router.get("/db/replicas")
+async def get_replica_status():
+    """Get the health of the configured read replicas."""
+    return {"replicas": db_manager.replicas.stats() if db_manager.replicas else []}
+
+@router.get("/db/pool")
+async def get_pool_stats():
+    """
+    Get connection pool occupancy and checkout-wait percentiles.
+    
+    Reported per engine: checked-out, overflow and idle connections, the pool
+    limits, and wait percentiles over the most recent checkouts.
+    """
+    pools = {}
+    if db_manager.engine:
+        pools["primary"] = pool_status(db_manager.engine)
+    if db_manager.async_engine:
+        pools["primary_async"] = pool_status(db_manager.async_engine.sync_engine)
+    if db_manager.replicas:
+        for host, engine in zip(db_manager.replicas.hosts, db_manager.replicas.engines):
+            pools[f"replica:{host}"] = pool_status(engine.sync_engine)
+    return {"pools": pools}
+
+@router.get("/jobs")
+async def get_job_runner_stats():
+    """Get the background job runner of this process: its limits and the jobs it is running."""
+    return get_job_runner().stats()
@@ -2,66 +2,490 @@
 Inventory router for handling inventory-related API endpoints.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_db
-from schemas.inventory_schema import Inventory, InventoryCreate, InventoryUpdate
+import os
+import shutil
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import orjson
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import async_session_scope, get_async_db, get_async_read_db, query_budget
+from etags import etag_matches, make_etag, not_modified
+from jobs import get_job_runner, job_output_path
+from search_index import SEARCH_INDEX_RETRY_SECONDS
+from schemas.limits import MAX_BATCH_SIZE, MAX_PAGE_SIZE
+from schemas.inventory_schema import (
+    Inventory,
+    InventoryCreate,
+    InventoryUpdate,
+    InventoryFilter,
+    InventoryBulkCreate,
+    InventoryBulkResult,
+    InventoryImportStatus,
+    InventoryAdjust,
+    InventoryBatchAdjust,
+    InventoryBatchAdjustResult,
+    InventoryBatchGet,
+    InventoryBatchResult,
+    InventorySummaryRow,
+    InventorySearchResult
+)
 from crud.inventory_crud import (
-    create_inventory_item,
-    get_inventory_item_by_id,
-    get_all_inventory_items,
-    update_inventory_item,
-    delete_inventory_item
+    SearchIndexNotReadyError,
+    StockAdjustmentError,
+    VersionConflictError,
+    adjust_inventory_quantity_async,
+    adjust_inventory_quantities_async,
+    INVENTORY_EXPORT_FIELDS,
+    INVENTORY_LISTING_COLUMNS,
+    encode_inventory_rows,
+    stream_inventory_rows_async,
+    validate_inventory_rows,
+    bulk_create_inventory_items_async,
+    create_inventory_item_async,
+    get_inventory_item_by_id_async,
+    get_inventory_items_by_ids_async,
+    get_inventory_item_version_async,
+    get_inventory_page_versions_async,
+    get_inventory_rows_async,
+    get_inventory_next_cursor,
+    search_inventory_items_async,
+    update_inventory_item_async,
+    delete_inventory_item_async
 )
+from crud.inventory_summary_crud import get_inventory_summary_async
+from crud.inventory_import import IMPORT_JOB_TYPE, import_job_status, import_upload_path
+from crud.job_crud import create_job_async, get_job_async
+import crud.job_tasks  # noqa: F401  (registers the inventory_import job type)
 
 router = APIRouter(
     prefix="/inventory",
     tags=["inventory"]
 )
 
+def _parse_ids(ids: str) -> List[int]:
+    """Parse a comma-separated ID list such as ``1,2,3``."""
+    try:
+        return [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers, e.g. ids=1,2,3"
+        )
+
 @router.post("/", response_model=Inventory, status_code=status.HTTP_201_CREATED)
 async def create_inventory(
     inventory_item: InventoryCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new inventory item."""
     try:
-        return create_inventory_item(db=db, inventory_item=inventory_item)
+        return await create_inventory_item_async(db=db, inventory_item=inventory_item)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create inventory item: {str(e)}"
         )
 
-@router.get("/", response_model=List[Inventory])
+@router.post("/bulk", response_model=InventoryBulkResult)
+async def bulk_create_inventory(
+    bulk_request: InventoryBulkCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create (or upsert) many inventory items in one transaction.
+    
+    Invalid rows are reported in ``errors`` and skipped; valid rows are written
+    with multi-row INSERTs in chunks of ``chunk_size``.
+    """
+    valid, errors = validate_inventory_rows(bulk_request.items)
+    ids = [None] * len(bulk_request.items)
+    created = updated = 0
+    
+    try:
+        if valid:
+            new_ids, created, updated = await bulk_create_inventory_items_async(
+                db=db,
+                items=[item for _, item in valid],
+                upsert=bulk_request.upsert,
+                chunk_size=bulk_request.chunk_size
+            )
+            for (index, _), item_id in zip(valid, new_ids):
+                ids[index] = item_id
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to bulk create inventory items: {str(e)}"
+        )
+    
+    return {"ids": ids, "created": created, "updated": updated, "errors": errors}
+
+def _spool_upload(upload: UploadFile) -> Tuple[str, int]:
+    """Copy an upload into JOB_OUTPUT_DIR in fixed-size blocks; return its file name and size."""
+    path = job_output_path(f"inventory-import-{uuid.uuid4().hex}", "csv")
+    with open(path, "wb") as spooled:
+        shutil.copyfileobj(upload.file, spooled, 1024 * 1024)
+        return os.path.basename(path), spooled.tell()
+
+@router.post("/import", response_model=InventoryImportStatus, status_code=status.HTTP_202_ACCEPTED)
+async def import_inventory(
+    file: UploadFile = File(..., description="CSV file whose header names InventoryCreate fields"),
+    upsert: bool = Form(False),
+    chunk_size: int = Form(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import inventory items from an uploaded CSV file.
+    
+    The file is stored in JOB_OUTPUT_DIR and imported in committed chunks by
+    an ``inventory_import`` background job, which any worker may claim, so
+    with several hosts the directory has to be shared; poll
+    ``GET /inventory/import/{job_id}`` for progress.
+    """
+    try:
+        name, size = await run_in_threadpool(_spool_upload, file)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to receive import file: {str(e)}"
+        )
+    
+    params = {"file": name, "total_bytes": size, "upsert": upsert, "chunk_size": chunk_size}
+    try:
+        job = await create_job_async(db=db, job_type=IMPORT_JOB_TYPE, params=params)
+    except Exception as e:
+        os.remove(import_upload_path(name))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to queue import: {str(e)}"
+        )
+    get_job_runner().wake()
+    return import_job_status(job)
+
+@router.get("/import/{job_id}", response_model=InventoryImportStatus, dependencies=[Depends(query_budget(1))])
+async def get_import_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the status and progress of an inventory import job.
+    
+    Read from the primary, so a job is visible right after it is submitted.
+    """
+    try:
+        job = await get_job_async(db=db, job_id=job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve import job: {str(e)}"
+        )
+    if job is None or job.job_type != IMPORT_JOB_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job with ID {job_id} not found"
+        )
+    return import_job_status(job)
+
+def _stock_adjustment_http_error(error: StockAdjustmentError) -> HTTPException:
+    """Map a rejected stock adjustment to 404 (missing items) or 409 (insufficient stock)."""
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND if error.missing else status.HTTP_409_CONFLICT,
+        detail={
+            "message": "Stock adjustment rejected",
+            "missing": error.missing,
+            "insufficient": error.insufficient
+        }
+    )
+
+@router.post("/adjust", response_model=InventoryBatchAdjustResult)
+async def adjust_inventory_batch(
+    batch: InventoryBatchAdjust,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atomically adjust the stock of many items in one statement.
+    
+    The batch is all-or-nothing: if any item is missing or would go below
+    zero, no adjustment is applied.
+    """
+    try:
+        adjusted = await adjust_inventory_quantities_async(
+            db=db, adjustments=[(adjustment.id, adjustment.delta) for adjustment in batch.adjustments]
+        )
+        return {"adjusted": adjusted}
+    except StockAdjustmentError as e:
+        raise _stock_adjustment_http_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to adjust inventory items: {str(e)}"
+        )
+
+@router.post("/{item_id}/adjust", response_model=Inventory)
+async def adjust_inventory(
+    item_id: int,
+    adjustment: InventoryAdjust,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Atomically add a (possibly negative) delta to an item's stock quantity."""
+    try:
+        return await adjust_inventory_quantity_async(db=db, item_id=item_id, delta=adjustment.delta)
+    except StockAdjustmentError as e:
+        raise _stock_adjustment_http_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to adjust inventory item: {str(e)}"
+        )
+
+# Keys of the listing rows; INVENTORY_LISTING_COLUMNS follow the Inventory schema's field order
+INVENTORY_LISTING_FIELDS = tuple(column.key for column in INVENTORY_LISTING_COLUMNS)
+
+def _listing_json(rows: List[Tuple[Any, ...]]) -> bytes:
+    """Encode listing rows as the JSON the Inventory response model would produce."""
+    fields = INVENTORY_LISTING_FIELDS
+    return orjson.dumps([dict(zip(fields, row)) for row in rows])
+
+def _listing_etag(rows: List[Tuple[Any, ...]]) -> str:
+    """Entity tag of a listing page: its rows' IDs and versions, in order."""
+    return make_etag((row.id, row.version) for row in rows)
+
+@router.get("/", response_model=List[Inventory], dependencies=[Depends(query_budget(2))])
 async def get_inventory_items(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order_by: str = "id",
+    filters: InventoryFilter = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get inventory items with optional filtering, sorting and pagination.
+    
+    Filter by item_type, location, unit and quantity/price ranges; sort with
+    ``order_by`` (e.g. ``-quantity``). Pass the X-Next-Cursor response header
+    back as ``after`` with the same filters to fetch the next page with
+    keyset pagination; ``skip`` is kept for older clients.
+    
+    The ETag header covers the IDs and versions of the page's items; send it
+    back in If-None-Match to get 304 Not Modified while the page is unchanged.
+    """
+    # Fast path: plain column rows encoded by orjson. Returning a Response
+    # skips FastAPI's validation and serialization; response_model still
+    # documents the schema.
+    try:
+        if if_none_match:
+            versions = await get_inventory_page_versions_async(
+                db=db, skip=skip, limit=limit, after=after, order_by=order_by, filters=filters
+            )
+            etag = _listing_etag(versions)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        
+        rows = await get_inventory_rows_async(
+            db=db, skip=skip, limit=limit, after=after, order_by=order_by, filters=filters
+        )
+        headers = {"ETag": _listing_etag(rows)}
+        cursor = get_inventory_next_cursor(rows, limit, order_by)
+        if cursor:
+            headers["X-Next-Cursor"] = cursor
+        return Response(content=_listing_json(rows), media_type="application/json", headers=headers)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve inventory items: {str(e)}"
+        )
+
+async def _export_inventory(export_format: str, batch_size: int) -> AsyncIterator[str]:
+    """Yield the encoded inventory export batch by batch over its own session."""
+    if export_format == "csv":
+        yield encode_inventory_rows([tuple(INVENTORY_EXPORT_FIELDS)], export_format)
+    
+    async with async_session_scope(read_only=True) as db:
+        async for rows in stream_inventory_rows_async(db, batch_size=batch_size):
+            yield encode_inventory_rows(rows, export_format)
+
+@router.get("/export")
+async def export_inventory(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(1000, ge=1, le=10000)
+):
+    """
+    Export the full inventory as NDJSON or CSV.
+    
+    Rows are streamed from a server-side cursor, so memory stays flat and the
+    first bytes are sent before the query finishes.
+    """
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_inventory(export_format, batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="inventory.{export_format}"'}
+    )
+
+def _parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Parse an If-Match header carrying an inventory item version.
+    
+    Accepts ``"3"``, ``W/"3"`` or ``3``; ``*`` or a missing header means any version.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must carry the item version, e.g. If-Match: \"3\""
+        )
+
+def _version_conflict_http_error(error: VersionConflictError) -> HTTPException:
+    """Map a version conflict to 412 Precondition Failed."""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail=str(error),
+        headers={"ETag": f'"{error.current_version}"'}
+    )
+
+@router.get("/summary", response_model=List[InventorySummaryRow], dependencies=[Depends(query_budget(1))])
+async def get_inventory_summary(
+    group_by: Optional[str] = Query(None, pattern="^(item_type|location)$"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get stock value and total weight per item type and location.
+    
+    Served from the incrementally maintained summary table, so the cost
+    depends on the number of groups rather than the number of items.
+    """
+    try:
+        return await get_inventory_summary_async(db=db, group_by=group_by)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve inventory summary: {str(e)}"
+        )
+
+@router.get("/search", response_model=List[InventorySearchResult], dependencies=[Depends(query_budget(2))])
+async def search_inventory(
+    q: str = Query(..., min_length=1, max_length=200),
+    fields: List[str] = Query(["item_name"]),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get all inventory items with optional pagination."""
+    """
+    Search inventory items by partial name, best matches first.
+    
+    Matching is done on an in-memory trigram index, so it is insensitive to
+    case, Arabic diacritics, tatweel and letter variants (e.g. أ/إ/آ and ة/ه).
+    Pass ``fields`` to also search item_type and location. Until the index
+    has been built the search answers 503 with a Retry-After header.
+    """
     try:
-        return get_all_inventory_items(db=db, skip=skip, limit=limit)
+        hits = await search_inventory_items_async(db=db, query=q, fields=fields, limit=limit)
+        return [{"score": score, "item": item} for item, score in hits]
+    except SearchIndexNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(SEARCH_INDEX_RETRY_SECONDS)))}
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search inventory items: {str(e)}"
+        )
+
+async def _get_inventory_batch(db: AsyncSession, item_ids: List[int]) -> Dict[str, Any]:
+    """Fetch a batch of items by ID, keyed by ID, with the IDs that were not found."""
+    if len(item_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_SIZE} ids can be requested at once"
+        )
+    try:
+        found = await get_inventory_items_by_ids_async(db=db, item_ids=item_ids)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve inventory items: {str(e)}"
         )
+    requested = list(dict.fromkeys(item_ids))
+    return {
+        "items": {item_id: found[item_id] for item_id in requested if item_id in found},
+        "missing": [item_id for item_id in requested if item_id not in found],
+    }
+
+@router.get("/batch", response_model=InventoryBatchResult, dependencies=[Depends(query_budget(1))])
+async def get_inventory_batch(
+    ids: str = Query(..., description="Comma-separated inventory item IDs, e.g. ids=1,2,3"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get many inventory items by ID in one request.
+    
+    Items are served from the inventory cache and the misses fetched with
+    one IN query. The result is keyed by ID in request order; IDs with no
+    item are listed in ``missing``. Use POST /inventory/batch for lists too
+    long for a URL.
+    """
+    return await _get_inventory_batch(db, _parse_ids(ids))
+
+@router.post("/batch", response_model=InventoryBatchResult, dependencies=[Depends(query_budget(1))])
+async def post_inventory_batch(
+    batch: InventoryBatchGet,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get many inventory items by ID, with the IDs in the request body.
+    
+    Same result as GET /inventory/batch.
+    """
+    return await _get_inventory_batch(db, batch.ids)
 
-@router.get("/{item_id}", response_model=Inventory)
+@router.get("/{item_id}", response_model=Inventory, dependencies=[Depends(query_budget(2))])
 async def get_inventory_item(
     item_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get a specific inventory item by ID."""
+    """
+    Get a specific inventory item by ID; the ETag header carries its version.
+    
+    Send the ETag back in If-None-Match to get 304 Not Modified while the
+    item is unchanged.
+    """
     try:
-        inventory_item = get_inventory_item_by_id(db=db, item_id=item_id)
+        if if_none_match:
+            version = await get_inventory_item_version_async(db=db, item_id=item_id)
+            if version is not None and etag_matches(if_none_match, f'"{version}"'):
+                return not_modified(f'"{version}"')
+        
+        inventory_item = await get_inventory_item_by_id_async(db=db, item_id=item_id)
         if inventory_item is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Inventory item with ID {item_id} not found"
             )
+        response.headers["ETag"] = f'"{inventory_item.version}"'
         return inventory_item
     except HTTPException:
         raise
@@ -75,19 +499,34 @@ async def get_inventory_item(
 async def update_inventory(
     item_id: int,
     inventory_update: InventoryUpdate,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Update an existing inventory item."""
+    """
+    Update an existing inventory item.
+    
+    Send the item's version in If-Match to get 412 instead of overwriting a
+    concurrent edit.
+    """
     try:
-        updated_item = update_inventory_item(db=db, item_id=item_id, inventory_update=inventory_update)
+        updated_item = await update_inventory_item_async(
+            db=db,
+            item_id=item_id,
+            inventory_update=inventory_update,
+            expected_version=_parse_if_match(if_match)
+        )
         if updated_item is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Inventory item with ID {item_id} not found"
             )
+        response.headers["ETag"] = f'"{updated_item.version}"'
         return updated_item
     except HTTPException:
         raise
+    except VersionConflictError as e:
+        raise _version_conflict_http_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -97,11 +536,14 @@ async def update_inventory(
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_inventory(
     item_id: int,
-    db: Session = Depends(get_db)
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Delete an inventory item."""
+    """Delete an inventory item, optionally guarded by an If-Match version."""
     try:
-        success = delete_inventory_item(db=db, item_id=item_id)
+        success = await delete_inventory_item_async(
+            db=db, item_id=item_id, expected_version=_parse_if_match(if_match)
+        )
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -109,8 +551,10 @@ async def delete_inventory(
             )
     except HTTPException:
         raise
+    except VersionConflictError as e:
+        raise _version_conflict_http_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete inventory item: {str(e)}"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,219 @@
+"""
+Invoice router for handling invoice-related API endpoints.
+"""
+
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_async_read_db, query_budget
+from etags import etag_matches, make_etag, not_modified
+from schemas.limits import MAX_PAGE_SIZE
+from schemas.invoice_schema import Invoice, InvoiceCreate, InvoiceHeader
+from schemas.zatca_schema import ZatcaBatchResult, ZatcaDocument, ZatcaIssueRequest
+from crud.invoice_crud import (
+    create_invoice_async,
+    get_invoice_async,
+    get_invoice_version_async,
+    get_invoice_page_versions_async,
+    get_invoices_async,
+    get_invoices_next_cursor,
+    invoice_etag_parts
+)
+from crud.zatca_crud import get_zatca_document_async, issue_zatca_documents_async
+
+router = APIRouter(
+    prefix="/invoices",
+    tags=["invoices"]
+)
+
+# Maximum number of invoices issued per batch request
+MAX_ZATCA_BATCH = 500
+
+async def _issue_zatca_documents(db: AsyncSession, invoice_ids: List[int]):
+    """Issue documents, mapping chain conflicts to 409 and other failures to 500."""
+    try:
+        return await issue_zatca_documents_async(db=db, invoice_ids=invoice_ids)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another request issued ZATCA documents at the same time; retry the request"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to issue ZATCA documents: {str(e)}"
+        )
+
+@router.post("/", response_model=Invoice, status_code=status.HTTP_201_CREATED)
+async def create_invoice(
+    invoice_in: InvoiceCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new invoice with its line items.
+    
+    Line totals, total amount, VAT and total with VAT are computed on the
+    server; the header and all lines are written in one transaction.
+    """
+    try:
+        return await create_invoice_async(db=db, invoice_in=invoice_in)
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid invoice reference (does customer {invoice_in.customer_id} exist?): {str(e.orig)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create invoice: {str(e)}"
+        )
+
+@router.get("/", response_model=List[Union[Invoice, InvoiceHeader]], dependencies=[Depends(query_budget(4))])
+async def get_invoices(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order_by: str = "id",
+    include: Optional[str] = Query(None, pattern="^items$", description="Pass 'items' to embed invoice items"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get invoices with optional pagination.
+    
+    Headers only by default; ``include=items`` loads the items of the whole
+    page with one extra query. Pass the X-Next-Cursor response header back
+    as ``after`` to fetch the next page. Send the ETag header back in
+    If-None-Match to get 304 Not Modified while the page is unchanged.
+    """
+    include_items = include == "items"
+    try:
+        if if_none_match:
+            versions = await get_invoice_page_versions_async(
+                db=db, skip=skip, limit=limit, after=after, order_by=order_by
+            )
+            etag = make_etag([include_items, *versions])
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        
+        invoices = await get_invoices_async(
+            db=db, skip=skip, limit=limit, after=after, order_by=order_by, include_items=include_items
+        )
+        response.headers["ETag"] = make_etag([include_items, *invoice_etag_parts(invoices)])
+        cursor = get_invoices_next_cursor(invoices, limit, order_by)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        schema = Invoice if include_items else InvoiceHeader
+        return [schema.model_validate(invoice) for invoice in invoices]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve invoices: {str(e)}"
+        )
+
+@router.get("/{invoice_id}", response_model=Invoice, dependencies=[Depends(query_budget(4))])
+async def get_invoice(
+    invoice_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a specific invoice by ID, including its items.
+    
+    Send the ETag header back in If-None-Match to get 304 Not Modified while
+    the invoice is unchanged.
+    """
+    try:
+        if if_none_match:
+            version = await get_invoice_version_async(db=db, invoice_id=invoice_id)
+            if version is not None:
+                etag = make_etag([version])
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+        
+        invoice = await get_invoice_async(db=db, invoice_id=invoice_id)
+        if invoice is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Invoice with ID {invoice_id} not found"
+            )
+        response.headers["ETag"] = make_etag(invoice_etag_parts([invoice]))
+        return invoice
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve invoice: {str(e)}"
+        )
+
+
+@router.post("/zatca", response_model=ZatcaBatchResult)
+async def issue_zatca_documents(
+    batch: ZatcaIssueRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Issue the ZATCA e-invoice documents (UBL XML, QR code) of many invoices.
+    
+    New documents continue the invoice hash chain in order of issue date and
+    are rendered in parallel on the ZATCA process pool. Invoices issued
+    before return their stored document unchanged. IDs with no invoice are
+    listed in ``missing``.
+    """
+    if len(batch.invoice_ids) > MAX_ZATCA_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ZATCA_BATCH} invoices can be issued at once"
+        )
+    documents, missing = await _issue_zatca_documents(db, batch.invoice_ids)
+    return {"documents": documents, "missing": missing}
+
+@router.post("/{invoice_id}/zatca", response_model=ZatcaDocument)
+async def issue_zatca_document(
+    invoice_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Issue the ZATCA e-invoice document of an invoice, or return the one issued before.
+    """
+    documents, missing = await _issue_zatca_documents(db, [invoice_id])
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Invoice with ID {invoice_id} not found"
+        )
+    return documents[0]
+
+@router.get("/{invoice_id}/zatca", response_model=ZatcaDocument, dependencies=[Depends(query_budget(1))])
+async def get_zatca_document(
+    invoice_id: int,
+    format: str = Query("json", pattern="^(json|xml)$", description="'xml' returns the UBL document itself"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get the issued ZATCA e-invoice document of an invoice.
+    """
+    try:
+        document = await get_zatca_document_async(db=db, invoice_id=invoice_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve ZATCA document: {str(e)}"
+        )
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No ZATCA document issued for invoice {invoice_id}"
+        )
+    if format == "xml":
+        return Response(content=document.xml, media_type="application/xml")
+    return document
@@ -0,0 +1,111 @@
+"""
+Job router for submitting background jobs and following their progress.
+"""
+
+import os
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, query_budget
+from jobs import JOB_OUTPUT_DIR, JOB_TYPES, get_job_runner
+from schemas.job_schema import Job, JobCreate
+from crud.job_crud import create_job_async, get_job_async
+import crud.job_tasks  # noqa: F401  (registers the built-in job types)
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
+@router.post("/", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    job_in: JobCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Queue a background job.
+    
+    The job runs on the background job runner of one of the API processes;
+    poll ``GET /jobs/{job_id}`` for its status and progress.
+    """
+    job_type = JOB_TYPES.get(job_in.job_type)
+    if job_type is None or not job_type.submittable:
+        supported = sorted(name for name, registered in JOB_TYPES.items() if registered.submittable)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported job_type '{job_in.job_type}'. Supported: {', '.join(supported)}"
+        )
+    try:
+        params = job_type.params_model(**job_in.params).model_dump(mode="json")
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", "params", *error["loc"])}
+            for error in jsonable_encoder(e.errors(include_url=False))
+        ])
+    
+    try:
+        job = await create_job_async(db=db, job_type=job_type.name, params=params)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit job: {str(e)}"
+        )
+    get_job_runner().wake()
+    return job
+
+async def _get_job_or_404(db: AsyncSession, job_id: str):
+    """Fetch a job, raising 404 if it does not exist."""
+    try:
+        job = await get_job_async(db=db, job_id=job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve job: {str(e)}"
+        )
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found"
+        )
+    return job
+
+@router.get("/{job_id}", response_model=Job, dependencies=[Depends(query_budget(1))])
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the status, progress and result of a background job.
+    
+    Read from the primary, so a job is visible right after it is submitted.
+    """
+    return await _get_job_or_404(db, job_id)
+
+@router.get("/{job_id}/output", dependencies=[Depends(query_budget(1))])
+async def get_job_output(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Download the file produced by a completed job, such as an inventory export.
+    
+    Files are written to JOB_OUTPUT_DIR of the process that ran the job, so
+    with several hosts the directory has to be shared.
+    """
+    job = await _get_job_or_404(db, job_id)
+    if job.status != "completed" or not (job.result or {}).get("file"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} has no output (status: {job.status})"
+        )
+    
+    path = os.path.join(JOB_OUTPUT_DIR, os.path.basename(job.result["file"]))
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Output of job {job_id} is no longer available"
+        )
+    return FileResponse(path, media_type=job.result.get("media_type"), filename=job.result["file"])
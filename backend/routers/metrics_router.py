@@ -0,0 +1,14 @@
+"""
+Metrics router exposing request and database metrics to Prometheus.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Get per-route latency and per-request database histograms in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
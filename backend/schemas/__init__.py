@@ -5,26 +5,87 @@ This package contains all the Pydantic schemas used throughout the
 Amanat Al-Kalima Company ERP API for request/response validation.
 """
 
-from .inventory_schema import InventoryCreate, InventoryUpdate, Inventory
+from .customer_schema import (
+    CustomerCreate,
+    CustomerUpdate,
+    Customer
+)
+from .inventory_schema import (
+    InventoryCreate,
+    InventoryUpdate,
+    Inventory,
+    InventoryFilter,
+    InventoryBulkCreate,
+    InventoryBulkRowError,
+    InventoryBulkResult,
+    InventoryImportStatus,
+    InventoryAdjust,
+    InventoryAdjustItem,
+    InventoryBatchAdjust,
+    InventoryBatchAdjustResult,
+    InventoryBatchGet,
+    InventoryBatchResult,
+    InventorySummaryRow,
+    InventorySearchResult
+)
 from .invoice_schema import (
     InvoiceItemBase,
     InvoiceItemCreate,
     InvoiceItem,
     InvoiceBase,
     InvoiceCreate,
+    InvoiceUpdate,
+    InvoiceHeader,
     Invoice
 )
+from .zatca_schema import (
+    ZatcaIssueRequest,
+    ZatcaDocument,
+    ZatcaBatchResult
+)
+from .job_schema import (
+    JobCreate,
+    Job,
+    InventoryExportJobParams
+)
 
 __all__ = [
+    # Customer schemas
+    "CustomerCreate",
+    "CustomerUpdate",
+    "Customer",
     # Inventory schemas
     "InventoryCreate",
     "InventoryUpdate", 
     "Inventory",
+    "InventoryFilter",
+    "InventoryBulkCreate",
+    "InventoryBulkRowError",
+    "InventoryBulkResult",
+    "InventoryImportStatus",
+    "InventoryAdjust",
+    "InventoryAdjustItem",
+    "InventoryBatchAdjust",
+    "InventoryBatchAdjustResult",
+    "InventoryBatchGet",
+    "InventoryBatchResult",
+    "InventorySummaryRow",
+    "InventorySearchResult",
     # Invoice schemas
     "InvoiceItemBase",
     "InvoiceItemCreate",
     "InvoiceItem",
     "InvoiceBase",
     "InvoiceCreate",
+    "InvoiceUpdate",
+    "InvoiceHeader",
     "Invoice",
+    # ZATCA schemas
+    "ZatcaIssueRequest",
+    "ZatcaDocument",
+    "ZatcaBatchResult",
+    # Job schemas
+    "JobCreate",
+    "Job",
+    "InventoryExportJobParams",
 ]
\ No newline at end of file
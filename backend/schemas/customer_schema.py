@@ -0,0 +1,47 @@
+"""
+Customer schemas for the Customer Management module.
+
+This module defines Pydantic schemas for customer-related operations
+including creation, updates, and response models.
+"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class CustomerCreate(BaseModel):
+    """
+    Schema for creating a new customer.
+    """
+    
+    name: str = Field(..., min_length=1, max_length=255, description="Customer or company name")
+    vat_number: Optional[str] = Field(None, min_length=15, max_length=15, description="15-digit VAT registration number")
+    email: Optional[str] = Field(None, max_length=255, description="Contact email address")
+    phone: Optional[str] = Field(None, max_length=50, description="Contact phone number")
+    address: Optional[str] = Field(None, max_length=500, description="Postal address")
+
+
+class CustomerUpdate(BaseModel):
+    """
+    Schema for updating an existing customer.
+    
+    All fields are optional to allow partial updates.
+    """
+    
+    name: Optional[str] = Field(None, min_length=1, max_length=255, description="Customer or company name")
+    vat_number: Optional[str] = Field(None, min_length=15, max_length=15, description="15-digit VAT registration number")
+    email: Optional[str] = Field(None, max_length=255, description="Contact email address")
+    phone: Optional[str] = Field(None, max_length=50, description="Contact phone number")
+    address: Optional[str] = Field(None, max_length=500, description="Postal address")
+
+
+class Customer(CustomerCreate):
+    """
+    Schema for customer response.
+    """
+    
+    id: int = Field(..., description="Primary key identifier for the customer")
+    
+    class Config:
+        """Pydantic configuration for the Customer schema."""
+        from_attributes = True  # Enables compatibility with SQLAlchemy models
@@ -5,8 +5,10 @@ This module defines Pydantic schemas for inventory-related operations
 including creation, updates, and response models.
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
+from schemas.limits import MAX_BATCH_SIZE
 
 
 class InventoryCreate(BaseModel):
@@ -58,7 +60,154 @@ class Inventory(BaseModel):
     unit: str = Field(..., description="Unit of measurement (e.g., 'kg', 'ton', 'lbs')")
     purchase_price: float = Field(..., description="Purchase price of the item")
     location: str = Field(..., description="Storage location of the item")
+    version: int = Field(..., description="Row version, incremented on every write; send it back in If-Match")
     
     class Config:
         """Pydantic configuration for the Inventory schema."""
-        from_attributes = True  # Enables compatibility with SQLAlchemy models
\ No newline at end of file
+        from_attributes = True  # Enables compatibility with SQLAlchemy models
+
+
+class InventoryFilter(BaseModel):
+    """
+    Schema for filters on inventory listings.
+    
+    All fields are optional; given filters are combined with AND and ranges
+    are inclusive.
+    """
+    
+    item_type: Optional[str] = Field(None, max_length=100, description="Only items of this type")
+    location: Optional[str] = Field(None, max_length=255, description="Only items stored at this location")
+    unit: Optional[str] = Field(None, max_length=20, description="Only items measured in this unit")
+    min_quantity: Optional[float] = Field(None, description="Minimum quantity in stock")
+    max_quantity: Optional[float] = Field(None, description="Maximum quantity in stock")
+    min_price: Optional[float] = Field(None, description="Minimum purchase price")
+    max_price: Optional[float] = Field(None, description="Maximum purchase price")
+
+
+class InventoryBulkCreate(BaseModel):
+    """
+    Schema for a bulk inventory create/upsert request.
+    
+    Rows are validated individually against InventoryCreate so that one bad
+    row is reported instead of rejecting the whole request.
+    """
+    
+    items: List[Dict[str, Any]] = Field(..., description="Inventory rows, each following the InventoryCreate schema")
+    upsert: bool = Field(default=False, description="Update existing rows matching on (item_name, location) instead of inserting duplicates")
+    chunk_size: int = Field(default=500, ge=1, le=5000, description="Number of rows written per multi-row statement")
+
+
+class InventoryBulkRowError(BaseModel):
+    """
+    Schema for a validation error on one row of a bulk request.
+    """
+    
+    index: int = Field(..., description="Position of the row in the request items list")
+    errors: List[str] = Field(..., description="Validation error messages for the row")
+
+
+class InventoryBulkResult(BaseModel):
+    """
+    Schema for the result of a bulk inventory create/upsert request.
+    """
+    
+    ids: List[Optional[int]] = Field(..., description="Inventory ID per request row, null for rows that failed validation")
+    created: int = Field(..., description="Number of rows inserted")
+    updated: int = Field(..., description="Number of existing rows updated (upsert mode)")
+    errors: List[InventoryBulkRowError] = Field(default=[], description="Per-row validation errors")
+
+
+class InventoryImportStatus(BaseModel):
+    """
+    Schema for the status and progress of a CSV inventory import job.
+    """
+    
+    id: str = Field(..., description="Import job identifier")
+    status: str = Field(..., description="Job status ('pending', 'running', 'completed', 'failed')")
+    progress: float = Field(..., description="Fraction of the file processed, between 0.0 and 1.0")
+    upsert: bool = Field(..., description="Whether rows are upserted on (item_name, location)")
+    chunk_size: int = Field(..., description="Rows committed per chunk")
+    total_bytes: int = Field(..., description="Size of the uploaded file in bytes")
+    bytes_read: int = Field(..., description="Bytes of the file processed so far")
+    rows_processed: int = Field(..., description="Data rows read so far")
+    rows_created: int = Field(..., description="Rows inserted so far")
+    rows_updated: int = Field(..., description="Rows updated so far (upsert mode)")
+    rows_failed: int = Field(..., description="Rows rejected by validation so far")
+    errors: List[Dict[str, Any]] = Field(default=[], description="Row errors by CSV line number (capped)")
+    error: Optional[str] = Field(None, description="Fatal error that stopped the import")
+    created_at: datetime = Field(..., description="When the job was accepted")
+    finished_at: Optional[datetime] = Field(None, description="When the job completed or failed")
+
+
+class InventoryAdjust(BaseModel):
+    """
+    Schema for adjusting the stock quantity of one inventory item.
+    """
+    
+    delta: float = Field(..., description="Quantity to add; negative values remove stock")
+
+
+class InventoryAdjustItem(BaseModel):
+    """
+    Schema for one entry of a batch stock adjustment.
+    """
+    
+    id: int = Field(..., description="ID of the inventory item to adjust")
+    delta: float = Field(..., description="Quantity to add; negative values remove stock")
+
+
+class InventoryBatchAdjust(BaseModel):
+    """
+    Schema for a batch stock adjustment, applied all-or-nothing.
+    """
+    
+    adjustments: List[InventoryAdjustItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE, description="Adjustments to apply")
+
+
+class InventoryBatchAdjustResult(BaseModel):
+    """
+    Schema for the result of a batch stock adjustment.
+    """
+    
+    adjusted: List[int] = Field(..., description="IDs of the adjusted inventory items")
+
+
+class InventoryBatchGet(BaseModel):
+    """
+    Schema for fetching many inventory items by ID in one request.
+    """
+    
+    ids: List[int] = Field(..., description="IDs of the inventory items to fetch")
+
+
+class InventoryBatchResult(BaseModel):
+    """
+    Schema for the result of a batch lookup by ID.
+    """
+    
+    items: Dict[int, Inventory] = Field(..., description="Found inventory items keyed by ID, in request order")
+    missing: List[int] = Field(..., description="Requested IDs with no inventory item")
+
+
+class InventorySummaryRow(BaseModel):
+    """
+    Schema for one stock rollup row of the inventory summary.
+    
+    item_type or location is null when the rollup is grouped by the other one.
+    """
+    
+    item_type: Optional[str] = Field(None, description="Type/category of the inventory items")
+    location: Optional[str] = Field(None, description="Storage location of the inventory items")
+    item_count: int = Field(..., description="Number of inventory items in the group")
+    total_quantity: float = Field(..., description="Sum of item quantities")
+    total_weight: float = Field(..., description="Sum of item weights")
+    stock_value: float = Field(..., description="Sum of quantity * purchase_price")
+
+
+class InventorySearchResult(BaseModel):
+    """
+    Schema for one ranked inventory search hit.
+    """
+    
+    score: float = Field(..., description="Relevance score; higher is a better match")
+    item: Inventory = Field(..., description="The matching inventory item")
@@ -73,20 +73,49 @@ class InvoiceCreate(InvoiceBase):
     items: List[InvoiceItemCreate] = Field(default=[], description="List of invoice items")
 
 
-class Invoice(InvoiceBase):
+class InvoiceUpdate(BaseModel):
     """
-    Schema for invoice response.
+    Schema for updating an existing invoice header.
     
-    This schema represents the complete invoice as returned by the API,
-    including all calculated financial totals and the list of invoice items.
+    All fields are optional to allow partial updates. Line items and the
+    financial totals derived from them are not editable through this schema.
+    """
+    
+    customer_id: Optional[int] = Field(None, gt=0, description="Foreign key reference to the customer")
+    invoice_issue_date: Optional[datetime] = Field(None, description="Date when the invoice was issued")
+    due_date: Optional[datetime] = Field(None, description="Due date for payment")
+    status: Optional[str] = Field(None, min_length=1, max_length=50, description="Invoice status (e.g., 'Draft', 'Sent', 'Paid')")
+
+
+class InvoiceHeader(InvoiceBase):
+    """
+    Schema for invoice header response.
+    
+    This schema represents an invoice with its calculated financial totals
+    but without its line items, as returned by header-only listings.
     """
     
     id: int = Field(..., description="Primary key identifier for the invoice")
     total_amount: float = Field(..., description="Total amount before VAT")
     vat_amount: float = Field(..., description="VAT amount")
     total_amount_with_vat: float = Field(..., description="Total amount including VAT")
+    customer_name: Optional[str] = Field(None, description="Name of the customer, resolved from the customer directory")
+    
+    class Config:
+        """Pydantic configuration for the InvoiceHeader schema."""
+        from_attributes = True  # Enables compatibility with SQLAlchemy models
+
+
+class Invoice(InvoiceHeader):
+    """
+    Schema for invoice response.
+    
+    This schema represents the complete invoice as returned by the API,
+    including all calculated financial totals and the list of invoice items.
+    """
+    
     items: List[InvoiceItem] = Field(default=[], description="List of invoice items")
     
     class Config:
         """Pydantic configuration for the Invoice schema."""
-        from_attributes = True  # Enables compatibility with SQLAlchemy models
\ No newline at end of file
+        from_attributes = True  # Enables compatibility with SQLAlchemy models
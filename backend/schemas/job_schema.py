@@ -0,0 +1,61 @@
+"""
+Background job schemas for the job runner.
+
+This module defines Pydantic schemas for submitting background jobs, the
+parameters of the built-in job types that have no request schema and the job status returned to clients.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class JobCreate(BaseModel):
+    """
+    Schema for submitting a background job.
+    """
+    
+    job_type: str = Field(..., description="Registered job type, e.g. zatca_issue or inventory_export")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Parameters of the job type")
+
+
+class Job(BaseModel):
+    """
+    Schema for the status of a background job.
+    """
+    
+    id: str = Field(..., description="Job ID")
+    job_type: str = Field(..., description="Job type")
+    status: str = Field(..., description="'pending', 'running', 'completed' or 'failed'")
+    params: Dict[str, Any] = Field(..., description="Job parameters")
+    progress: float = Field(..., description="Fraction of the work done, between 0.0 and 1.0")
+    result: Optional[Dict[str, Any]] = Field(None, description="What the job produced, or its checkpoint while running")
+    error: Optional[str] = Field(None, description="Why the job failed")
+    attempts: int = Field(..., description="Number of times the job was started")
+    created_at: datetime = Field(..., description="When the job was submitted")
+    started_at: Optional[datetime] = Field(None, description="When the job was last started")
+    finished_at: Optional[datetime] = Field(None, description="When the job completed or failed")
+    
+    class Config:
+        """Pydantic configuration for the Job schema."""
+        from_attributes = True  # Enables compatibility with SQLAlchemy models
+
+
+class InventoryExportJobParams(BaseModel):
+    """
+    Parameters of an inventory_export job.
+    """
+    
+    format: Literal["ndjson", "csv"] = Field("ndjson", description="Export file format")
+    batch_size: int = Field(1000, ge=1, le=10000, description="Rows fetched per batch")
+
+
+class InventoryImportJobParams(BaseModel):
+    """
+    Parameters of an inventory_import job, queued by ``POST /inventory/import``.
+    """
+    
+    file: str = Field(..., description="Name of the uploaded CSV file in JOB_OUTPUT_DIR")
+    total_bytes: int = Field(..., ge=0, description="Size of the uploaded file")
+    upsert: bool = Field(False, description="Upsert rows on (item_name, location)")
+    chunk_size: int = Field(500, ge=1, le=5000, description="Rows committed per chunk")
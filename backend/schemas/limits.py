@@ -0,0 +1,10 @@
+"""
+Request size limits shared by the schemas and routers.
+"""
+
+# Maximum number of entries in one batch request: IDs of a batch lookup or
+# adjustments of a batch stock adjustment
+MAX_BATCH_SIZE = 1000
+
+# Maximum page size of a listing (limit query parameter)
+MAX_PAGE_SIZE = 1000
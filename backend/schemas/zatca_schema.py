@@ -0,0 +1,46 @@
+"""
+ZATCA document schemas for the ZATCA E-Invoicing module.
+
+This module defines Pydantic schemas for issuing e-invoice documents and
+returning them with their hash chain values.
+"""
+
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class ZatcaIssueRequest(BaseModel):
+    """
+    Schema for issuing the ZATCA documents of many invoices at once.
+    """
+    
+    invoice_ids: List[int] = Field(..., min_length=1, description="IDs of the invoices to issue documents for")
+
+
+class ZatcaDocument(BaseModel):
+    """
+    Schema for an issued ZATCA document.
+    """
+    
+    invoice_id: int = Field(..., description="ID of the invoice")
+    counter: int = Field(..., description="Invoice counter value (ICV), the document's position in the chain")
+    uuid: str = Field(..., description="Document UUID")
+    previous_hash: str = Field(..., description="Hash of the previous document in the chain (PIH), base64")
+    invoice_hash: str = Field(..., description="SHA-256 of the canonical document, base64")
+    qr_code: str = Field(..., description="Base64 TLV payload for the QR code")
+    xml: str = Field(..., description="UBL 2.1 invoice document")
+    issued_at: datetime = Field(..., description="When the document was issued")
+    
+    class Config:
+        """Pydantic configuration for the ZatcaDocument schema."""
+        from_attributes = True  # Enables compatibility with SQLAlchemy models
+
+
+class ZatcaBatchResult(BaseModel):
+    """
+    Schema for the result of a batch issue.
+    """
+    
+    documents: List[ZatcaDocument] = Field(..., description="Documents of the found invoices, in chain order")
+    missing: List[int] = Field(..., description="Requested IDs with no invoice")
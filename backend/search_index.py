@@ -0,0 +1,601 @@
+"""
+In-memory trigram search index for inventory items.
+
+This module provides fast partial-name lookups that a ``LIKE '%x%'`` query
+cannot serve from a B-tree index. Text is normalised (Arabic letter variants,
+diacritics, tatweel, Arabic-Indic digits, case) and split into trigrams; a
+query intersects the posting sets of its trigrams, starting from the rarest,
+and ranks the candidates. Queries shorter than three characters use a token
+prefix map instead.
+
+The index is built from the database at startup and kept current by the
+inventory CRUD write paths. It is local to the process, so writes made by
+other workers are applied by ``refresh_inventory_search_index``, which runs
+every ``SEARCH_INDEX_REFRESH_SECONDS``. The write paths log the IDs of the
+items they create, rename or delete in the ``inventory_changes`` table, in
+the same transaction, and a refresh reads only the entries logged since its
+previous run, re-indexing the items whose version changed and removing the
+ones that no longer exist.
+"""
+
+import gc
+import heapq
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from cache import LRUCache
+from database import utc_now
+from models.inventory_model import Inventory
+from models.inventory_change_model import InventoryChange
+
+logger = logging.getLogger(__name__)
+
+# Fields that can be indexed, with their ranking weights
+SEARCH_FIELDS = {"item_name": 1.0, "item_type": 0.6, "location": 0.4}
+
+# Posting lists larger than this are skipped when scoring fuzzy matches
+FUZZY_MAX_POSTING = 5000
+
+# Posting lists stop being intersected once this few candidates remain;
+# scoring checks that each candidate contains the query anyway
+MAX_INTERSECTED_CANDIDATES = 64
+
+# Search results kept per process; cleared whenever indexed text changes
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "256"))
+
+# Seconds between refreshes picking up other workers' writes; 0 disables them
+SEARCH_INDEX_REFRESH_SECONDS = float(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "30"))
+
+# Seconds between attempts to build an index that startup failed to build,
+# even with refreshes disabled; searches ask clients to retry after this long
+SEARCH_INDEX_RETRY_SECONDS = SEARCH_INDEX_REFRESH_SECONDS if SEARCH_INDEX_REFRESH_SECONDS > 0 else 30.0
+
+# Seconds of the change log a refresh reads again before its previous run;
+# must exceed the longest inventory write transaction plus the clock skew
+# between hosts, since an entry is stamped when written, not when committed
+SEARCH_CHANGE_LOOKBACK_SECONDS = float(os.getenv("SEARCH_CHANGE_LOOKBACK_SECONDS", "60"))
+
+# Seconds change log entries are kept; a worker that has not refreshed for
+# longer rebuilds its index instead
+SEARCH_CHANGE_RETENTION_SECONDS = float(os.getenv("SEARCH_CHANGE_RETENTION_SECONDS", "3600"))
+
+# Quranic marks, tashkeel (U+064B-U+065F), superscript alef and tatweel
+_ARABIC_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_ARABIC_LETTER_MAP = str.maketrans({
+    "أ": "ا",  # alef with hamza above -> alef
+    "إ": "ا",  # alef with hamza below -> alef
+    "آ": "ا",  # alef with madda -> alef
+    "ٱ": "ا",  # alef wasla -> alef
+    "ى": "ي",  # alef maksura -> yeh
+    "ئ": "ي",  # yeh with hamza -> yeh
+    "\u06cc": "ي",  # Farsi yeh -> yeh
+    "\u06a9": "ك",  # keheh -> kaf
+    "ؤ": "و",  # waw with hamza -> waw
+    "ة": "ه",  # teh marbuta -> heh
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # Arabic-Indic digits
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},  # Extended Arabic-Indic digits
+})
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise text for searching.
+
+    Applies NFKC, case folding, removes Arabic diacritics and tatweel, maps
+    Arabic letter variants to a base form and collapses whitespace.
+
+    Args:
+        text (str): Text to normalise
+
+    Returns:
+        str: Normalised text
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = _ARABIC_DIACRITICS.sub("", text).translate(_ARABIC_LETTER_MAP)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Split normalised text into trigrams, padded so word starts get their own grams.
+
+    Args:
+        text (str): Normalised text
+
+    Returns:
+        Set[str]: Trigrams of the text
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Trigram index over one text field.
+
+    Postings hold distinct normalised texts (terms) rather than documents,
+    so a field with few distinct values, such as a location, costs one
+    posting entry per value, and a query scores each matching text once.
+
+    Attributes:
+        texts (Dict[int, str]): Normalised text per document ID
+        terms (Dict[str, Union[int, Set[int]]]): Document ID per normalised
+            text, or the set of IDs when several documents share it
+        postings (Dict[str, Set[str]]): Terms per trigram
+        prefixes (Dict[str, Set[str]]): Terms per 1-2 character token prefix
+    """
+
+    def __init__(self):
+        self.texts: Dict[int, str] = {}
+        self.terms: Dict[str, Union[int, Set[int]]] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.prefixes: Dict[str, Set[str]] = defaultdict(set)
+
+    def _keys(self, text: str) -> Tuple[Set[str], Set[str]]:
+        """Trigrams and short token prefixes of a normalised text."""
+        prefixes = {token[:length] for token in text.split(" ") for length in (1, 2) if len(token) >= length}
+        return trigrams(text), prefixes
+
+    def add(self, doc_id: int, text: str) -> bool:
+        """Index (or re-index) a document; returns False if its text was already indexed."""
+        normalized = normalize_text(text)
+        if self.texts.get(doc_id) == normalized:
+            return False
+        self.remove(doc_id)
+        self.texts[doc_id] = normalized
+        docs = self.terms.get(normalized)
+        if isinstance(docs, set):
+            docs.add(doc_id)
+            return True
+        if docs is not None:
+            self.terms[normalized] = {docs, doc_id}
+            return True
+        self.terms[normalized] = doc_id
+        grams, prefixes = self._keys(normalized)
+        for gram in grams:
+            self.postings[gram].add(normalized)
+        for prefix in prefixes:
+            self.prefixes[prefix].add(normalized)
+        return True
+
+    def remove(self, doc_id: int) -> bool:
+        """Remove a document; returns False if it was not indexed."""
+        normalized = self.texts.pop(doc_id, None)
+        if normalized is None:
+            return False
+        docs = self.terms[normalized]
+        if isinstance(docs, set):
+            docs.discard(doc_id)
+            if len(docs) == 1:
+                self.terms[normalized] = docs.pop()
+            return True
+        del self.terms[normalized]
+        grams, prefixes = self._keys(normalized)
+        for keys, index in ((grams, self.postings), (prefixes, self.prefixes)):
+            for key in keys:
+                terms = index.get(key)
+                if terms is not None:
+                    terms.discard(normalized)
+                    if not terms:
+                        del index[key]
+        return True
+
+    def candidates(self, query: str) -> Set[str]:
+        """
+        Terms that may contain the query: those with all its trigrams, or a
+        token prefix for short queries. The rarest posting lists are
+        intersected first, until MAX_INTERSECTED_CANDIDATES or fewer remain.
+        """
+        if len(query) < 3:
+            return set(self.prefixes.get(query, ()))
+
+        # Unpadded grams, so the query may start or end mid-word
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        posting_lists = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        result = set(posting_lists[0])
+        for terms in posting_lists[1:]:
+            if len(result) <= MAX_INTERSECTED_CANDIDATES:
+                break
+            result &= terms
+        return result
+
+    def fuzzy_candidates(self, query: str, min_similarity: float) -> Dict[str, float]:
+        """Terms sharing at least min_similarity of the query's trigrams, with that share."""
+        grams = trigrams(query)
+        counts: Counter = Counter()
+        for gram in grams:
+            terms = self.postings.get(gram)
+            if terms and len(terms) <= FUZZY_MAX_POSTING:
+                counts.update(terms)
+        return {
+            term: count / len(grams)
+            for term, count in counts.items()
+            if count / len(grams) >= min_similarity
+        }
+
+    def collect(self, scored: List[Tuple[float, str]], limit: int, scores: Dict[int, float]) -> None:
+        """
+        Add the documents of the best ``limit`` scored terms to ``scores``, keeping each document's best score.
+
+        Only terms scoring at least as high as the limit-th best are expanded,
+        and at most ``limit`` documents (the lowest IDs) per term, which is
+        all the final ranking can use.
+        """
+        if len(scored) > limit:
+            cutoff = heapq.nlargest(limit, scored)[-1][0]
+            scored = [pair for pair in scored if pair[0] >= cutoff]
+        for score, term in scored:
+            docs = self.terms.get(term, ())
+            if isinstance(docs, int):
+                docs = (docs,)
+            for doc_id in docs if len(docs) <= limit else heapq.nsmallest(limit, docs):
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+
+
+def _match_score(query: str, text: str) -> float:
+    """
+    Rank a match: exact > prefix > word prefix > substring, shorter texts first.
+
+    A word starting with the Arabic article (ال) counts as a word prefix match.
+    """
+    position = text.find(query)
+    if position < 0:
+        return 0.0
+    if position == 0:
+        base = 4.0 if len(text) == len(query) else 3.0
+    elif (
+        text[position - 1] == " "
+        or f" {query}" in text
+        or text.startswith(f"ال{query}")
+        or f" ال{query}" in text
+    ):
+        base = 2.0
+    else:
+        base = 1.0
+    return base + len(query) / len(text)
+
+
+class IndexedItem(NamedTuple):
+    """Searchable fields of an inventory item, with the row version they were read at."""
+
+    item_name: str
+    item_type: str
+    location: str
+    version: Optional[int]
+
+
+def _indexed_item(item: Any) -> IndexedItem:
+    """Copy the searchable fields of an Inventory row, row tuple or InventoryCreate."""
+    return IndexedItem(item.item_name, item.item_type, item.location, getattr(item, "version", None))
+
+
+class InventorySearchIndex:
+    """
+    Search index over inventory item names, types and locations.
+
+    Searches hold the lock only while reading posting lists and expanding
+    terms to items; candidates are scored outside it, so a broad query does
+    not hold up writes. Results are cached until indexed text next changes.
+
+    Attributes:
+        ready (bool): Whether the index has been built from the database
+        refreshed_at (Optional[datetime]): When the last build or refresh
+            started reading the database (UTC)
+        versions (Dict[int, Optional[int]]): Indexed row version per item ID,
+            None when the writer did not know it
+        results (LRUCache): Recent search results
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, TrigramIndex] = {field: TrigramIndex() for field in SEARCH_FIELDS}
+        self.versions: Dict[int, Optional[int]] = {}
+        self.ready = False
+        self.refreshed_at: Optional[datetime] = None
+        self.results = LRUCache(maxsize=SEARCH_RESULT_CACHE_SIZE, ttl=float("inf"))
+        self._lock = threading.RLock()
+        self._journals: List[List[Tuple[int, Optional[IndexedItem]]]] = []
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def _changed(self) -> None:
+        """Drop cached results; the caller holds the lock."""
+        self._generation += 1
+        self.results.clear()
+
+    def _apply(self, item_id: int, item: Optional[IndexedItem]) -> None:
+        """Index an item, or remove it when item is None; the caller holds the lock."""
+        if item is None:
+            changed = [index.remove(item_id) for index in self.fields.values()]
+            self.versions.pop(item_id, None)
+        else:
+            changed = [index.add(item_id, getattr(item, field)) for field, index in self.fields.items()]
+            self.versions[item_id] = item.version
+        if any(changed):
+            self._changed()
+        for journal in self._journals:
+            journal.append((item_id, item))
+
+    def index_item(self, item_id: int, item: Any) -> None:
+        """
+        Index (or re-index) an inventory item.
+
+        Args:
+            item_id (int): ID of the inventory item
+            item (Any): Object with item_name, item_type and location attributes,
+                and version when known
+        """
+        self.index_items([(item_id, item)])
+
+    def index_items(self, items: Iterable[Tuple[int, Any]]) -> None:
+        """Index many (item_id, item) pairs under one lock acquisition."""
+        with self._lock:
+            for item_id, item in items:
+                self._apply(item_id, _indexed_item(item))
+
+    def remove_item(self, item_id: int) -> None:
+        """Remove an inventory item from the index."""
+        self.remove_items([item_id])
+
+    def remove_items(self, item_ids: Iterable[int]) -> None:
+        """Remove many inventory items under one lock acquisition."""
+        with self._lock:
+            for item_id in item_ids:
+                self._apply(item_id, None)
+
+    def holds(self, item_id: int, item: Any) -> bool:
+        """Whether an item is indexed at its version with its current text."""
+        with self._lock:
+            return self.versions.get(item_id, -1) == item.version and all(
+                index.texts.get(item_id) == normalize_text(getattr(item, field))
+                for field, index in self.fields.items()
+            )
+
+    def item_ids(self) -> List[int]:
+        """IDs of the indexed items."""
+        with self._lock:
+            return list(self.versions)
+
+    def clear(self) -> None:
+        """Drop every indexed item."""
+        with self._lock:
+            self.fields = {field: TrigramIndex() for field in SEARCH_FIELDS}
+            self.versions = {}
+            self.ready = False
+            self.refreshed_at = None
+            self._changed()
+
+    @contextmanager
+    def rebuild(self) -> Iterator["InventorySearchIndex"]:
+        """
+        Fill a fresh index and swap it in when the block completes.
+
+        Searches keep being served from this index meanwhile. Writes applied
+        to it during the block are replayed onto the fresh index before the
+        swap, so a row streamed before its write is not indexed stale; a
+        replayed item older than the streamed row is skipped.
+
+        Yields:
+            InventorySearchIndex: The index to fill
+        """
+        fresh = InventorySearchIndex()
+        journal: List[Tuple[int, Optional[IndexedItem]]] = []
+        with self._lock:
+            self._journals.append(journal)
+        try:
+            yield fresh
+            with self._lock:
+                for item_id, item in journal:
+                    streamed = fresh.versions.get(item_id)
+                    if item is None or item.version is None or streamed is None or item.version >= streamed:
+                        fresh._apply(item_id, item)
+                self.fields, self.versions = fresh.fields, fresh.versions
+                self.ready = True
+                self._changed()
+        finally:
+            with self._lock:
+                self._journals.remove(journal)
+
+    def search(
+        self,
+        query: str,
+        fields: Optional[List[str]] = None,
+        limit: int = 20,
+        fuzzy: bool = True,
+        min_similarity: float = 0.5
+    ) -> List[Tuple[int, float]]:
+        """
+        Find inventory items matching a partial text.
+
+        Args:
+            query (str): Text to search for
+            fields (Optional[List[str]], optional): Fields to search. Defaults to item_name only.
+            limit (int, optional): Maximum results. Defaults to 20.
+            fuzzy (bool, optional): Fall back to trigram similarity when nothing
+                contains the query. Defaults to True.
+            min_similarity (float, optional): Minimum share of query trigrams for
+                fuzzy matches. Defaults to 0.5.
+
+        Returns:
+            List[Tuple[int, float]]: (item_id, score) pairs, best first
+
+        Raises:
+            ValueError: If a field is not indexed
+        """
+        fields = fields or ["item_name"]
+        unknown = set(fields) - set(SEARCH_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported search fields: {', '.join(sorted(unknown))}")
+
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+
+        key = (normalized, tuple(fields), limit, fuzzy, min_similarity)
+        cached = self.results.get(key)
+        if cached is not None:
+            return list(cached)
+
+        with self._lock:
+            generation = self._generation
+            indexes = {field: self.fields[field] for field in fields}
+            candidates = {field: index.candidates(normalized) for field, index in indexes.items()}
+
+        scored = {
+            field: [
+                (score * SEARCH_FIELDS[field], term)
+                for term in terms
+                if (score := _match_score(normalized, term))
+            ]
+            for field, terms in candidates.items()
+        }
+
+        scores: Dict[int, float] = {}
+        with self._lock:
+            for field, index in indexes.items():
+                index.collect(scored[field], limit, scores)
+
+            if not scores and fuzzy and len(normalized) >= 3:
+                for field, index in indexes.items():
+                    weight = SEARCH_FIELDS[field]
+                    index.collect(
+                        [(similarity * weight, term)
+                         for term, similarity in index.fuzzy_candidates(normalized, min_similarity).items()],
+                        limit,
+                        scores
+                    )
+
+            results = heapq.nlargest(limit, scores.items(), key=lambda pair: (pair[1], -pair[0]))
+            if generation == self._generation:
+                self.results.set(key, results)
+        return list(results)
+
+
+# Process-wide inventory search index
+inventory_search_index = InventorySearchIndex()
+
+
+def record_inventory_changes(db: Session, item_ids: Iterable[int]) -> None:
+    """
+    Log written inventory items for other workers' search index refreshes.
+
+    Call it in the transaction of a write that creates or deletes items or
+    changes their searchable fields; it does not commit.
+
+    Args:
+        db (Session): Database session holding the write
+        item_ids (Iterable[int]): IDs of the written items
+    """
+    now = utc_now()
+    entries = [{"item_id": item_id, "changed_at": now} for item_id in dict.fromkeys(item_ids)]
+    if entries:
+        db.execute(insert(InventoryChange), entries)
+
+
+def build_inventory_search_index(db: Session, batch_size: int = 10000) -> int:
+    """
+    (Re)build the inventory search index from the database.
+
+    Rows are streamed with yield_per into a fresh index that replaces the
+    live one when complete, so searches keep being served during a rebuild.
+
+    Args:
+        db (Session): Database session
+        batch_size (int, optional): Rows fetched per batch. Defaults to 10000.
+
+    Returns:
+        int: Number of indexed items
+    """
+    started = utc_now()
+    with inventory_search_index.rebuild() as fresh:
+        result = db.execute(
+            select(Inventory.id, Inventory.item_name, Inventory.item_type, Inventory.location, Inventory.version)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            fresh.index_items((row.id, row) for row in partition)
+    inventory_search_index.refreshed_at = started
+
+    # Millions of long-lived posting sets would otherwise be walked by every
+    # full garbage collection, pausing the process for seconds
+    gc.freeze()
+    logger.info(f"Inventory search index built with {len(inventory_search_index)} items")
+    return len(inventory_search_index)
+
+
+def refresh_inventory_search_index(db: Session, batch_size: int = 10000) -> Tuple[int, int]:
+    """
+    Apply inventory writes made by other processes to the search index.
+
+    Reads the IDs logged in ``inventory_changes`` since the previous build or
+    refresh (less SEARCH_CHANGE_LOOKBACK_SECONDS, for transactions that
+    committed late) through the index on ``changed_at``, then fetches those
+    items in batches: items whose version differs from the indexed one are
+    re-indexed (as are items whose text differs, as when a deleted ID is
+    reused), and indexed items that no longer exist are removed. A write
+    racing the refresh is corrected by the next one, which reads its entry
+    again. Entries older than SEARCH_CHANGE_RETENTION_SECONDS are pruned.
+
+    Builds the index if it was never built, or if its last refresh is older
+    than the retention, so the entries it needs may have been pruned. Writes
+    made outside the CRUD layer are not logged and are only picked up by a
+    build.
+
+    Args:
+        db (Session): Database session
+        batch_size (int, optional): Rows fetched per batch. Defaults to 10000.
+
+    Returns:
+        Tuple[int, int]: Number of items re-indexed and removed
+    """
+    started = utc_now()
+    since = (inventory_search_index.refreshed_at or started) - timedelta(seconds=SEARCH_CHANGE_LOOKBACK_SECONDS)
+    if not inventory_search_index.ready or since < started - timedelta(seconds=SEARCH_CHANGE_RETENTION_SECONDS):
+        return build_inventory_search_index(db, batch_size), 0
+
+    logged = list(db.execute(
+        select(InventoryChange.item_id).where(InventoryChange.changed_at >= since).distinct()
+    ).scalars())
+
+    changed = 0
+    removed: List[int] = []
+    versions = inventory_search_index.versions
+    for start in range(0, len(logged), batch_size):
+        batch = logged[start:start + batch_size]
+        rows = db.execute(
+            select(Inventory.id, Inventory.item_name, Inventory.item_type, Inventory.location, Inventory.version)
+            .where(Inventory.id.in_(batch))
+        ).all()
+        stale = [row for row in rows if not inventory_search_index.holds(row.id, row)]
+        inventory_search_index.index_items((row.id, row) for row in stale)
+        changed += len(stale)
+
+        existing = {row.id for row in rows}
+        removed += [item_id for item_id in batch if item_id not in existing and item_id in versions]
+    inventory_search_index.remove_items(removed)
+    inventory_search_index.refreshed_at = started
+
+    try:
+        db.execute(delete(InventoryChange).where(
+            InventoryChange.changed_at < started - timedelta(seconds=SEARCH_CHANGE_RETENTION_SECONDS)
+        ))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise e
+
+    if changed or removed:
+        logger.info(f"Inventory search index refreshed: {changed} re-indexed, {len(removed)} removed")
+    return changed, len(removed)
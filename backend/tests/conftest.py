@@ -0,0 +1,59 @@
+"""
+Shared pytest configuration for the backend tests.
+
+The backend modules import each other as top-level modules (``database``,
+``crud.inventory_crud``), so the backend directory is put on sys.path.
+
+Tests that run CRUD functions or endpoints use the ``sqlite_db`` fixture,
+which points the database manager at a fresh SQLite file (the async engine
+needs ``aiosqlite``), and ``client`` for a TestClient on the application
+(needs ``httpx``). The lifespan is not run, so no job runner or search
+refresher is started behind the tests' back.
+"""
+
+import os
+import sys
+from typing import Iterator
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models  # noqa: E402,F401  (registers every table on Base)
+from cache import get_customer_cache, get_inventory_cache  # noqa: E402
+from database import Base, db_manager  # noqa: E402
+from search_index import inventory_search_index  # noqa: E402
+
+
+@pytest.fixture
+def sqlite_db(tmp_path) -> Iterator[str]:
+    """Point the database manager at a fresh SQLite file with every table created; yields its path."""
+    pytest.importorskip("aiosqlite")
+    from benchmarks.seed_data import configure_sqlite
+
+    saved = dict(vars(db_manager))
+    path = str(tmp_path / "test.db")
+    configure_sqlite(path)
+    Base.metadata.create_all(db_manager.engine)
+    get_inventory_cache().clear()
+    get_customer_cache().clear()
+    inventory_search_index.clear()
+
+    yield path
+
+    db_manager.engine.dispose()
+    db_manager.async_engine.sync_engine.dispose()
+    vars(db_manager).update(saved)
+    get_inventory_cache().clear()
+    get_customer_cache().clear()
+    inventory_search_index.clear()
+
+
+@pytest.fixture
+def client(sqlite_db):
+    """A TestClient on the application, backed by ``sqlite_db``."""
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import main
+
+    return TestClient(main.app)
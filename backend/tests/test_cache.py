@@ -0,0 +1,104 @@
+"""
+Tests for the read caches: a fill racing a committed write must not cache
+the row it read before the write.
+"""
+
+from database import session_scope
+from cache import LRUCache, get_customer_cache, get_inventory_cache
+from schemas.customer_schema import CustomerCreate, CustomerUpdate
+from schemas.inventory_schema import InventoryCreate, InventoryUpdate
+import crud.customer_crud as customer_crud
+import crud.inventory_crud as inventory_crud
+
+
+def test_set_is_skipped_for_keys_deleted_since_the_token():
+    cache = LRUCache(maxsize=2)
+    token = cache.token()
+    cache.delete("a")
+    cache.set("a", 1, token)
+    cache.set("b", 2, token)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    cache.set("a", 1, cache.token())
+    assert cache.get("a") == 1
+
+
+def test_set_is_skipped_for_tokens_older_than_forgotten_deletes_or_clear():
+    cache = LRUCache(maxsize=2)
+    token = cache.token()
+    cache.delete_many(["a", "b", "c"])
+    cache.set("d", 1, token)
+    assert cache.get("d") is None
+
+    token = cache.token()
+    cache.clear()
+    cache.set("d", 1, token)
+    assert cache.get("d") is None
+    assert cache.stats()["stale_fills"] == 2
+
+
+def interleave_update(monkeypatch, item_id: int, quantity: float):
+    """Commit an update of item_id in another session between the reader's SELECT and its cache fill."""
+    snapshot = inventory_crud._to_cache_value
+
+    def write_then_snapshot(db_inventory):
+        value = snapshot(db_inventory)
+        monkeypatch.setattr(inventory_crud, "_to_cache_value", snapshot)
+        with session_scope() as db:
+            inventory_crud.update_inventory_item(db, item_id, InventoryUpdate(quantity=quantity))
+        return value
+
+    monkeypatch.setattr(inventory_crud, "_to_cache_value", write_then_snapshot)
+
+
+def create_item() -> int:
+    with session_scope() as db:
+        return inventory_crud.create_inventory_item(
+            db, InventoryCreate(item_name="bolt", item_type="raw", quantity=5, location="WH-1")
+        ).id
+
+
+def test_item_read_racing_a_write_is_not_cached(sqlite_db, monkeypatch):
+    item_id = create_item()
+    interleave_update(monkeypatch, item_id, 9)
+
+    with session_scope() as db:
+        assert inventory_crud.get_inventory_item_by_id(db, item_id).quantity == 5
+    assert get_inventory_cache().get(item_id) is None
+    with session_scope() as db:
+        assert inventory_crud.get_inventory_item_by_id(db, item_id).quantity == 9
+    assert get_inventory_cache().get(item_id)["quantity"] == 9
+
+
+def test_batch_read_racing_a_write_is_not_cached(sqlite_db, monkeypatch):
+    item_id = create_item()
+    interleave_update(monkeypatch, item_id, 9)
+
+    with session_scope() as db:
+        assert inventory_crud.get_inventory_items_by_ids(db, [item_id])[item_id].quantity == 5
+    assert get_inventory_cache().get(item_id) is None
+    with session_scope() as db:
+        assert inventory_crud.get_inventory_items_by_ids(db, [item_id])[item_id].quantity == 9
+
+
+def test_customer_read_racing_a_write_is_not_cached(sqlite_db, monkeypatch):
+    with session_scope() as db:
+        customer_id = customer_crud.create_customer(db, CustomerCreate(name="Old Name")).id
+
+    snapshot = customer_crud._to_cache_value
+
+    def write_then_snapshot(db_customer):
+        value = snapshot(db_customer)
+        monkeypatch.setattr(customer_crud, "_to_cache_value", snapshot)
+        with session_scope() as db:
+            customer_crud.update_customer(db, customer_id, CustomerUpdate(name="New Name"))
+        return value
+
+    monkeypatch.setattr(customer_crud, "_to_cache_value", write_then_snapshot)
+
+    with session_scope() as db:
+        assert customer_crud.get_customer_names(db, [customer_id]) == {customer_id: "Old Name"}
+    assert get_customer_cache().get(customer_id) is None
+    with session_scope() as db:
+        assert customer_crud.get_customer_names(db, [customer_id]) == {customer_id: "New Name"}
@@ -0,0 +1,103 @@
+"""
+Tests for atomic stock adjustments: a batch is applied all-or-nothing, a
+missing item gets 404 and stock that would go negative gets 409, with the
+guard evaluated by the UPDATE itself.
+"""
+
+import pytest
+
+from database import session_scope
+from crud.inventory_crud import StockAdjustmentError, adjust_inventory_quantities, adjust_inventory_quantity
+
+
+@pytest.fixture
+def item_ids(client):
+    ids = []
+    for name, quantity in (("bolt", 5), ("nut", 2)):
+        response = client.post("/inventory/", json={
+            "item_name": name, "item_type": "raw", "quantity": quantity, "location": "WH-1"
+        })
+        ids.append(response.json()["id"])
+    return ids
+
+
+def quantities(client, item_ids):
+    return [client.get(f"/inventory/{item_id}").json()["quantity"] for item_id in item_ids]
+
+
+def total_quantity(client):
+    return sum(row["total_quantity"] for row in client.get("/inventory/summary").json() if row["location"])
+
+
+def test_batch_adjust_applies_every_delta(client, item_ids):
+    bolt, nut = item_ids
+    adjustments = [{"id": bolt, "delta": -2}, {"id": nut, "delta": 3}, {"id": bolt, "delta": -1}]
+
+    response = client.post("/inventory/adjust", json={"adjustments": adjustments})
+
+    assert response.status_code == 200
+    assert response.json() == {"adjusted": sorted(item_ids)}
+    assert quantities(client, item_ids) == [2, 5]
+    assert total_quantity(client) == 7
+
+
+def test_batch_adjust_is_all_or_nothing_on_insufficient_stock(client, item_ids):
+    bolt, nut = item_ids
+    adjustments = [{"id": bolt, "delta": -1}, {"id": nut, "delta": -3}]
+
+    response = client.post("/inventory/adjust", json={"adjustments": adjustments})
+
+    assert response.status_code == 409
+    assert (response.json()["detail"]["missing"], response.json()["detail"]["insufficient"]) == ([], [nut])
+    assert quantities(client, item_ids) == [5, 2]
+    assert total_quantity(client) == 7
+
+
+def test_batch_adjust_sums_deltas_of_one_item_before_the_guard(client, item_ids):
+    bolt, _ = item_ids
+    adjustments = [{"id": bolt, "delta": -3}, {"id": bolt, "delta": -3}]
+
+    response = client.post("/inventory/adjust", json={"adjustments": adjustments})
+
+    assert response.status_code == 409
+    assert quantities(client, [bolt]) == [5]
+
+
+def test_batch_adjust_of_a_missing_item_gets_404(client, item_ids):
+    bolt, _ = item_ids
+    adjustments = [{"id": bolt, "delta": -1}, {"id": 999, "delta": 1}]
+
+    response = client.post("/inventory/adjust", json={"adjustments": adjustments})
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["missing"] == [999]
+    assert quantities(client, [bolt]) == [5]
+    assert client.post("/inventory/999/adjust", json={"delta": 1}).status_code == 404
+
+
+def test_single_adjust_cannot_take_stock_negative(client, item_ids):
+    bolt, _ = item_ids
+
+    assert client.post(f"/inventory/{bolt}/adjust", json={"delta": -5}).json()["quantity"] == 0
+    response = client.post(f"/inventory/{bolt}/adjust", json={"delta": -1})
+    assert response.status_code == 409
+    assert response.json()["detail"]["insufficient"] == [bolt]
+    assert quantities(client, [bolt]) == [0]
+
+
+def test_negative_stock_is_blocked_by_the_update_not_a_prior_read(sqlite_db, client, item_ids):
+    bolt, _ = item_ids
+
+    # The second session reads nothing before its UPDATE, whose guard is
+    # checked against the row the first session committed
+    with session_scope() as first, session_scope() as second:
+        adjust_inventory_quantity(first, bolt, -4)
+        with pytest.raises(StockAdjustmentError) as error:
+            adjust_inventory_quantities(second, [(bolt, -4)])
+    assert error.value.insufficient == [bolt]
+    assert quantities(client, [bolt]) == [1]
+
+
+def test_batch_size_is_capped(client, item_ids):
+    adjustments = [{"id": item_ids[0], "delta": 0}] * 1001
+    assert client.post("/inventory/adjust", json={"adjustments": adjustments}).status_code == 422
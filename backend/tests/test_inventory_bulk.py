@@ -0,0 +1,47 @@
+"""
+Tests for bulk inventory writes: the IDs returned for a bulk create map back
+to the input rows, in insert and upsert mode.
+"""
+
+from sqlalchemy import select
+
+from database import session_scope
+from models.inventory_model import Inventory
+from schemas.inventory_schema import InventoryCreate
+from crud.inventory_crud import bulk_create_inventory_items
+
+
+def item(name: str, quantity: float = 1, location: str = "WH-1") -> InventoryCreate:
+    return InventoryCreate(item_name=name, item_type="raw", quantity=quantity, location=location)
+
+
+def rows_by_id():
+    with session_scope() as db:
+        return {row.id: (row.item_name, row.location, row.quantity) for row in db.execute(select(Inventory)).scalars()}
+
+
+def test_bulk_create_ids_map_to_input_rows(sqlite_db):
+    items = [item(f"item-{index}", index, f"WH-{index % 3}") for index in range(25)]
+    with session_scope() as db:
+        ids, created, updated = bulk_create_inventory_items(db, items, chunk_size=10)
+
+    assert (created, updated) == (25, 0)
+    stored = rows_by_id()
+    assert [stored[item_id] for item_id in ids] == [(i.item_name, i.location, i.quantity) for i in items]
+
+
+def test_bulk_upsert_ids_map_to_input_rows(sqlite_db):
+    with session_scope() as db:
+        (bolt_id,), _, _ = bulk_create_inventory_items(db, [item("bolt", 5)])
+
+    items = [item("nut", 1), item("bolt", 7), item("washer", 2), item("nut", 3)]
+    with session_scope() as db:
+        ids, created, updated = bulk_create_inventory_items(db, items, upsert=True, chunk_size=2)
+
+    stored = rows_by_id()
+    assert ids[1] == bolt_id
+    assert ids[0] == ids[3]
+    assert [stored[item_id][0] for item_id in ids] == ["nut", "bolt", "washer", "nut"]
+    assert stored[bolt_id][2] == 7
+    assert stored[ids[0]][2] == 3
+    assert (created, updated) == (2, 2)
@@ -0,0 +1,113 @@
+"""
+Tests for the chunked CSV inventory import run as an ``inventory_import`` job.
+
+Each chunk is committed in one transaction with the job's checkpoint, so an
+import interrupted after any chunk, or taken over by another worker, writes
+every row exactly once.
+"""
+
+import os
+import threading
+
+import pytest
+from sqlalchemy import select, update
+
+import jobs
+import crud.inventory_import as inventory_import
+from database import session_scope
+from jobs import JobContext, JobInterrupted
+from models.inventory_model import Inventory
+from models.job_model import Job
+from crud.job_crud import claim_job, create_job, finish_job, get_job
+
+ROWS = ["a", "b", "c", "d"]
+
+
+@pytest.fixture
+def upload(sqlite_db, tmp_path, monkeypatch):
+    """A queued import of a 4-row CSV with chunk_size=2; yields the job ID."""
+    monkeypatch.setattr(jobs, "JOB_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(inventory_import, "JOB_OUTPUT_DIR", str(tmp_path))
+    data = "item_name,item_type,quantity,location\n" + "".join(f"{name},raw,1,WH-1\n" for name in ROWS)
+    with open(tmp_path / "upload.csv", "w") as file:
+        file.write(data)
+
+    params = {"file": "upload.csv", "total_bytes": len(data), "upsert": False, "chunk_size": 2}
+    with session_scope() as db:
+        return create_job(db, inventory_import.IMPORT_JOB_TYPE, params).id
+
+
+def run(job_id: str, worker_id: str, stopping: bool = False):
+    """Run the import handler as ``worker_id`` with the job's stored params and checkpoint."""
+    with session_scope() as db:
+        job = get_job(db, job_id)
+        params, state = job.params, job.result
+    context = JobContext(job_id, worker_id, params, state, threading.Event())
+    if stopping:
+        context._stopping.set()
+    return inventory_import.run_inventory_import(context)
+
+
+def item_names():
+    with session_scope() as db:
+        return sorted(db.execute(select(Inventory.item_name)).scalars())
+
+
+def test_import_resumes_after_interruption_without_duplicates(upload, tmp_path):
+    with session_scope() as db:
+        assert claim_job(db, upload, "w1")
+    with pytest.raises(JobInterrupted):
+        run(upload, "w1", stopping=True)
+
+    assert item_names() == ["a", "b"]
+    assert os.path.exists(tmp_path / "upload.csv")
+    with session_scope() as db:
+        finish_job(db, upload, "w1", "pending")
+        assert get_job(db, upload).result["rows_processed"] == 2
+        assert claim_job(db, upload, "w2")
+
+    result = run(upload, "w2")
+
+    assert item_names() == ROWS
+    assert (result["rows_processed"], result["rows_created"], result["rows_failed"]) == (4, 4, 0)
+    assert not os.path.exists(tmp_path / "upload.csv")
+
+
+def test_chunk_of_a_taken_over_job_is_rolled_back(upload):
+    with session_scope() as db:
+        assert claim_job(db, upload, "w1")
+        # w1 missed its heartbeat; the job is requeued and claimed by w2
+        db.execute(update(Job).where(Job.id == upload).values(status="pending", worker_id=None))
+        db.commit()
+        assert claim_job(db, upload, "w2")
+
+    with pytest.raises(JobInterrupted):
+        run(upload, "w1")
+    assert item_names() == []
+
+    run(upload, "w2")
+    assert item_names() == ROWS
+
+
+def test_import_endpoints_report_job_status(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(inventory_import, "JOB_OUTPUT_DIR", str(tmp_path))
+    data = "item_name,item_type,quantity,location\nbolt,raw,5,WH-1\nnut,raw,-1,WH-1\n"
+
+    response = client.post("/inventory/import", files={"file": ("stock.csv", data, "text/csv")},
+                           data={"chunk_size": "10"})
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.json()["status"] == "pending"
+    assert client.post("/jobs/", json={"job_type": "inventory_import", "params": {}}).status_code == 400
+
+    with session_scope() as db:
+        assert claim_job(db, job_id, "w1")
+    result = run(job_id, "w1")
+    with session_scope() as db:
+        finish_job(db, job_id, "w1", "completed", result)
+
+    status = client.get(f"/inventory/import/{job_id}").json()
+    assert (status["status"], status["progress"], status["rows_created"], status["rows_failed"]) == ("completed", 1.0, 1, 1)
+    assert status["errors"][0]["line"] == 3
+    assert client.get("/inventory/import/unknown").status_code == 404
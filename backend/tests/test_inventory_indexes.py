@@ -0,0 +1,95 @@
+"""
+Query plan tests for the composite inventory indexes.
+
+Each common warehouse listing built by ``inventory_listing_query`` is
+EXPLAINed and must be served by its composite index, with no separate sort
+when the listing is ordered by the index's trailing column. The plans are
+checked on an in-memory SQLite schema, and on the configured MySQL database
+when DB_HOST is set (run that on realistic data; the optimizer may prefer a
+scan on near-empty tables).
+"""
+
+import os
+from typing import Iterator, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session
+
+from database import Base, db_manager, init_db
+from crud.inventory_crud import inventory_listing_query
+from schemas.inventory_schema import InventoryFilter
+
+TYPE_LOCATION_INDEX = "ix_inventory_item_type_location"
+LOCATION_QUANTITY_INDEX = "ix_inventory_location_quantity"
+
+# (filters, order_by, expected index)
+FILTER_CASES = [
+    pytest.param(InventoryFilter(item_type="steel"), "id", TYPE_LOCATION_INDEX, id="type"),
+    pytest.param(InventoryFilter(item_type="steel", location="WH-1"), "id", TYPE_LOCATION_INDEX, id="type-location"),
+    pytest.param(InventoryFilter(location="WH-1"), "id", LOCATION_QUANTITY_INDEX, id="location"),
+    pytest.param(InventoryFilter(location="WH-1", max_quantity=10), "id", LOCATION_QUANTITY_INDEX,
+                 id="location-quantity"),
+    pytest.param(InventoryFilter(location="WH-1", min_quantity=5, max_quantity=50), "id", LOCATION_QUANTITY_INDEX,
+                 id="location-quantity-range"),
+]
+
+# Listings ordered by the column after the filtered one, which the index returns in order
+ORDER_BY_CASES = [
+    pytest.param(InventoryFilter(location="WH-1"), "quantity", LOCATION_QUANTITY_INDEX, id="location-by-quantity"),
+    pytest.param(InventoryFilter(location="WH-1", max_quantity=10), "-quantity", LOCATION_QUANTITY_INDEX,
+                 id="low-stock-by-quantity-desc"),
+    pytest.param(InventoryFilter(item_type="steel"), "location", TYPE_LOCATION_INDEX, id="type-by-location"),
+]
+
+
+@pytest.fixture(scope="module", params=["sqlite", "mysql"])
+def engine(request) -> Iterator[Engine]:
+    """An in-memory SQLite schema, and the configured MySQL database when DB_HOST is set."""
+    if request.param == "sqlite":
+        sqlite_engine = create_engine("sqlite://")
+        Base.metadata.create_all(sqlite_engine, tables=[Base.metadata.tables["inventory"]])
+        yield sqlite_engine
+        sqlite_engine.dispose()
+        return
+
+    if not os.getenv("DB_HOST"):
+        pytest.skip("DB_HOST is not set")
+    init_db()
+    yield db_manager.engine
+    db_manager.close_connection()
+
+
+def explain(engine: Engine, filters: InventoryFilter, order_by: str) -> Tuple[Optional[str], bool, str]:
+    """
+    EXPLAIN one listing query.
+
+    Returns:
+        Tuple[Optional[str], bool, str]: The index used (None for a scan),
+            whether rows are sorted after being read, and the raw plan
+    """
+    with Session(engine) as db:
+        statement = inventory_listing_query(db, limit=100, order_by=order_by, filters=filters).statement
+        sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+
+        if engine.dialect.name == "sqlite":
+            details: List[str] = [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            used = next((detail.split(" INDEX ")[1].split(" ")[0] for detail in details if " INDEX " in detail), None)
+            return used, any("TEMP B-TREE" in detail for detail in details), "; ".join(details)
+
+        rows = db.execute(text(f"EXPLAIN {sql}")).mappings().all()
+        plan = "; ".join(f"type={row['type']} key={row['key']} extra={row['Extra']}" for row in rows)
+        return rows[0]["key"], any("filesort" in (row["Extra"] or "") for row in rows), plan
+
+
+@pytest.mark.parametrize("filters, order_by, expected", FILTER_CASES)
+def test_filtered_listing_uses_composite_index(engine, filters, order_by, expected):
+    used, _, plan = explain(engine, filters, order_by)
+    assert used == expected, plan
+
+
+@pytest.mark.parametrize("filters, order_by, expected", ORDER_BY_CASES)
+def test_ordered_listing_reads_index_in_order(engine, filters, order_by, expected):
+    used, sorted_after_read, plan = explain(engine, filters, order_by)
+    assert used == expected, plan
+    assert not sorted_after_read, plan
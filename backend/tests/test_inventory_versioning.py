@@ -0,0 +1,77 @@
+"""
+Tests for optimistic concurrency on inventory items: every write bumps the
+item's version, and PUT and DELETE with a stale If-Match get 412 while a
+missing item stays 404.
+"""
+
+import pytest
+
+ITEM = {"item_name": "bolt", "item_type": "raw", "quantity": 5, "location": "WH-1"}
+
+
+@pytest.fixture
+def item_id(client) -> int:
+    response = client.post("/inventory/", json=ITEM)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_every_update_bumps_the_version(client, item_id):
+    response = client.get(f"/inventory/{item_id}")
+    assert (response.json()["version"], response.headers["ETag"]) == (1, '"1"')
+
+    response = client.put(f"/inventory/{item_id}", json={"quantity": 6}, headers={"If-Match": '"1"'})
+    assert response.status_code == 200
+    assert (response.json()["version"], response.headers["ETag"]) == (2, '"2"')
+
+    response = client.put(f"/inventory/{item_id}", json={"location": "WH-2"})
+    assert response.json()["version"] == 3
+    assert client.get(f"/inventory/{item_id}").json()["version"] == 3
+
+    response = client.post(f"/inventory/{item_id}/adjust", json={"delta": 1})
+    assert response.json()["version"] == 4
+
+
+def test_update_with_stale_if_match_gets_412(client, item_id):
+    client.put(f"/inventory/{item_id}", json={"quantity": 6})
+
+    response = client.put(f"/inventory/{item_id}", json={"quantity": 1}, headers={"If-Match": '"1"'})
+    assert response.status_code == 412
+    assert response.headers["ETag"] == '"2"'
+    assert client.get(f"/inventory/{item_id}").json()["quantity"] == 6
+
+    response = client.put(f"/inventory/{item_id}", json={}, headers={"If-Match": 'W/"1"'})
+    assert response.status_code == 412
+    response = client.put(f"/inventory/{item_id}", json={"quantity": 1}, headers={"If-Match": "*"})
+    assert response.status_code == 200
+
+
+def test_delete_with_stale_if_match_gets_412(client, item_id):
+    response = client.delete(f"/inventory/{item_id}", headers={"If-Match": '"2"'})
+    assert (response.status_code, response.headers["ETag"]) == (412, '"1"')
+    assert client.get(f"/inventory/{item_id}").status_code == 200
+
+    assert client.delete(f"/inventory/{item_id}", headers={"If-Match": '"1"'}).status_code == 204
+    assert client.get(f"/inventory/{item_id}").status_code == 404
+
+
+def test_missing_item_gets_404_not_412(client, item_id):
+    client.delete(f"/inventory/{item_id}")
+
+    assert client.put(f"/inventory/{item_id}", json={"quantity": 1}, headers={"If-Match": '"1"'}).status_code == 404
+    assert client.put(f"/inventory/{item_id}", json={"quantity": 1}).status_code == 404
+    assert client.delete(f"/inventory/{item_id}", headers={"If-Match": '"1"'}).status_code == 404
+    assert client.delete(f"/inventory/{item_id}").status_code == 404
+
+
+def test_malformed_if_match_gets_400(client, item_id):
+    response = client.put(f"/inventory/{item_id}", json={"quantity": 1}, headers={"If-Match": "abc"})
+    assert response.status_code == 400
+
+
+def test_update_moves_the_item_between_summary_groups(client, item_id):
+    response = client.put(f"/inventory/{item_id}", json={"quantity": 8, "location": "WH-2"}, headers={"If-Match": '"1"'})
+    assert response.json()["version"] == 2
+
+    summary = {row["location"]: row["total_quantity"] for row in client.get("/inventory/summary").json()}
+    assert summary == {"WH-2": 8}
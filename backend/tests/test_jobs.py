@@ -0,0 +1,217 @@
+"""
+Tests for the jobs-table queue and the JobRunner: claims, stale-job
+recovery, per-type concurrency and resuming from a checkpoint.
+
+Job types registered here are removed again after each test.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import update
+
+import jobs
+from database import session_scope, utc_now
+from jobs import JobContext, JobInterrupted, JobRunner, JobType
+from models.job_model import Job
+from crud.job_crud import claim_job, create_job, finish_job, get_job, requeue_stale_jobs
+
+
+def register(monkeypatch, name, handler, concurrency=1):
+    monkeypatch.setitem(jobs.JOB_TYPES, name, JobType(name, handler, BaseModel, concurrency))
+
+
+def queue(name: str, count: int = 1, params=None):
+    with session_scope() as db:
+        return [create_job(db, name, params or {}).id for _ in range(count)]
+
+
+def job(job_id: str) -> Job:
+    with session_scope() as db:
+        row = get_job(db, job_id)
+        db.expunge(row)
+        return row
+
+
+async def settle(*runners: JobRunner):
+    """Wait for the jobs started by ``runners`` to record their outcome."""
+    tasks = set().union(*(runner._tasks for runner in runners))
+    if tasks:
+        await asyncio.wait(tasks, timeout=10)
+
+
+def test_concurrent_claims_start_a_job_once(sqlite_db):
+    (job_id,) = queue("test_unit")
+    start = threading.Barrier(8)
+    claimed = []
+
+    def claim(worker_id):
+        with session_scope() as db:
+            start.wait()
+            claimed.append((claim_job(db, job_id, worker_id), worker_id))
+
+    threads = [threading.Thread(target=claim, args=(f"w{index}",)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = [worker_id for won, worker_id in claimed if won]
+    assert len(winners) == 1
+    assert (job(job_id).worker_id, job(job_id).attempts) == (winners[0], 1)
+
+
+def test_runners_polling_together_claim_each_job_once(sqlite_db, monkeypatch):
+    release = asyncio.Event()
+
+    async def hold(context):
+        await release.wait()
+        return {"worker": context.worker_id}
+
+    register(monkeypatch, "test_unit", hold, concurrency=4)
+    job_ids = queue("test_unit", 6)
+
+    async def scenario():
+        runners = [JobRunner(workers=4, concurrency={}) for _ in range(2)]
+        # Both see the same oldest jobs; the losers of the first round of
+        # claims are picked up by the second poll
+        for _ in range(2):
+            await asyncio.gather(*(runner._poll() for runner in runners))
+        started = [set(runner._running) for runner in runners]
+        release.set()
+        await settle(*runners)
+        return runners, started
+
+    runners, started = asyncio.run(scenario())
+
+    assert not started[0] & started[1]
+    assert started[0] | started[1] == set(job_ids)
+    for job_id in job_ids:
+        owner = next(runner for runner, ids in zip(runners, started) if job_id in ids)
+        assert job(job_id).result == {"worker": owner.worker_id}
+
+
+def test_stale_job_is_requeued_and_its_old_worker_cannot_finish_it(sqlite_db):
+    (job_id,) = queue("test_unit")
+    with session_scope() as db:
+        assert claim_job(db, job_id, "w1")
+        db.execute(update(Job).where(Job.id == job_id).values(heartbeat_at=utc_now() - timedelta(minutes=5)))
+        db.commit()
+
+        assert requeue_stale_jobs(db, utc_now() - timedelta(minutes=1), max_attempts=3) == (1, 0)
+        assert (job(job_id).status, job(job_id).worker_id) == ("pending", None)
+        assert claim_job(db, job_id, "w2")
+
+        assert not finish_job(db, job_id, "w1", "completed", {"from": "w1"})
+        assert finish_job(db, job_id, "w2", "completed", {"from": "w2"})
+    assert (job(job_id).status, job(job_id).result, job(job_id).attempts) == ("completed", {"from": "w2"}, 2)
+
+
+def test_fresh_running_job_is_not_requeued(sqlite_db):
+    (job_id,) = queue("test_unit")
+    with session_scope() as db:
+        assert claim_job(db, job_id, "w1")
+        assert requeue_stale_jobs(db, utc_now() - timedelta(minutes=1), max_attempts=3) == (0, 0)
+    assert job(job_id).status == "running"
+
+
+def test_job_that_keeps_going_stale_fails_after_max_attempts(sqlite_db):
+    (job_id,) = queue("test_unit")
+    for attempt in range(1, 4):
+        with session_scope() as db:
+            assert claim_job(db, job_id, f"w{attempt}")
+            db.execute(update(Job).where(Job.id == job_id).values(heartbeat_at=utc_now() - timedelta(minutes=5)))
+            db.commit()
+            requeued, failed = requeue_stale_jobs(db, utc_now() - timedelta(minutes=1), max_attempts=3)
+        assert (requeued, failed) == ((1, 0) if attempt < 3 else (0, 1))
+
+    failed_job = job(job_id)
+    assert (failed_job.status, failed_job.attempts) == ("failed", 3)
+    assert "3 attempts" in failed_job.error
+    assert failed_job.finished_at is not None
+
+
+def test_per_type_concurrency_limits_claims(sqlite_db, monkeypatch):
+    release = asyncio.Event()
+
+    async def hold(context):
+        await release.wait()
+        return {}
+
+    register(monkeypatch, "test_slow", hold, concurrency=4)
+    register(monkeypatch, "test_fast", hold, concurrency=4)
+    slow = queue("test_slow", 3)
+    fast = queue("test_fast", 2)
+
+    async def scenario():
+        runner = JobRunner(workers=4, concurrency={"test_slow": 1})
+        await runner._poll()
+        running = sorted(name for name, _ in runner._running.values())
+        await runner._poll()
+        running_after_second_poll = len(runner._running)
+        release.set()
+        await settle(runner)
+        return running, running_after_second_poll
+
+    running, running_after_second_poll = asyncio.run(scenario())
+
+    assert running == ["test_fast", "test_fast", "test_slow"]
+    assert running_after_second_poll == 3
+    assert [job(job_id).status for job_id in slow] == ["completed", "pending", "pending"]
+
+
+def test_interrupted_job_resumes_from_its_checkpoint(sqlite_db, monkeypatch):
+    units = []
+
+    def count_to_four(context: JobContext):
+        done = (context.state or {}).get("done", 0)
+        for unit in range(done + 1, 5):
+            with session_scope() as db:
+                units.append(unit)
+                context.checkpoint(db, {"done": unit}, unit, 4)
+            if unit == 2 and context.worker_id.endswith("first"):
+                # Shut down after the second unit; report raises JobInterrupted
+                context._stopping.set()
+            context.report(unit, 4)
+        return {"done": 4}
+
+    register(monkeypatch, "test_resumable", count_to_four)
+    (job_id,) = queue("test_resumable")
+
+    async def run(worker_id):
+        runner = JobRunner(workers=1, poll_interval=0.05, concurrency={})
+        runner.worker_id = worker_id
+        runner.start()
+        # Until the job completes or the handler shuts the runner down
+        end = time.monotonic() + 10
+        while job(job_id).status != "completed" and not runner._stopping.is_set() and time.monotonic() < end:
+            await asyncio.sleep(0.02)
+        await runner.stop()
+
+    asyncio.run(run("w-first"))
+    interrupted = job(job_id)
+    assert (interrupted.status, interrupted.result, interrupted.progress) == ("pending", {"done": 2}, 0.5)
+
+    asyncio.run(run("w-second"))
+    resumed = job(job_id)
+    assert (resumed.status, resumed.result, resumed.attempts) == ("completed", {"done": 4}, 2)
+    assert units == [1, 2, 3, 4]
+
+
+def test_checkpoint_of_a_job_taken_over_is_rolled_back(sqlite_db):
+    (job_id,) = queue("test_unit")
+    with session_scope() as db:
+        assert claim_job(db, job_id, "w1")
+        db.execute(update(Job).where(Job.id == job_id).values(status="pending", worker_id=None))
+        db.commit()
+        assert claim_job(db, job_id, "w2")
+
+    context = JobContext(job_id, "w1", {}, None, threading.Event())
+    with session_scope() as db:
+        with pytest.raises(JobInterrupted):
+            context.checkpoint(db, {"done": 1}, 1, 2)
+    assert (job(job_id).worker_id, job(job_id).result) == ("w2", None)
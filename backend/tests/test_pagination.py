@@ -0,0 +1,101 @@
+"""
+Tests for keyset pagination of the inventory and customer listings: walking
+the X-Next-Cursor pages visits every row once in (sort key, id) order, ties
+on the sort key included, a bad cursor gets 400 and an out-of-range limit
+gets 422.
+"""
+
+import pytest
+
+QUANTITIES = [3, 1, 3, 2, 3, 1, 2]
+
+
+@pytest.fixture
+def item_ids(client):
+    ids = []
+    for index, quantity in enumerate(QUANTITIES):
+        response = client.post("/inventory/", json={
+            "item_name": f"item-{index}",
+            "item_type": "raw" if index % 2 else "part",
+            "quantity": quantity,
+            "location": "WH-1"
+        })
+        ids.append(response.json()["id"])
+    return ids
+
+
+def walk(client, path, **params):
+    """Follow X-Next-Cursor from the first page; returns the pages."""
+    pages = []
+    response = client.get(path, params=params)
+    while True:
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        response = client.get(path, params={**params, "after": cursor})
+
+
+def ids_of(pages):
+    return [row["id"] for page in pages for row in page]
+
+
+@pytest.mark.parametrize("order_by, key", [
+    ("id", lambda pair: pair[0]),
+    ("-id", lambda pair: -pair[0]),
+    ("quantity", lambda pair: (pair[1], pair[0])),
+    ("-quantity", lambda pair: (-pair[1], -pair[0])),
+])
+def test_cursor_pages_visit_every_item_once_in_order(client, item_ids, order_by, key):
+    expected = [item_id for item_id, _ in sorted(zip(item_ids, QUANTITIES), key=key)]
+
+    pages = walk(client, "/inventory/", order_by=order_by, limit=2)
+
+    assert ids_of(pages) == expected
+    assert all(len(page) <= 2 for page in pages)
+
+
+def test_ties_on_the_sort_key_are_split_across_pages_by_id(client, item_ids):
+    # The three items with quantity 3 straddle the page boundary at limit=2
+    pages = walk(client, "/inventory/", order_by="-quantity", limit=2)
+
+    assert [row["quantity"] for row in pages[0]] == [3, 3]
+    assert [row["quantity"] for row in pages[1]] == [3, 2]
+    assert pages[0][1]["id"] < pages[0][0]["id"]
+    assert pages[1][0]["id"] < pages[0][1]["id"]
+
+
+def test_cursor_pages_keep_filters(client, item_ids):
+    pages = walk(client, "/inventory/", order_by="quantity", limit=1, item_type="raw")
+
+    raw = [(quantity, item_id) for index, (item_id, quantity) in enumerate(zip(item_ids, QUANTITIES)) if index % 2]
+    assert ids_of(pages) == [item_id for _, item_id in sorted(raw)]
+
+
+def test_invalid_cursor_gets_400(client, item_ids):
+    cursor = client.get("/inventory/", params={"order_by": "quantity", "limit": 2}).headers["X-Next-Cursor"]
+
+    assert client.get("/inventory/", params={"after": "not-a-cursor"}).status_code == 400
+    assert client.get("/inventory/", params={"order_by": "-quantity", "after": cursor}).status_code == 400
+    assert client.get("/inventory/", params={"order_by": "weight"}).status_code == 400
+    assert client.get("/customers/", params={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_out_of_range_limit_gets_422_and_doubled_sign_gets_400(client, item_ids):
+    for path in ("/inventory/", "/customers/", "/invoices/"):
+        assert client.get(path, params={"limit": 0}).status_code == 422
+        assert client.get(path, params={"limit": 1001}).status_code == 422
+    assert client.get("/inventory/", params={"limit": 1000}).status_code == 200
+
+    assert client.get("/inventory/", params={"order_by": "--quantity"}).status_code == 400
+    assert client.get("/customers/", params={"order_by": "--id"}).status_code == 400
+
+
+def test_customer_cursor_pages_break_name_ties_by_id(client):
+    names = ["Beta", "Alpha", "Beta", "Alpha", "Beta"]
+    ids = [client.post("/customers/", json={"name": name}).json()["id"] for name in names]
+
+    pages = walk(client, "/customers/", order_by="name", limit=2)
+
+    assert ids_of(pages) == [item_id for _, item_id in sorted(zip(names, ids))]
@@ -0,0 +1,126 @@
+"""
+Tests for the search index refresh picking up other workers' writes from
+the inventory change log instead of scanning the inventory table, and for
+searches answering 503 rather than building the index themselves.
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+
+import crud.inventory_crud as inventory_crud
+from database import db_manager, session_scope, utc_now
+from models.inventory_change_model import InventoryChange
+from schemas.inventory_schema import InventoryCreate, InventoryUpdate
+from search_index import (
+    InventorySearchIndex,
+    build_inventory_search_index,
+    inventory_search_index,
+    refresh_inventory_search_index
+)
+
+
+def create(name: str) -> int:
+    with session_scope() as db:
+        return inventory_crud.create_inventory_item(
+            db, InventoryCreate(item_name=name, item_type="raw", location="WH-1")
+        ).id
+
+
+def found(query: str):
+    return [item_id for item_id, _ in inventory_search_index.search(query)]
+
+
+@pytest.fixture
+def built(sqlite_db, monkeypatch):
+    """Index two items, then make CRUD writes behave like another worker's."""
+    ids = {name: create(name) for name in ("bolt", "nut")}
+    with session_scope() as db:
+        build_inventory_search_index(db)
+    monkeypatch.setattr(inventory_crud, "inventory_search_index", InventorySearchIndex())
+    return ids
+
+
+@pytest.fixture
+def statements(sqlite_db):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(" ".join(statement.split()))
+
+    event.listen(db_manager.engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(db_manager.engine, "before_cursor_execute", record)
+
+
+def test_refresh_applies_logged_writes_without_scanning_the_inventory(built, statements):
+    washer = create("washer")
+    with session_scope() as db:
+        inventory_crud.update_inventory_item(db, built["bolt"], InventoryUpdate(item_name="hex bolt"))
+        inventory_crud.delete_inventory_item(db, built["nut"])
+    assert found("washer") == [] and found("nut") == [built["nut"]]
+
+    statements.clear()
+    with session_scope() as db:
+        assert refresh_inventory_search_index(db) == (2, 1)
+
+    assert found("washer") == [washer]
+    assert found("hex") == [built["bolt"]]
+    assert found("nut") == []
+    inventory_reads = [sql for sql in statements if sql.startswith("SELECT") and "FROM inventory " in sql + " "]
+    assert inventory_reads and all("WHERE inventory.id IN" in sql for sql in inventory_reads)
+
+    with session_scope() as db:
+        assert refresh_inventory_search_index(db) == (0, 0)
+
+
+def test_refresh_reindexes_a_reused_id_at_the_same_version(built):
+    # SQLite hands the highest ID out again once its row is deleted
+    with session_scope() as db:
+        inventory_crud.delete_inventory_item(db, built["nut"])
+    assert create("washer") == built["nut"]
+
+    with session_scope() as db:
+        refresh_inventory_search_index(db)
+    assert found("washer") == [built["nut"]]
+    assert found("nut") == []
+
+
+def test_stock_adjustments_are_not_logged(built):
+    with session_scope() as db:
+        before = db.execute(select(func.count()).select_from(InventoryChange)).scalar()
+        inventory_crud.adjust_inventory_quantity(db, built["bolt"], 5)
+        assert db.execute(select(func.count()).select_from(InventoryChange)).scalar() == before
+
+
+def test_refresh_prunes_old_entries_and_rebuilds_after_the_retention(built):
+    with session_scope() as db:
+        db.add(InventoryChange(item_id=built["bolt"], changed_at=utc_now() - timedelta(days=1)))
+        db.commit()
+        refresh_inventory_search_index(db)
+        assert db.execute(
+            select(func.count()).select_from(InventoryChange).where(InventoryChange.item_id == built["bolt"])
+        ).scalar() == 1
+
+    # Entries this index would need may have been pruned
+    create("washer")
+    inventory_search_index.refreshed_at = utc_now() - timedelta(days=1)
+    with session_scope() as db:
+        assert refresh_inventory_search_index(db) == (3, 0)
+    assert len(found("washer")) == 1
+
+
+def test_search_gets_503_until_the_index_is_built(client, statements):
+    client.post("/inventory/", json={"item_name": "bolt", "item_type": "raw", "location": "WH-1"})
+    statements.clear()
+
+    response = client.get("/inventory/search", params={"q": "bolt"})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert not any("FROM inventory " in sql + " " for sql in statements)
+
+    with session_scope() as db:
+        build_inventory_search_index(db)
+    response = client.get("/inventory/search", params={"q": "bolt"})
+    assert [hit["item"]["item_name"] for hit in response.json()] == ["bolt"]
@@ -0,0 +1,466 @@
+"""
+ZATCA e-invoice document generation.
+
+Renders invoices as UBL 2.1 XML following the ZATCA (FATOORA) e-invoicing
+data dictionary. It also computes the invoice hash that chains every invoice
+to the previous one (PIH) and builds the TLV-encoded QR payload. When
+ZATCA_SIGNING_KEY points at an EC private key (needs the ``cryptography``
+package), the QR code also carries an ECDSA signature of the invoice hash and
+the public key. The XAdES signature block is not produced.
+
+Rendering is CPU-bound, so it runs on a pool of ZATCA_POOL_WORKERS processes
+and never on the event loop; with ZATCA_POOL_WORKERS=0 it runs in a thread of
+the calling process. Documents are written directly in canonical form
+(C14N 1.1, the form ZATCA hashes), so no parse-and-canonicalise pass is
+needed. Linking the chain has to be sequential and happens in the calling
+process, where it only hashes the rendered parts in order.
+
+Invoices are passed around as plain dictionaries (see ``render_invoice``), and
+this module does not import the database layer, so pool workers start quickly.
+"""
+
+import asyncio
+import base64
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Render pool: worker processes (0 renders in a thread of the calling process),
+# maximum invoices per task sent to a worker, and the multiprocessing start method
+ZATCA_POOL_WORKERS = int(os.getenv("ZATCA_POOL_WORKERS", str(os.cpu_count() or 1)))
+ZATCA_POOL_CHUNK_SIZE = int(os.getenv("ZATCA_POOL_CHUNK_SIZE", "8"))
+ZATCA_POOL_START_METHOD = os.getenv("ZATCA_POOL_START_METHOD", "spawn")
+
+# PEM file with the EC private key of the invoicing unit; QR codes are unsigned without it
+ZATCA_SIGNING_KEY = os.getenv("ZATCA_SIGNING_KEY")
+
+CURRENCY = "SAR"
+
+# Previous-invoice hash of the first invoice in a chain: base64 of the SHA-256 hex digest of "0"
+INITIAL_PREVIOUS_HASH = base64.b64encode(hashlib.sha256(b"0").hexdigest().encode("ascii")).decode("ascii")
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Root element with its namespace declarations in canonical order
+_INVOICE_OPEN = (
+    '<Invoice xmlns="urn:oasis:names:specification:ubl:schema:xsd:Invoice-2"'
+    ' xmlns:cac="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"'
+    ' xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2">'
+)
+_PIH_OPEN = (
+    '<cac:AdditionalDocumentReference><cbc:ID>PIH</cbc:ID><cac:Attachment>'
+    '<cbc:EmbeddedDocumentBinaryObject mimeCode="text/plain">'
+)
+_ATTACHMENT_CLOSE = '</cbc:EmbeddedDocumentBinaryObject></cac:Attachment></cac:AdditionalDocumentReference>'
+_ATTACHMENT_CLOSE_BYTES = _ATTACHMENT_CLOSE.encode("utf-8")
+_QR_OPEN = (
+    '<cac:AdditionalDocumentReference><cbc:ID>QR</cbc:ID><cac:Attachment>'
+    '<cbc:EmbeddedDocumentBinaryObject mimeCode="text/plain">'
+)
+_XML_DECLARATION_BYTES = XML_DECLARATION.encode("ascii")
+_QR_OPEN_BYTES = _QR_OPEN.encode("ascii")
+_VAT_SCHEME = '<cac:TaxScheme><cbc:ID schemeAgencyID="6" schemeID="UN/ECE 5153">VAT</cbc:ID></cac:TaxScheme>'
+
+# Canonical text escaping, and characters XML 1.0 cannot represent at all
+_TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\r": "&#xD;"})
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+class RenderedInvoice(NamedTuple):
+    """
+    An invoice rendered by a pool worker, not yet linked into the chain.
+
+    The canonical document is ``head + previous_hash + _ATTACHMENT_CLOSE + tail``;
+    the QR reference, which is excluded from the hash, goes right before ``tail``.
+    The parts are UTF-8 encoded by the worker, which makes them cheaper to
+    send back and to hash than strings.
+    """
+    invoice_id: int
+    counter: int
+    uuid: str
+    head: bytes
+    tail: bytes
+    qr_fields: bytes
+
+
+class GeneratedDocument(NamedTuple):
+    """
+    A ZATCA document linked into the invoice hash chain.
+
+    Attributes:
+        invoice_id (int): ID of the invoice
+        counter (int): Invoice counter value (ICV), the invoice's position in the chain
+        uuid (str): Document UUID
+        previous_hash (str): Hash of the previous invoice in the chain (PIH), base64
+        invoice_hash (str): SHA-256 of the canonical document, base64
+        qr_code (str): Base64 TLV payload for the QR code
+        xml (str): The UBL invoice document
+    """
+    invoice_id: int
+    counter: int
+    uuid: str
+    previous_hash: str
+    invoice_hash: str
+    qr_code: str
+    xml: str
+
+
+def seller_from_env() -> Dict[str, str]:
+    """
+    Read the seller (the company issuing the invoices) from the environment.
+
+    Returns:
+        Dict[str, str]: Seller name, VAT number, commercial registration and address
+
+    Raises:
+        RuntimeError: If ZATCA_SELLER_NAME or ZATCA_SELLER_VAT is not set
+    """
+    missing = [name for name in ("ZATCA_SELLER_NAME", "ZATCA_SELLER_VAT") if not os.getenv(name)]
+    if missing:
+        raise RuntimeError(f"ZATCA seller is not configured; set {', '.join(missing)}")
+    return {
+        "name": os.environ["ZATCA_SELLER_NAME"],
+        "vat_number": os.environ["ZATCA_SELLER_VAT"],
+        "crn": os.getenv("ZATCA_SELLER_CRN", ""),
+        "street": os.getenv("ZATCA_SELLER_STREET", ""),
+        "building": os.getenv("ZATCA_SELLER_BUILDING", ""),
+        "district": os.getenv("ZATCA_SELLER_DISTRICT", ""),
+        "city": os.getenv("ZATCA_SELLER_CITY", ""),
+        "postal_code": os.getenv("ZATCA_SELLER_POSTAL_CODE", ""),
+    }
+
+
+def _text(value: Any) -> str:
+    """Escape a value as canonical XML character data."""
+    return _INVALID_XML_CHARS.sub("", str(value)).translate(_TEXT_ESCAPES)
+
+
+def _amount(value: float) -> str:
+    """Format a monetary amount with two decimals."""
+    return f"{value:.2f}"
+
+
+def _number(value: float) -> str:
+    """Format a quantity or unit price without trailing zeros."""
+    return f"{value:.6f}".rstrip("0").rstrip(".")
+
+
+def _optional(tag: str, value: Optional[str]) -> str:
+    """Render an element only when it has a value; canonical XML has no empty shorthand."""
+    return f"<{tag}>{_text(value)}</{tag}>" if value else ""
+
+
+def _tlv(tag: int, value: bytes) -> bytes:
+    """Encode one QR code field as tag, length and value."""
+    if len(value) > 255:
+        raise ValueError(f"QR code field {tag} is longer than 255 bytes")
+    return bytes((tag, len(value))) + value
+
+
+def _seller_party(seller: Dict[str, str]) -> str:
+    """Render the AccountingSupplierParty of the seller."""
+    identification = ""
+    if seller.get("crn"):
+        identification = f'<cac:PartyIdentification><cbc:ID schemeID="CRN">{_text(seller["crn"])}</cbc:ID></cac:PartyIdentification>'
+    return (
+        "<cac:AccountingSupplierParty><cac:Party>"
+        f"{identification}"
+        "<cac:PostalAddress>"
+        f"{_optional('cbc:StreetName', seller.get('street'))}"
+        f"{_optional('cbc:BuildingNumber', seller.get('building'))}"
+        f"{_optional('cbc:CitySubdivisionName', seller.get('district'))}"
+        f"{_optional('cbc:CityName', seller.get('city'))}"
+        f"{_optional('cbc:PostalZone', seller.get('postal_code'))}"
+        "<cac:Country><cbc:IdentificationCode>SA</cbc:IdentificationCode></cac:Country>"
+        "</cac:PostalAddress>"
+        f"<cac:PartyTaxScheme><cbc:CompanyID>{_text(seller['vat_number'])}</cbc:CompanyID>"
+        "<cac:TaxScheme><cbc:ID>VAT</cbc:ID></cac:TaxScheme></cac:PartyTaxScheme>"
+        f"<cac:PartyLegalEntity><cbc:RegistrationName>{_text(seller['name'])}</cbc:RegistrationName></cac:PartyLegalEntity>"
+        "</cac:Party></cac:AccountingSupplierParty>"
+    )
+
+
+def _buyer_party(buyer: Dict[str, Optional[str]]) -> str:
+    """Render the AccountingCustomerParty; buyers without a VAT number get no tax scheme."""
+    tax_scheme = ""
+    if buyer.get("vat_number"):
+        tax_scheme = (
+            f"<cac:PartyTaxScheme><cbc:CompanyID>{_text(buyer['vat_number'])}</cbc:CompanyID>"
+            "<cac:TaxScheme><cbc:ID>VAT</cbc:ID></cac:TaxScheme></cac:PartyTaxScheme>"
+        )
+    return (
+        "<cac:AccountingCustomerParty><cac:Party>"
+        "<cac:PostalAddress>"
+        f"{_optional('cbc:StreetName', buyer.get('address'))}"
+        "<cac:Country><cbc:IdentificationCode>SA</cbc:IdentificationCode></cac:Country>"
+        "</cac:PostalAddress>"
+        f"{tax_scheme}"
+        f"<cac:PartyLegalEntity><cbc:RegistrationName>{_text(buyer.get('name') or '')}</cbc:RegistrationName></cac:PartyLegalEntity>"
+        "</cac:Party></cac:AccountingCustomerParty>"
+    )
+
+
+def render_invoice(payload: Dict[str, Any]) -> RenderedInvoice:
+    """
+    Render one invoice in canonical form, without its chain link.
+
+    Args:
+        payload (Dict[str, Any]): Plain invoice data with the keys
+            invoice_id, number, uuid, counter, issue_date ('YYYY-MM-DD'),
+            issue_time ('HH:MM:SS'), due_date, vat_rate, total_amount,
+            vat_amount, total_amount_with_vat, seller (see seller_from_env),
+            buyer (name, vat_number, address) and lines, a list of
+            (item_name, quantity, unit_price, line_total) tuples
+
+    Returns:
+        RenderedInvoice: Canonical document parts and the QR code fields known before linking
+    """
+    currency = f'currencyID="{CURRENCY}"'
+    vat_rate = payload["vat_rate"]
+    percent = _amount(vat_rate * 100)
+    tax_category = (
+        f'<cac:ClassifiedTaxCategory><cbc:ID>S</cbc:ID><cbc:Percent>{percent}</cbc:Percent>'
+        '<cac:TaxScheme><cbc:ID>VAT</cbc:ID></cac:TaxScheme></cac:ClassifiedTaxCategory>'
+    )
+    # Invoices to VAT-registered buyers are standard (B2B) invoices, all others simplified
+    simplified = not payload["buyer"].get("vat_number")
+    issue_date = payload["issue_date"]
+
+    head = (
+        f"{_INVOICE_OPEN}"
+        "<cbc:ProfileID>reporting:1.0</cbc:ProfileID>"
+        f"<cbc:ID>{_text(payload['number'])}</cbc:ID>"
+        f"<cbc:UUID>{payload['uuid']}</cbc:UUID>"
+        f"<cbc:IssueDate>{issue_date}</cbc:IssueDate>"
+        f"<cbc:IssueTime>{payload['issue_time']}</cbc:IssueTime>"
+        f'<cbc:InvoiceTypeCode name="{"0200000" if simplified else "0100000"}">388</cbc:InvoiceTypeCode>'
+        f"<cbc:DocumentCurrencyCode>{CURRENCY}</cbc:DocumentCurrencyCode>"
+        f"<cbc:TaxCurrencyCode>{CURRENCY}</cbc:TaxCurrencyCode>"
+        f"<cac:AdditionalDocumentReference><cbc:ID>ICV</cbc:ID><cbc:UUID>{payload['counter']}</cbc:UUID></cac:AdditionalDocumentReference>"
+        f"{_PIH_OPEN}"
+    )
+
+    parts = [
+        _seller_party(payload["seller"]),
+        _buyer_party(payload["buyer"]),
+        f"<cac:Delivery><cbc:ActualDeliveryDate>{issue_date}</cbc:ActualDeliveryDate></cac:Delivery>",
+        f"<cac:PaymentMeans><cbc:PaymentMeansCode>1</cbc:PaymentMeansCode>"
+        f"<cbc:PaymentDueDate>{payload['due_date']}</cbc:PaymentDueDate></cac:PaymentMeans>",
+        f"<cac:TaxTotal><cbc:TaxAmount {currency}>{_amount(payload['vat_amount'])}</cbc:TaxAmount></cac:TaxTotal>",
+        f"<cac:TaxTotal><cbc:TaxAmount {currency}>{_amount(payload['vat_amount'])}</cbc:TaxAmount>"
+        f"<cac:TaxSubtotal><cbc:TaxableAmount {currency}>{_amount(payload['total_amount'])}</cbc:TaxableAmount>"
+        f"<cbc:TaxAmount {currency}>{_amount(payload['vat_amount'])}</cbc:TaxAmount>"
+        f'<cac:TaxCategory><cbc:ID schemeAgencyID="6" schemeID="UN/ECE 5305">S</cbc:ID>'
+        f"<cbc:Percent>{percent}</cbc:Percent>{_VAT_SCHEME}</cac:TaxCategory></cac:TaxSubtotal></cac:TaxTotal>",
+        f"<cac:LegalMonetaryTotal>"
+        f"<cbc:LineExtensionAmount {currency}>{_amount(payload['total_amount'])}</cbc:LineExtensionAmount>"
+        f"<cbc:TaxExclusiveAmount {currency}>{_amount(payload['total_amount'])}</cbc:TaxExclusiveAmount>"
+        f"<cbc:TaxInclusiveAmount {currency}>{_amount(payload['total_amount_with_vat'])}</cbc:TaxInclusiveAmount>"
+        f"<cbc:AllowanceTotalAmount {currency}>0.00</cbc:AllowanceTotalAmount>"
+        f"<cbc:PayableAmount {currency}>{_amount(payload['total_amount_with_vat'])}</cbc:PayableAmount>"
+        "</cac:LegalMonetaryTotal>",
+    ]
+    for number, (item_name, quantity, unit_price, line_total) in enumerate(payload["lines"], start=1):
+        line_vat = round(line_total * vat_rate, 2)
+        parts.append(
+            f"<cac:InvoiceLine><cbc:ID>{number}</cbc:ID>"
+            f'<cbc:InvoicedQuantity unitCode="PCE">{_number(quantity)}</cbc:InvoicedQuantity>'
+            f"<cbc:LineExtensionAmount {currency}>{_amount(line_total)}</cbc:LineExtensionAmount>"
+            f"<cac:TaxTotal><cbc:TaxAmount {currency}>{_amount(line_vat)}</cbc:TaxAmount>"
+            f"<cbc:RoundingAmount {currency}>{_amount(line_total + line_vat)}</cbc:RoundingAmount></cac:TaxTotal>"
+            f"<cac:Item><cbc:Name>{_text(item_name)}</cbc:Name>{tax_category}</cac:Item>"
+            f"<cac:Price><cbc:PriceAmount {currency}>{_number(unit_price)}</cbc:PriceAmount></cac:Price>"
+            "</cac:InvoiceLine>"
+        )
+    parts.append("</Invoice>")
+
+    qr_fields = b"".join((
+        _tlv(1, payload["seller"]["name"].encode("utf-8")),
+        _tlv(2, payload["seller"]["vat_number"].encode("utf-8")),
+        _tlv(3, f"{issue_date}T{payload['issue_time']}".encode("ascii")),
+        _tlv(4, _amount(payload["total_amount_with_vat"]).encode("ascii")),
+        _tlv(5, _amount(payload["vat_amount"]).encode("ascii")),
+    ))
+    return RenderedInvoice(
+        payload["invoice_id"], payload["counter"], payload["uuid"],
+        head.encode("utf-8"), "".join(parts).encode("utf-8"), qr_fields
+    )
+
+
+def _render_chunk(payloads: List[Dict[str, Any]]) -> List[RenderedInvoice]:
+    """Pool task: render a chunk of invoices."""
+    return [render_invoice(payload) for payload in payloads]
+
+
+@lru_cache(maxsize=None)
+def _load_signer(path: str) -> Callable[[bytes], Tuple[bytes, bytes]]:
+    """Load the signing key; return a function signing a SHA-256 digest and the DER public key."""
+    try:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, utils
+    except ImportError as e:
+        raise RuntimeError("ZATCA_SIGNING_KEY is set but the cryptography package is not installed") from e
+
+    with open(path, "rb") as key_file:
+        key = serialization.load_pem_private_key(key_file.read(), password=None)
+    if not isinstance(key, ec.EllipticCurvePrivateKey):
+        raise RuntimeError(f"ZATCA_SIGNING_KEY {path} is not an EC private key")
+    public_key = key.public_key().public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    algorithm = ec.ECDSA(utils.Prehashed(hashes.SHA256()))
+
+    def sign(digest: bytes) -> Tuple[bytes, bytes]:
+        return key.sign(digest, algorithm), public_key
+    return sign
+
+
+def link_invoices(rendered: List[RenderedInvoice], previous_hash: str) -> List[GeneratedDocument]:
+    """
+    Link rendered invoices into the hash chain, in order.
+
+    Each invoice embeds the hash of the one before it, and its own hash
+    covers that value, so this step is sequential. It only hashes the
+    pre-rendered parts and assembles the final documents and QR codes.
+
+    Args:
+        rendered (List[RenderedInvoice]): Invoices in chain (counter) order
+        previous_hash (str): Hash of the invoice preceding the first one
+
+    Returns:
+        List[GeneratedDocument]: The finished documents, in the same order
+    """
+    sign = _load_signer(ZATCA_SIGNING_KEY) if ZATCA_SIGNING_KEY else None
+    documents = []
+    for invoice in rendered:
+        previous_hash_bytes = previous_hash.encode("ascii")
+        digest = hashlib.sha256(invoice.head)
+        digest.update(previous_hash_bytes)
+        digest.update(_ATTACHMENT_CLOSE_BYTES)
+        digest.update(invoice.tail)
+        raw_hash = digest.digest()
+        invoice_hash = base64.b64encode(raw_hash).decode("ascii")
+
+        qr_fields = invoice.qr_fields + _tlv(6, invoice_hash.encode("ascii"))
+        if sign is not None:
+            signature, public_key = sign(raw_hash)
+            qr_fields += _tlv(7, base64.b64encode(signature)) + _tlv(8, public_key)
+        qr_code = base64.b64encode(qr_fields).decode("ascii")
+
+        xml = b"".join((
+            _XML_DECLARATION_BYTES, invoice.head, previous_hash_bytes, _ATTACHMENT_CLOSE_BYTES,
+            _QR_OPEN_BYTES, qr_code.encode("ascii"), _ATTACHMENT_CLOSE_BYTES, invoice.tail
+        )).decode("utf-8")
+        documents.append(GeneratedDocument(
+            invoice.invoice_id, invoice.counter, invoice.uuid, previous_hash, invoice_hash, qr_code, xml
+        ))
+        previous_hash = invoice_hash
+    return documents
+
+
+def _chunks(payloads: List[Dict[str, Any]], workers: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split payloads into tasks of at most ZATCA_POOL_CHUNK_SIZE, spread over all workers."""
+    size = max(1, min(ZATCA_POOL_CHUNK_SIZE, -(-len(payloads) // max(workers, 1))))
+    for start in range(0, len(payloads), size):
+        yield payloads[start:start + size]
+
+
+def generate_documents(
+    payloads: List[Dict[str, Any]],
+    previous_hash: str,
+    pool: Optional[Executor] = None,
+    workers: int = 1
+) -> List[GeneratedDocument]:
+    """
+    Render and link a batch of invoices, blocking until done.
+
+    Args:
+        payloads (List[Dict[str, Any]]): Invoices in chain order (see render_invoice)
+        previous_hash (str): Hash of the invoice preceding the first one
+        pool (Optional[Executor], optional): Pool to render on; None renders in the calling thread
+        workers (int, optional): Worker count of the pool, used to size tasks. Defaults to 1.
+
+    Returns:
+        List[GeneratedDocument]: The finished documents, in chain order
+    """
+    if pool is None:
+        rendered = _render_chunk(payloads)
+    else:
+        rendered = [invoice for chunk in pool.map(_render_chunk, _chunks(payloads, workers)) for invoice in chunk]
+    return link_invoices(rendered, previous_hash)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the shared render pool, starting it on first use.
+
+    Returns:
+        Optional[ProcessPoolExecutor]: The pool, or None when ZATCA_POOL_WORKERS is 0
+    """
+    global _pool
+    if ZATCA_POOL_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=ZATCA_POOL_WORKERS,
+                mp_context=multiprocessing.get_context(ZATCA_POOL_START_METHOD)
+            )
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the shared render pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_render_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a pool whose worker died (e.g. killed for memory), so the next call starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+
+async def generate_documents_async(payloads: List[Dict[str, Any]], previous_hash: str) -> List[GeneratedDocument]:
+    """
+    Render and link a batch of invoices without blocking the event loop.
+
+    Chunks of invoices are rendered in parallel on the shared pool and then
+    linked in a worker thread.
+
+    Args:
+        payloads (List[Dict[str, Any]]): Invoices in chain order (see render_invoice)
+        previous_hash (str): Hash of the invoice preceding the first one
+
+    Returns:
+        List[GeneratedDocument]: The finished documents, in chain order
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_render_pool()
+    if pool is None:
+        return await loop.run_in_executor(None, generate_documents, payloads, previous_hash)
+
+    try:
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _render_chunk, chunk) for chunk in _chunks(payloads, ZATCA_POOL_WORKERS)
+        ))
+    except BrokenProcessPool:
+        _discard_render_pool(pool)
+        raise
+    rendered = [invoice for chunk in chunks for invoice in chunk]
+    return await loop.run_in_executor(None, link_invoices, rendered, previous_hash)